@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+"""Measures mirroring performance against generated local repositories.
+
+Upstream repositories are bare repositories created with git fast-import and
+mirrored over file:// urls, so the benchmark needs no network access. Each run
+goes through three scenarios and reports the results as JSON:
+
+    cold-clone    every repository is mirrored for the first time;
+    no-change     every mirror is synchronized again without upstream changes;
+    small-delta   every upstream gets one new commit before the next sync.
+
+Usage:
+
+    python benchmarks/benchmark_mirrors.py --repositories 50 --output run.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import json
+import logging
+import os
+import pathlib
+import platform
+import subprocess  # nosec
+import sys
+import tempfile
+import time
+import typing
+
+from easy_mirrors import api, config, metrics
+
+logger = logging.getLogger("easy_mirrors")
+
+# Identity and time used by all generated commits to keep runs reproducible.
+_COMMITTER: typing.Final[bytes] = b"Benchmark <benchmark@localhost> 1700000000 +0000"
+
+
+class ArgumentsNamespace(argparse.Namespace):
+    """Typed namespace representing all supported benchmark parameters."""
+
+    repositories: int
+    commits: int
+    blob_size: int
+    refs: int
+    jobs: int
+    workdir: str | None
+    output: str | None
+
+
+def _data(payload: bytes) -> bytes:
+    return b"data %d\n" % len(payload) + payload + b"\n"
+
+
+def _get_import_stream(commits: int, blob_size: int, refs: int) -> bytes:
+    stream = bytearray()
+
+    for mark in range(1, commits + 1):
+        stream += b"commit refs/heads/main\nmark :%d\n" % mark
+        stream += b"committer " + _COMMITTER + b"\n"
+        stream += _data(b"Commit %d" % mark)
+        stream += b"M 644 inline blob-%d.bin\n" % mark
+        stream += _data(os.urandom(blob_size))  # incompressible content
+
+    # Spread the refs evenly over the history like release tags.
+    for index in range(refs):
+        mark = 1 + index * commits // max(1, refs)
+        stream += b"reset refs/tags/v%d\nfrom :%d\n\n" % (index, mark)
+
+    return bytes(stream)
+
+
+def _get_delta_stream(blob_size: int) -> bytes:
+    return (
+        b"commit refs/heads/main\n"
+        + b"committer "
+        + _COMMITTER
+        + b"\n"
+        + _data(b"Small delta")
+        + b"from refs/heads/main^0\n"
+        + b"M 644 inline delta-%d.bin\n" % time.time_ns()
+        + _data(os.urandom(blob_size))
+    )
+
+
+def _fast_import(path: pathlib.Path, stream: bytes) -> None:
+    subprocess.run(  # nosec
+        ["git", "fast-import", "--quiet"],
+        check=True,
+        cwd=path,
+        input=stream,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def create_upstreams(
+    root: pathlib.Path, count: int, commits: int, blob_size: int, refs: int
+) -> list[pathlib.Path]:
+    """Creates bare upstream repositories and returns their paths."""
+    paths: list[pathlib.Path] = []
+
+    for index in range(count):
+        path = root / f"upstream-{index:04d}.git"
+        subprocess.run(  # nosec
+            ["git", "init", "--quiet", "--bare", "--initial-branch=main", str(path)],
+            check=True,
+        )
+        _fast_import(path, _get_import_stream(commits, blob_size, refs))
+
+        paths.append(path)
+
+    return paths
+
+
+def run_scenario(configuration: config.Config) -> dict[str, typing.Any]:
+    """Mirrors all configured repositories once and describes the run."""
+    before = metrics.OPERATION_DURATION.snapshot()
+
+    started = time.perf_counter()
+    statuses = api.make_mirrors(configuration)
+    wall_time = time.perf_counter() - started
+
+    operations: dict[str, dict[str, float]] = {}
+    for (operation,), (count, total) in metrics.OPERATION_DURATION.snapshot().items():
+        count_before, total_before = before.get((operation,), (0, 0.0))
+        if count > count_before:
+            operations[operation] = {
+                "count": count - count_before,
+                "total_seconds": total - total_before,
+                "mean_seconds": (total - total_before) / (count - count_before),
+            }
+
+    return {
+        "wall_time_seconds": wall_time,
+        # Every git operation runs in its own process.
+        "process_spawns": sum(item["count"] for item in operations.values()),
+        "operations": operations,
+        "statuses": dict(collections.Counter(statuses.values())),
+    }
+
+
+def run_benchmark(
+    workdir: pathlib.Path, arguments: ArgumentsNamespace
+) -> dict[str, typing.Any]:
+    """Runs all scenarios against freshly generated repositories."""
+    upstreams = workdir / "upstreams"
+    upstreams.mkdir()
+
+    paths = create_upstreams(
+        upstreams,
+        arguments.repositories,
+        arguments.commits,
+        arguments.blob_size,
+        arguments.refs,
+    )
+    configuration = config.Config(
+        path=str(workdir / "mirrors"),
+        repositories=[path.as_uri() for path in paths],
+        jobs=arguments.jobs,
+        retries=0,
+    )
+
+    scenarios = {}
+    scenarios["cold-clone"] = run_scenario(configuration)
+    scenarios["no-change"] = run_scenario(configuration)
+
+    for path in paths:
+        _fast_import(path, _get_delta_stream(arguments.blob_size))
+    scenarios["small-delta"] = run_scenario(configuration)
+
+    git_version = subprocess.run(  # nosec
+        ["git", "--version"], capture_output=True, check=True, text=True
+    ).stdout.strip()
+
+    return {
+        "parameters": {
+            "repositories": arguments.repositories,
+            "commits": arguments.commits,
+            "blob_size": arguments.blob_size,
+            "refs": arguments.refs,
+            "jobs": arguments.jobs,
+        },
+        "environment": {
+            "git": git_version,
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure mirroring performance against local repositories."
+    )
+    parser.add_argument(
+        "--repositories",
+        type=int,
+        default=20,
+        help="number of upstream repositories (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--commits",
+        type=int,
+        default=50,
+        help="number of commits in each repository (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--blob-size",
+        type=int,
+        default=4096,
+        help="size in bytes of the file added by each commit (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--refs",
+        type=int,
+        default=10,
+        help="number of tags in each repository (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=4,
+        help="number of repositories synchronized concurrently (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--workdir",
+        type=str,
+        default=None,
+        help="directory for generated repositories (default: a temporary one)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="file to save results to (default: standard output)",
+    )
+    arguments = parser.parse_args(namespace=ArgumentsNamespace())
+
+    # Git output is not interesting here and only slows the benchmark down.
+    logger.setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory(dir=arguments.workdir) as workdir:
+        results = run_benchmark(pathlib.Path(workdir), arguments)
+
+    report = json.dumps(results, indent=2, sort_keys=True)
+    if arguments.output is None:
+        sys.stdout.write(report + "\n")
+    else:
+        with open(arguments.output, mode="wt", encoding="utf-8") as stream_out:
+            stream_out.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,14 +8,29 @@
 from __future__ import annotations
 
 import argparse
+import collections
+import contextlib
 import errno
+import json
 import logging
 import os
 import sys
-import time
 import typing
 
-from easy_mirrors import api, config, defaults, exceptions, logger_wrapper
+from easy_mirrors import (
+    api,
+    config,
+    control,
+    daemon,
+    defaults,
+    exceptions,
+    git_repository,
+    logger_wrapper,
+    metrics,
+    state,
+    watcher,
+    webhooks,
+)
 
 logger = logging.getLogger("easy_mirrors")
 
@@ -23,12 +38,35 @@ logger = logging.getLogger("easy_mirrors")
 class ArgumentsNamespace(argparse.Namespace):
     """Typed namespace representing all supported CLI parameters."""
 
+    command: str | None
     config_path: str
+    hosts: list[tuple[str, str]] | None
+    jobs: int | None
+    log_format: str
+    repositories: list[str] | None
     synchronization_period: int
     verbosity: str
 
 
-def main() -> typing.NoReturn:
+def _parse_host_rewrite(value: str) -> tuple[str, str]:
+    """Parses a rule like github.com=git.example.com into old and new hosts."""
+    old_host, separator, new_host = value.partition("=")
+    if not (separator and old_host.strip() and new_host.strip()):
+        raise argparse.ArgumentTypeError(f"invalid host rewrite rule: {value!r}")
+
+    return old_host.strip().lower(), new_host.strip()
+
+
+def _get_exit_code(outcomes: typing.Mapping[str, str]) -> int:
+    """Returns the exit code of a command reporting the outcome per repository."""
+    if any(outcome in {"failed", "timeout"} for outcome in outcomes.values()):
+        return errno.EIO
+
+    return os.EX_OK
+
+
+def _get_parser() -> argparse.ArgumentParser:
+    """Returns the parser of the command line interface."""
     parser = argparse.ArgumentParser(
         description="Simplest way to mirror and restore git repositories."
     )
@@ -56,7 +94,10 @@ def main() -> typing.NoReturn:
         metavar="MINUTES",
         default=1440,  # 24 * 60
         dest="synchronization_period",
-        help="synchronization period in minutes (default: once per day)",
+        help=(
+            "synchronization period in minutes used unless the configuration "
+            "sets adaptive bounds (default: once per day)"
+        ),
     )
     parser.add_argument(
         "-c",
@@ -67,22 +108,227 @@ def main() -> typing.NoReturn:
         dest="config_path",
         help="the local path to a configuration file",
     )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        metavar="N",
+        default=None,
+        dest="jobs",
+        help="number of repositories to synchronize concurrently (default: config)",
+    )
+    parser.add_argument(
+        "--log-format",
+        type=str.lower,
+        choices=["text", "json"],
+        default="text",
+        dest="log_format",
+        help="the format of log messages (default: %(default)s)",
+    )
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    restore_parser = subparsers.add_parser(
+        "restore",
+        help="push every mirror back to its host or to a new one and exit",
+        description=(
+            "Push every mirror concurrently, skipping targets that already hold "
+            "its refs, so an interrupted restore can be resumed."
+        ),
+    )
+    restore_parser.add_argument(
+        "--rewrite",
+        type=_parse_host_rewrite,
+        metavar="OLD=NEW",
+        action="append",
+        default=None,
+        dest="hosts",
+        help="push repositories of the old host to the new one (repeatable)",
+    )
+    plan_parser = subparsers.add_parser(
+        "plan",
+        help="print what a cycle would do to every repository and exit",
+        description=(
+            "Check every repository concurrently without changing anything and "
+            "print whether it would be cloned, fetched, left unchanged, skipped "
+            "or reported missing, as JSON."
+        ),
+    )
+    plan_parser.add_argument(
+        "repositories",
+        nargs="*",
+        metavar="URL",
+        help="the url of a configured repository to plan (default: all)",
+    )
+    sync_parser = subparsers.add_parser(
+        "sync",
+        help="ask the running daemon to sync repositories now",
+        description=(
+            "Ask the running daemon to sync repositories right away, alongside "
+            "a running cycle."
+        ),
+    )
+    sync_parser.add_argument(
+        "repositories",
+        nargs="+",
+        metavar="URL",
+        help="the url of a configured repository, spelled in any way",
+    )
+    subparsers.add_parser(
+        "status", help="show syncs in flight and queued in the running daemon"
+    )
+    subparsers.add_parser("pause", help="stop scheduled syncs of the running daemon")
+    subparsers.add_parser(
+        "resume", help="start scheduled syncs of the running daemon again"
+    )
+
+    return parser
+
+
+def _load_configuration(arguments: ArgumentsNamespace) -> config.Config:
+    """Loads the configuration file, applying overrides of the command line."""
+    configuration = config.Config.load(
+        path=os.path.normpath(os.path.expanduser(arguments.config_path))
+    )
+    if arguments.jobs is not None:
+        configuration.jobs = arguments.jobs
+
+    return configuration
+
+
+def _send_command(configuration: config.Config, arguments: ArgumentsNamespace) -> int:
+    """Sends a command to the running daemon and prints its response."""
+    if configuration.control_socket is None:
+        logger.error("The control socket of the daemon is not configured.")
+        raise exceptions.ConfigError("Missing the control_socket option.")
+
+    options: dict[str, typing.Any] = {}
+    if arguments.command == "sync":
+        options["repositories"] = arguments.repositories
+
     try:
-        arguments = parser.parse_args(namespace=ArgumentsNamespace())
+        response = control.send_command(
+            configuration.control_socket, typing.cast(str, arguments.command), **options
+        )
+    except exceptions.FileSystemError:
+        logger.error("Unable to reach the running daemon.")
+        raise
 
-        # Assign a new severity level to the logging system.
-        logger_wrapper.setup(arguments.verbosity)
+    sys.stdout.write(json.dumps(response, indent=2) + "\n")
 
-        configuration = config.Config.load(
-            path=os.path.normpath(os.path.expanduser(arguments.config_path))
+    return os.EX_OK if response.get("ok") else errno.EINVAL
+
+
+def _plan(configuration: config.Config, arguments: ArgumentsNamespace) -> int:
+    """Prints what a cycle would do to every repository."""
+    # Mirrors are not migrated, the plan models their migration instead.
+    actions = api.plan_mirrors(
+        configuration, repositories=arguments.repositories or None
+    )
+    summary = collections.Counter(actions.values())
+    sys.stdout.write(
+        json.dumps(
+            {
+                "repositories": dict(sorted(actions.items())),
+                "summary": dict(sorted(summary.items())),
+            },
+            indent=2,
+        )
+        + "\n"
+    )
+
+    return _get_exit_code(actions)
+
+
+def _restore(configuration: config.Config, arguments: ArgumentsNamespace) -> int:
+    """Pushes every mirror back to its host or to a new one."""
+    # Mirrors left in the flat layout are moved before anything else runs.
+    api.migrate_mirrors(configuration)
+
+    statuses = api.restore_mirrors(configuration, hosts=dict(arguments.hosts or []))
+
+    return _get_exit_code(statuses)
+
+
+def _run_daemon(
+    configuration: config.Config, arguments: ArgumentsNamespace
+) -> typing.NoReturn:
+    """Mirrors repositories until the program is interrupted."""
+    # Mirrors left in the flat layout are moved before anything else runs.
+    api.migrate_mirrors(configuration)
+
+    min_period, max_period = configuration.get_periods(arguments.synchronization_period)
+
+    if configuration.metrics_port is not None:
+        metrics.start_http_server(configuration.metrics_port)
+
+    # Changes of the configuration file are applied without a restart.
+    config_watcher = watcher.ConfigWatcher(
+        os.path.normpath(os.path.expanduser(arguments.config_path)),
+        load=lambda: _load_configuration(arguments),
+    )
+    config_watcher.start()
+
+    with state.StateStore(configuration.state_path) as state_store:
+        mirror_daemon = daemon.Daemon(
+            configuration,
+            state_store,
+            min_interval=min_period * 60,
+            max_interval=max_period * 60,
+            period=arguments.synchronization_period,
         )
-        logger.info(configuration)
 
-        while True:
-            api.make_mirrors(configuration)
+        # Push webhooks request syncs, so polling only has to catch up on
+        # missed events.
+        if configuration.webhook_port is not None:
+            webhooks.start_server(
+                configuration.webhook_port,
+                mirror_daemon,
+                delay=configuration.webhook_delay,
+            )
+
+        with contextlib.ExitStack() as stack:
+            # Syncs can be requested on demand, if the socket is configured.
+            if configuration.control_socket is not None:
+                try:
+                    stack.enter_context(
+                        control.start_server(
+                            configuration.control_socket, mirror_daemon
+                        )
+                    )
+                except exceptions.FileSystemError:
+                    logger.warning("Commands are not accepted by this daemon.")
+
+            mirror_daemon.run_forever(config_watcher)
+
+
+# Subcommands run by their own functions; without one, the daemon is started.
+_COMMANDS: typing.Final[
+    dict[str, typing.Callable[[config.Config, ArgumentsNamespace], int]]
+] = {
+    "plan": _plan,
+    "restore": _restore,
+    **dict.fromkeys(control.COMMANDS, _send_command),
+}
+
+
+def main() -> typing.NoReturn:
+    parser = _get_parser()
+    try:
+        arguments = parser.parse_args(namespace=ArgumentsNamespace())
+
+        # Assign a new severity level to the logging system. Log records are
+        # written from a background thread, so git workers never wait for it.
+        logger_wrapper.setup(
+            arguments.verbosity, log_format=arguments.log_format, use_queue=True
+        )
+
+        configuration = _load_configuration(arguments)
+
+        if arguments.command not in control.COMMANDS:
+            logger.info(configuration)
+            git_repository.set_resources(configuration.get_resources())
 
-            logger.info("Next attempt: %d minute(s)", arguments.synchronization_period)
-            time.sleep(arguments.synchronization_period * 60)
+        run = _COMMANDS.get(arguments.command or "", _run_daemon)
+        exit_code = run(configuration, arguments)
     except (
         exceptions.ConfigError,
         exceptions.ExternalProcessError,
@@ -91,19 +337,18 @@ def main() -> typing.NoReturn:
         logger.debug(
             "An unexpected error occurred at this program runtime:", exc_info=True
         )
-        # Stop this program runtime and return the exit status code.
-        sys.exit(getattr(err, "errno", errno.EPERM))
+        # Stop this program runtime and return the exit status code. Errors
+        # raised without a code of their own exit with a generic one.
+        exit_code = getattr(err, "errno", None) or errno.EPERM
 
     except KeyboardInterrupt:
         logger.info(
             "Abort this program runtime as a consequence of a keyboard interrupt."
         )
         # Terminate the execution of this program due to a keyboard interruption.
-        sys.exit(os.EX_OK)
+        exit_code = os.EX_OK
 
-    finally:
-        # Exit without errors.
-        sys.exit(os.EX_OK)
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
@@ -5,33 +5,169 @@
 
 from __future__ import annotations
 
+import asyncio
+import collections
+import concurrent.futures
+import contextlib
+import heapq
+import itertools
 import logging
+import math
 import os
+import threading
+import time
+import typing
 
-from easy_mirrors import config, git_repository
+from easy_mirrors import (
+    config,
+    exceptions,
+    git_repository,
+    inventory,
+    limits,
+    logger_wrapper,
+    metrics,
+    state,
+    transfers,
+    urls,
+)
 
-__all__ = ["make_mirrors"]
+__all__ = [
+    "Dispatcher",
+    "make_mirrors",
+    "make_mirrors_async",
+    "migrate_mirrors",
+    "plan_mirrors",
+    "restore_mirrors",
+]
 
 logger = logging.getLogger("easy_mirrors")
 
+# Repositories are queued by their host and the git operation they run.
+_QueueKey = typing.Tuple[str, str]
 
-def make_mirrors(configuration: config.Config) -> None:
-    """Clones or updates mirrored git repositories based on configuration."""
-    for url in configuration.repositories:
+# Errors failing a single repository, such as a git process that failed or a
+# mirror directory that could not be written, which never abort a cycle.
+_REPOSITORY_ERRORS: typing.Final[tuple[type[Exception], ...]] = (
+    exceptions.ExternalProcessError,
+    OSError,
+)
+
+
+def _find_object_pool(
+    configuration: config.Config,
+    repository: git_repository.GitRepository,
+    mirrors: inventory.Inventory,
+) -> git_repository.ObjectPool | None:
+    """Returns the object pool a repository about to be cloned should borrow from.
+
+    Declared fork families always get a pool. Otherwise, when shared objects are
+    enabled, a repository is treated as a fork if the remote advertises an object
+    already referenced by a pool or by another mirror, which then becomes the
+    first member of a new pool. Partial clones never share objects, because the
+    pool could not copy objects missing from them.
+    """
+    if repository.url in configuration.partial_clone_filters:
+        return None
+
+    if (family := configuration.get_fork_family(repository.url)) is not None:
+        pool = git_repository.ObjectPool.from_family(configuration.path, family)
+        pool.create()
+
+        return pool
+
+    if not configuration.shared_objects or not repository.remote_object_names:
+        return None
+
+    for pool in git_repository.ObjectPool.find_all(configuration.path):
+        if pool.get_object_names() & repository.remote_object_names:
+            return pool
+
+    for path in mirrors.paths:
+        if path == repository.local_path:
+            continue
+
+        if git_repository.ObjectPool.from_member(path) is not None:
+            continue  # members are covered by the pools above
+
+        if git_repository.get_object_names(path) & repository.remote_object_names:
+            logger.info("Detected a fork of the mirrored repository: %r", path)
+
+            # Mirrors of nested layouts are named after their relative path.
+            family = os.path.relpath(path, os.path.expanduser(configuration.path))
+            pool = git_repository.ObjectPool.from_family(
+                configuration.path,
+                family.removesuffix(".git").replace(os.sep, "-"),
+            )
+            pool.create()
+            pool.add_member(path)
+
+            return pool
+
+    return None
+
+
+def _update_object_pool(
+    configuration: config.Config, repository: git_repository.GitRepository
+) -> None:
+    """Shares the objects of a fetched repository with the pool of its family."""
+    if repository.url in configuration.partial_clone_filters:
+        return
+
+    if (pool := git_repository.ObjectPool.from_member(repository.local_path)) is None:
+        if (family := configuration.get_fork_family(repository.url)) is None:
+            return
+
+        # The repository has been declared a fork after it was mirrored.
+        pool = git_repository.ObjectPool.from_family(configuration.path, family)
+        pool.create()
+        pool.add_member(repository.local_path)
+    else:
+        pool.update_from(repository.local_path)
+
+
+def _mirror_repository(
+    configuration: config.Config,
+    url: str,
+    mirrors: inventory.Inventory,
+    transfer: transfers.Transfer,
+) -> tuple[str, str | None]:
+    """Clones or updates a single mirrored git repository.
+
+    Returns
+    -------
+    tuple[str, str or None]
+        The outcome of the synchronization and the fingerprint of remote refs.
+    """
+    with logger_wrapper.repository_context(url):
         logger.info("Mirroring repository: %r", url)
 
         repository = git_repository.GitRepository.from_url(
-            parent_path=configuration.path, url=url
+            parent_path=configuration.path,
+            url=url,
+            ref_filter=configuration.get_ref_filter(url),
+            layout=configuration.layout,
+            timeouts=configuration.get_timeouts(),
+            transfer=transfer,
         )
         logger.debug(repr(repository))
 
         if not repository.exists_on_remote():
             logger.warning("The remote repository does not exist: %r", url)
 
-            continue
+            return "missing", None
 
-        if repository.exists_locally():
+        if mirrors.exists_locally(repository):
+            if repository.is_up_to_date():
+                logger.info("The local mirror is up to date, skipping fetch.")
+
+                return "unchanged", repository.remote_fingerprint
+
+            repository.apply_ref_filter()
             repository.update_local_copy()  # git fetch
+            _update_object_pool(configuration, repository)
+            logger.info("Received %s.", transfer)
+
+            return "fetched", repository.remote_fingerprint
         else:
             if os.path.isdir(repository.local_path):
                 logger.warning(
@@ -39,7 +175,999 @@ def make_mirrors(configuration: config.Config) -> None:
                 )
                 logger.warning("Skipping cloning.")
 
-                continue
+                return "skipped", None
+
+            pool = _find_object_pool(configuration, repository, mirrors)
 
-            repository.create_local_copy()  # git clone
+            repository.create_local_copy(
+                reference=None if pool is None else pool.path,
+                filter_spec=configuration.partial_clone_filters.get(url),
+            )  # git clone
             repository.update_local_copy()  # git fetch -> FETCH_HEAD
+
+            if pool is not None:
+                pool.add_member(repository.local_path, deduplicate=False)
+
+            mirrors.lookup(repository.local_path)  # indexes the new mirror
+            logger.info("Received %s.", transfer)
+
+            return "cloned", repository.remote_fingerprint
+
+
+async def _mirror_repository_async(
+    configuration: config.Config,
+    url: str,
+    mirrors: inventory.Inventory,
+    transfer: transfers.Transfer,
+) -> tuple[str, str | None]:
+    """Asynchronous counterpart of the single repository synchronization."""
+    with logger_wrapper.repository_context(url):
+        logger.info("Mirroring repository: %r", url)
+
+        repository = git_repository.GitRepository.from_url(
+            parent_path=configuration.path,
+            url=url,
+            ref_filter=configuration.get_ref_filter(url),
+            layout=configuration.layout,
+            timeouts=configuration.get_timeouts(),
+            transfer=transfer,
+        )
+        logger.debug(repr(repository))
+
+        if not await repository.exists_on_remote_async():
+            logger.warning("The remote repository does not exist: %r", url)
+
+            return "missing", None
+
+        if mirrors.exists_locally(repository):
+            if repository.is_up_to_date():
+                logger.info("The local mirror is up to date, skipping fetch.")
+
+                return "unchanged", repository.remote_fingerprint
+
+            await asyncio.to_thread(repository.apply_ref_filter)
+            await repository.update_local_copy_async()  # git fetch
+            # Local object sharing is cheap compared to the fetch itself.
+            await asyncio.to_thread(_update_object_pool, configuration, repository)
+            logger.info("Received %s.", transfer)
+
+            return "fetched", repository.remote_fingerprint
+        else:
+            if os.path.isdir(repository.local_path):
+                logger.warning(
+                    "Non-mirror repository detected at path: %r",
+                    repository.local_path,
+                )
+                logger.warning("Skipping cloning.")
+
+                return "skipped", None
+
+            pool = await asyncio.to_thread(
+                _find_object_pool, configuration, repository, mirrors
+            )
+
+            await repository.create_local_copy_async(
+                reference=None if pool is None else pool.path,
+                filter_spec=configuration.partial_clone_filters.get(url),
+            )
+            await repository.update_local_copy_async()  # git fetch -> FETCH_HEAD
+
+            if pool is not None:
+                await asyncio.to_thread(
+                    pool.add_member, repository.local_path, deduplicate=False
+                )
+
+            mirrors.lookup(repository.local_path)  # indexes the new mirror
+            logger.info("Received %s.", transfer)
+
+            return "cloned", repository.remote_fingerprint
+
+
+def _synchronize(
+    configuration: config.Config,
+    url: str,
+    mirrors: inventory.Inventory,
+    state_store: state.StateStore | None = None,
+    attempt: int = 1,
+    cycle: transfers.Transfer | None = None,
+) -> str:
+    """Mirrors a repository and records the outcome in the state store.
+
+    The data received by the attempt is recorded even when it fails, and it is
+    added to the totals of the cycle, if given.
+    """
+    started_at, started = time.time(), time.monotonic()
+    status, fingerprint, error = "failed", None, None
+    transfer = transfers.Transfer()
+    try:
+        with logger_wrapper.repository_context(url, attempt=attempt):
+            status, fingerprint = _mirror_repository(
+                configuration, url, mirrors, transfer
+            )
+    except _REPOSITORY_ERRORS as err:
+        if isinstance(err, exceptions.ProcessTimeoutError):
+            status = "timeout"
+        error = str(err)
+        raise
+    finally:
+        duration = time.monotonic() - started
+
+        metrics.record_sync(url, status, duration)
+        metrics.record_transfer(url, transfer)
+        if cycle is not None:
+            cycle.add(transfer)
+        if state_store is not None:
+            state_store.record(
+                url,
+                status,
+                started_at,
+                duration,
+                fingerprint=fingerprint,
+                error=error,
+                transfer=transfer,
+            )
+
+    return status
+
+
+@contextlib.asynccontextmanager
+async def _reserve_async(
+    semaphore: asyncio.Semaphore,
+    host_limiter: limits.HostLimiter,
+    operations: limits.OperationLimiter,
+    key: _QueueKey,
+    released: asyncio.Condition,
+) -> typing.AsyncIterator[None]:
+    """Holds a job slot, a slot of the git operation and a host slot at once.
+
+    As in the dispatch of the thread pool, the slots are reserved without
+    waiting, and a task missing any of them gives back the others. It then
+    waits holding nothing until another task releases its slots or the rate
+    limit of the host allows a new sync.
+    """
+    host, operation = key
+    async with released:
+        while True:
+            delay = math.inf
+            if not semaphore.locked() and operations.try_acquire(operation):
+                if (delay := host_limiter.try_acquire(host)) == 0:
+                    await semaphore.acquire()  # free, so it does not suspend
+                    break
+
+                operations.release(operation)
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(
+                    released.wait(), None if math.isinf(delay) else delay
+                )
+    try:
+        yield
+    finally:
+        semaphore.release()
+        host_limiter.release(host)
+        operations.release(operation)
+        async with released:
+            released.notify_all()
+
+
+async def _synchronize_async(
+    configuration: config.Config,
+    url: str,
+    semaphore: asyncio.Semaphore,
+    host_limiter: limits.HostLimiter,
+    mirrors: inventory.Inventory,
+    operations: limits.OperationLimiter,
+    released: asyncio.Condition,
+    state_store: state.StateStore | None = None,
+    attempt: int = 1,
+    cycle: transfers.Transfer | None = None,
+) -> str:
+    """Asynchronous counterpart of the recorded repository synchronization."""
+    key = urls.get_host(url), _get_operation(configuration, url, mirrors)
+    async with _reserve_async(semaphore, host_limiter, operations, key, released):
+        started_at, started = time.time(), time.monotonic()
+        status, fingerprint, error = "failed", None, None
+        transfer = transfers.Transfer()
+        try:
+            with logger_wrapper.repository_context(url, attempt=attempt):
+                status, fingerprint = await _mirror_repository_async(
+                    configuration, url, mirrors, transfer
+                )
+        except _REPOSITORY_ERRORS as err:
+            if isinstance(err, exceptions.ProcessTimeoutError):
+                status = "timeout"
+            error = str(err)
+            raise
+        finally:
+            duration = time.monotonic() - started
+
+            metrics.record_sync(url, status, duration)
+            metrics.record_transfer(url, transfer)
+            if cycle is not None:
+                cycle.add(transfer)
+            if state_store is not None:
+                state_store.record(
+                    url,
+                    status,
+                    started_at,
+                    duration,
+                    fingerprint=fingerprint,
+                    error=error,
+                    transfer=transfer,
+                )
+
+    return status
+
+
+def _report_cycle_transfer(cycle: transfers.Transfer) -> None:
+    """Publishes the data received by every repository of a cycle."""
+    metrics.record_cycle_transfer(cycle)
+    logger.info(
+        "Received %s in %d object(s) with %d ref update(s) during the cycle.",
+        transfers.format_size(cycle.received_bytes),
+        cycle.objects,
+        cycle.ref_updates,
+    )
+
+
+def _get_failure_status(err: Exception) -> str:
+    """Returns the outcome reported for a repository whose last attempt failed."""
+    return "timeout" if isinstance(err, exceptions.ProcessTimeoutError) else "failed"
+
+
+def _get_operation(
+    configuration: config.Config, url: str, mirrors: inventory.Inventory
+) -> str:
+    """Returns the git operation a sync of the repository is expected to run.
+
+    Mirrors found locally are fetched and others are cloned; the guess decides
+    which cap the sync waits for before it takes any other slot.
+    """
+    repository = git_repository.GitRepository.from_url(
+        parent_path=configuration.path, url=url, layout=configuration.layout
+    )
+
+    return "fetch" if mirrors.exists_locally(repository) else "clone"
+
+
+def _release_delayed(
+    delayed: list[tuple[float, str]],
+    retrying: dict[_QueueKey, collections.deque[str]],
+    get_key: typing.Callable[[str], _QueueKey],
+) -> float:
+    """Moves repositories whose backoff delay elapsed to the queues of retries.
+
+    Returns
+    -------
+    float
+        The number of seconds until the next delayed repository is due.
+    """
+    now = time.monotonic()
+    while delayed and delayed[0][0] <= now:
+        _, url = heapq.heappop(delayed)
+        retrying[get_key(url)].append(url)
+
+    return delayed[0][0] - now if delayed else math.inf
+
+
+def _delay_retry(
+    configuration: config.Config,
+    delayed: list[tuple[float, str]],
+    url: str,
+    attempt: int,
+) -> None:
+    """Schedules a failed repository to be retried after a backoff delay."""
+    wait = limits.get_backoff_delay(attempt, configuration.retry_delay)
+    logger.warning(
+        "Retrying repository %r in %.1f second(s), attempt %d.",
+        url,
+        wait,
+        attempt + 1,
+    )
+    heapq.heappush(delayed, (time.monotonic() + wait, url))
+
+
+def _get_result(
+    configuration: config.Config,
+    url: str,
+    future: concurrent.futures.Future[str],
+    attempts: collections.Counter[str],
+    delayed: list[tuple[float, str]],
+    action: str,
+) -> str | None:
+    """Returns the outcome of a finished repository, or None if it is retried."""
+    try:
+        return future.result()
+    except _REPOSITORY_ERRORS as err:
+        if attempts[url] < configuration.retries:
+            attempts[url] += 1
+            _delay_retry(configuration, delayed, url, attempts[url])
+
+            return None
+
+        logger.error("Unable to %s repository: %r", action, url)
+
+        return _get_failure_status(err)
+
+
+class Dispatcher:
+    """Workers and limits shared by repositories dispatched from many threads.
+
+    Repositories dispatched through one instance, for example by the cycle of
+    the daemon and by syncs requested while it runs, stay together within the
+    configured number of jobs, the per-host limits and the caps of git
+    operations. Slots are released as soon as a repository finishes, and
+    every dispatch waiting for a slot is notified.
+
+    Parameters
+    ----------
+    configuration : Config
+        The configuration holding the concurrency limits.
+    """
+
+    def __init__(self, configuration: config.Config) -> None:
+        self.jobs = configuration.jobs
+        self.host_limiter = limits.HostLimiter(
+            configuration.host_jobs, configuration.host_rate
+        )
+        self.operations = configuration.get_operation_limiter()
+        self.released = threading.Condition()
+
+        self._running = 0
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=configuration.jobs, thread_name_prefix="easy_mirrors"
+        )
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return (
+            f"{self.__class__.__name__!s}"
+            f"(jobs={self.jobs:d}, operations={self.operations!r})"
+        )
+
+    def try_acquire(self, key: _QueueKey) -> float:
+        """Reserves a job slot, a slot of the operation and a host slot at once.
+
+        Returns
+        -------
+        float
+            Zero when the slots have been reserved, infinity when a job or an
+            operation slot is missing or the host runs the maximum number of
+            syncs, otherwise the number of seconds until the rate limit of the
+            host allows a new sync.
+        """
+        host, operation = key
+        with self.released:
+            if self._running >= self.jobs or not self.operations.try_acquire(operation):
+                return math.inf
+
+            if (delay := self.host_limiter.try_acquire(host)) > 0:
+                self.operations.release(operation)
+
+                return delay
+
+            self._running += 1
+
+            return 0.0
+
+    def release(self, key: _QueueKey) -> None:
+        """Frees the slots of a finished repository and wakes waiting dispatches."""
+        host, operation = key
+        with self.released:
+            self._running -= 1
+            self.host_limiter.release(host)
+            self.operations.release(operation)
+            self.released.notify_all()
+
+    def submit(
+        self, key: _QueueKey, function: typing.Callable[..., str], *args: typing.Any
+    ) -> concurrent.futures.Future[str]:
+        """Runs a function for a repository whose slots have been reserved."""
+        future = self._executor.submit(function, *args)
+        # Callbacks run once the future is done, so a dispatch woken up by the
+        # release finds it done.
+        future.add_done_callback(lambda _: self.release(key))
+
+        return future
+
+    def close(self) -> None:
+        """Waits for running repositories and stops the workers."""
+        self._executor.shutdown()
+
+
+def _submit_queued(
+    queues: dict[_QueueKey, collections.deque[str]],
+    dispatcher: Dispatcher,
+    futures: dict[concurrent.futures.Future[str], str],
+    submit: typing.Callable[[str, _QueueKey], concurrent.futures.Future[str]],
+) -> float:
+    """Submits queued repositories of every host and operation with free slots.
+
+    Returns
+    -------
+    float
+        The number of seconds until a host limited by its rate accepts more
+        work, infinity if no host is rate limited.
+    """
+    delay = math.inf
+    for key in list(queues):
+        while queues[key]:
+            if (wait := dispatcher.try_acquire(key)) > 0:
+                delay = min(delay, wait)
+                break
+
+            url = queues[key].popleft()
+            futures[submit(url, key)] = url
+
+        if not queues[key]:
+            del queues[key]
+
+    return delay
+
+
+def _dispatch(
+    configuration: config.Config,
+    repositories: typing.Iterable[str],
+    function: typing.Callable[[str, int], str],
+    get_host: typing.Callable[[str], str] = urls.get_host,
+    action: str = "mirror",
+    get_operation: typing.Callable[[str], str] | None = None,
+    dispatcher: Dispatcher | None = None,
+) -> dict[str, str]:
+    """Runs a function for every repository through a pool of workers.
+
+    The pool is bounded by the configured number of jobs. Per-host limits and
+    caps of git operations are enforced before a repository is handed to the
+    pool, so repositories on a saturated host or waiting for a capped operation
+    wait without occupying workers needed by other repositories. A repository
+    whose function raises an external process or file system error is retried
+    with capped exponential backoff and jitter, but only once repositories that
+    have not been attempted yet are dispatched.
+
+    Parameters
+    ----------
+    configuration : Config
+        The configuration holding the concurrency and retry limits.
+
+    repositories : Iterable[str]
+        The urls of repositories to process.
+
+    function : Callable[[str, int], str]
+        The function receiving the url and the number of the attempt, which
+        returns the outcome for the repository.
+
+    get_host : Callable[[str], str], optional
+        The function returning the host a repository is limited by.
+
+    action : str, default="mirror"
+        The verb describing the function in log messages.
+
+    get_operation : Callable[[str], str], optional
+        The function returning the git operation a repository is expected to
+        run, such as clone or fetch. Every repository runs the action itself
+        by default.
+
+    dispatcher : Dispatcher, optional
+        The workers and limits shared with other dispatches; a new dispatcher
+        serving only this call by default.
+
+    Returns
+    -------
+    dict[str, str]
+        The outcome for every repository, failed if every attempt failed.
+    """
+    if dispatcher is None:
+        with contextlib.closing(Dispatcher(configuration)) as own:
+            return _dispatch(
+                configuration,
+                repositories,
+                function,
+                get_host,
+                action,
+                get_operation,
+                own,
+            )
+
+    def get_key(url: str) -> _QueueKey:
+        return get_host(url), action if get_operation is None else get_operation(url)
+
+    # Repositories waiting for a free slot are grouped by host and operation,
+    # so that only the queues that can accept more work are dispatched.
+    pending: dict[_QueueKey, collections.deque[str]] = collections.defaultdict(
+        collections.deque
+    )
+    for url in repositories:
+        pending[get_key(url)].append(url)
+
+    # Failed repositories wait here until their backoff delay elapses.
+    delayed: list[tuple[float, str]] = []
+    retrying: dict[_QueueKey, collections.deque[str]] = collections.defaultdict(
+        collections.deque
+    )
+    attempts: collections.Counter[str] = collections.Counter()
+
+    statuses: dict[str, str] = {}
+    futures: dict[concurrent.futures.Future[str], str] = {}
+
+    def submit(url: str, key: _QueueKey) -> concurrent.futures.Future[str]:
+        return dispatcher.submit(key, function, url, attempts[url] + 1)
+
+    while pending or retrying or delayed or futures:
+        # Slots are reserved and released under one lock, so no release by
+        # another dispatch is missed before waiting.
+        with dispatcher.released:
+            delay = _release_delayed(delayed, retrying, get_key)
+
+            # Retries are dispatched only after every first attempt.
+            for queues in (pending, retrying):
+                delay = min(delay, _submit_queued(queues, dispatcher, futures, submit))
+
+            if not any(future.done() for future in futures):
+                dispatcher.released.wait(None if math.isinf(delay) else delay)
+
+        for future in [future for future in futures if future.done()]:
+            url = futures.pop(future)
+            if (
+                status := _get_result(
+                    configuration, url, future, attempts, delayed, action
+                )
+            ) is not None:
+                statuses[url] = status
+
+    return statuses
+
+
+def make_mirrors(
+    configuration: config.Config,
+    state_store: state.StateStore | None = None,
+    repositories: typing.Iterable[str] | None = None,
+    mirrors: inventory.Inventory | None = None,
+    dispatcher: Dispatcher | None = None,
+) -> dict[str, str]:
+    """Clones or updates mirrored git repositories based on configuration.
+
+    Repositories are synchronized concurrently through a pool bounded by the
+    configured number of jobs and the per-host limits. A failed repository is
+    retried with capped exponential backoff and jitter, and it never raises
+    an error.
+
+    Parameters
+    ----------
+    configuration : Config
+        The configuration listing repositories to mirror.
+
+    state_store : StateStore, optional
+        The store receiving the outcome of every repository synchronization.
+
+    repositories : Iterable[str], optional
+        The subset of repositories to mirror instead of all configured ones.
+
+    mirrors : Inventory, optional
+        The index of local mirrors kept between calls; a new one by default.
+
+    dispatcher : Dispatcher, optional
+        The workers and limits shared with syncs running in other threads; a
+        new dispatcher serving only this call by default.
+
+    Returns
+    -------
+    dict[str, str]
+        The outcome of the synchronization of every repository.
+    """
+    started = time.monotonic()
+    index = inventory.Inventory(configuration.path) if mirrors is None else mirrors
+    cycle = transfers.Transfer()
+
+    statuses = _dispatch(
+        configuration,
+        configuration.repositories if repositories is None else repositories,
+        lambda url, attempt: _synchronize(
+            configuration, url, index, state_store, attempt, cycle
+        ),
+        get_operation=lambda url: _get_operation(configuration, url, index),
+        dispatcher=dispatcher,
+    )
+    metrics.CYCLE_DURATION.set(time.monotonic() - started)
+    _report_cycle_transfer(cycle)
+
+    return statuses
+
+
+async def _synchronize_with_retries_async(
+    configuration: config.Config,
+    url: str,
+    semaphore: asyncio.Semaphore,
+    host_limiter: limits.HostLimiter,
+    mirrors: inventory.Inventory,
+    operations: limits.OperationLimiter,
+    released: asyncio.Condition,
+    state_store: state.StateStore | None = None,
+    cycle: transfers.Transfer | None = None,
+) -> str:
+    """Synchronizes a repository, retrying failures with backoff and jitter."""
+    for attempt in itertools.count(1):
+        try:
+            return await _synchronize_async(
+                configuration,
+                url,
+                semaphore,
+                host_limiter,
+                mirrors,
+                operations,
+                released,
+                state_store,
+                attempt,
+                cycle,
+            )
+        except _REPOSITORY_ERRORS as err:
+            if attempt > configuration.retries:
+                status = _get_failure_status(err)
+                break
+
+        # No slot is held while waiting for the next attempt.
+        wait = limits.get_backoff_delay(attempt, configuration.retry_delay)
+        logger.warning(
+            "Retrying repository %r in %.1f second(s), attempt %d.",
+            url,
+            wait,
+            attempt + 1,
+        )
+        await asyncio.sleep(wait)
+
+    logger.error("Unable to mirror repository: %r", url)
+
+    return status
+
+
+async def make_mirrors_async(
+    configuration: config.Config,
+    state_store: state.StateStore | None = None,
+    repositories: typing.Iterable[str] | None = None,
+    mirrors: inventory.Inventory | None = None,
+) -> dict[str, str]:
+    """Clones or updates mirrored git repositories on the running event loop.
+
+    At most the configured number of jobs run git processes at the same time,
+    and per-host limits are honored without blocking other hosts. Failed
+    repositories are retried with capped exponential backoff and jitter.
+    Cancelling this coroutine cancels every pending synchronization and kills
+    the git processes that are still running.
+
+    Parameters
+    ----------
+    configuration : Config
+        The configuration listing repositories to mirror.
+
+    state_store : StateStore, optional
+        The store receiving the outcome of every repository synchronization.
+
+    repositories : Iterable[str], optional
+        The subset of repositories to mirror instead of all configured ones.
+
+    mirrors : Inventory, optional
+        The index of local mirrors kept between calls; a new one by default.
+
+    Returns
+    -------
+    dict[str, str]
+        The outcome of the synchronization of every repository.
+    """
+    started = time.monotonic()
+    mirrors = inventory.Inventory(configuration.path) if mirrors is None else mirrors
+    semaphore = asyncio.Semaphore(configuration.jobs)
+    host_limiter = limits.HostLimiter(configuration.host_jobs, configuration.host_rate)
+    operations = configuration.get_operation_limiter()
+    # Tasks missing a free slot wait until another task releases its slots.
+    released = asyncio.Condition()
+    cycle = transfers.Transfer()
+    selected = list(
+        configuration.repositories if repositories is None else repositories
+    )
+
+    statuses = await asyncio.gather(
+        *(
+            _synchronize_with_retries_async(
+                configuration,
+                url,
+                semaphore,
+                host_limiter,
+                mirrors,
+                operations,
+                released,
+                state_store,
+                cycle,
+            )
+            for url in selected
+        )
+    )
+
+    metrics.CYCLE_DURATION.set(time.monotonic() - started)
+    _report_cycle_transfer(cycle)
+
+    return dict(zip(selected, statuses, strict=True))
+
+
+def _plan_repository(
+    configuration: config.Config,
+    url: str,
+    mirrors: inventory.Inventory,
+    attempt: int = 1,
+) -> str:
+    """Determines what a sync of a single repository would do without it.
+
+    Returns
+    -------
+    str
+        The planned action for the repository.
+    """
+    with logger_wrapper.repository_context(url, attempt=attempt):
+        # Mirrors left in the flat layout are moved before a cycle runs, so
+        # they are planned at their current paths as if already moved.
+        migration = _get_migration(configuration, url)
+
+        repository = git_repository.GitRepository.from_url(
+            parent_path=configuration.path,
+            url=url,
+            ref_filter=configuration.get_ref_filter(url),
+            layout="flat" if migration is not None else configuration.layout,
+            timeouts=configuration.get_timeouts(),
+        )
+
+        if not repository.exists_on_remote():
+            logger.warning("The remote repository does not exist: %r", url)
+
+            return "missing"
+
+        if migration is not None or mirrors.exists_locally(repository):
+            return "unchanged" if repository.is_up_to_date() else "fetch"
+
+        if os.path.isdir(repository.local_path):
+            logger.warning(
+                "Non-mirror repository detected at path: %r", repository.local_path
+            )
+
+            return "skip"
+
+        return "clone"
+
+
+def plan_mirrors(
+    configuration: config.Config,
+    repositories: typing.Iterable[str] | None = None,
+    mirrors: inventory.Inventory | None = None,
+) -> dict[str, str]:
+    """Reports what a cycle would do to every repository without doing it.
+
+    Only read-only checks run: the remote refs are listed and compared to the
+    local mirror, and nothing is cloned, fetched or reconfigured. The checks
+    run concurrently within the configured number of jobs and the per-host
+    limits, and failed checks are retried with backoff.
+
+    Parameters
+    ----------
+    configuration : Config
+        The configuration listing repositories to mirror.
+
+    repositories : Iterable[str], optional
+        The subset of repositories to plan instead of all configured ones.
+
+    mirrors : Inventory, optional
+        The index of local mirrors; a new one by default.
+
+    Returns
+    -------
+    dict[str, str]
+        The planned action for every repository: clone, fetch, unchanged,
+        missing or skip, or failed and timeout if the remote could not be
+        checked.
+    """
+    index = inventory.Inventory(configuration.path) if mirrors is None else mirrors
+
+    actions = _dispatch(
+        configuration,
+        configuration.repositories if repositories is None else repositories,
+        lambda url, attempt: _plan_repository(configuration, url, index, attempt),
+        action="plan",
+    )
+
+    summary = collections.Counter(actions.values())
+    logger.info(
+        "Plan finished: %s.",
+        ", ".join(f"{count:d} {action!s}" for action, count in sorted(summary.items())),
+    )
+
+    return actions
+
+
+def _restore_repository(
+    configuration: config.Config, url: str, target: str, attempt: int = 1
+) -> str:
+    """Pushes a single mirror to its target unless the target already matches it.
+
+    Returns
+    -------
+    str
+        The outcome of the restore of the repository.
+    """
+    with logger_wrapper.repository_context(url, attempt=attempt):
+        mirror = git_repository.GitRepository.from_url(
+            parent_path=configuration.path,
+            url=url,
+            layout=configuration.layout,
+        )
+        if not mirror.exists_locally():
+            logger.warning("No local mirror to restore from: %r", mirror.local_path)
+
+            return "missing"
+
+        if mirror.get_partial_clone_filter() is not None:
+            logger.warning("Partial clones can not be restored, skipping push.")
+
+            return "skipped"
+
+        # The refs left out of a filtered mirror are neither pushed nor deleted
+        # from the target, nor compared with the mirror.
+        repository = git_repository.GitRepository(
+            local_path=mirror.local_path,
+            url=target,
+            ref_filter=configuration.get_ref_filter(url),
+            timeouts=configuration.get_timeouts(),
+        )
+
+        # Repositories pushed by an interrupted restore are not pushed again.
+        if repository.exists_on_remote() and repository.is_up_to_date():
+            logger.info("The target already matches the mirror: %r", target)
+
+            return "unchanged"
+
+        logger.info("Restoring repository to: %r", target)
+        repository.push_local_copy()
+
+        return "pushed"
+
+
+def restore_mirrors(
+    configuration: config.Config,
+    hosts: typing.Mapping[str, str] | None = None,
+    repositories: typing.Iterable[str] | None = None,
+) -> dict[str, str]:
+    """Pushes mirrored repositories back to their hosts or to new ones.
+
+    Mirrors are pushed concurrently within the configured number of jobs, and
+    per-host limits apply to the target hosts. A target already holding the
+    refs of its mirror is skipped, so an interrupted restore can be resumed by
+    running it again. Failed pushes are retried with backoff.
+
+    Parameters
+    ----------
+    configuration : Config
+        The configuration listing mirrored repositories.
+
+    hosts : Mapping[str, str], optional
+        New host names keyed by the old ones, used to rewrite repository urls.
+
+    repositories : Iterable[str], optional
+        The subset of repositories to restore instead of all configured ones.
+
+    Returns
+    -------
+    dict[str, str]
+        The outcome of the restore of every repository: pushed, unchanged,
+        missing, skipped or failed.
+    """
+    targets = {
+        url: urls.rewrite_host(url, hosts or {})
+        for url in (
+            configuration.repositories if repositories is None else repositories
+        )
+    }
+
+    statuses = _dispatch(
+        configuration,
+        targets,
+        lambda url, attempt: _restore_repository(
+            configuration, url, targets[url], attempt
+        ),
+        get_host=lambda url: urls.get_host(targets[url]),
+        action="restore",
+    )
+
+    summary = collections.Counter(statuses.values())
+    logger.info(
+        "Restore finished: %s.",
+        ", ".join(f"{count:d} {status!s}" for status, count in sorted(summary.items())),
+    )
+    for url, status in sorted(statuses.items()):
+        if status == "failed":
+            logger.error("Repository has not been restored: %r", url)
+
+    return statuses
+
+
+def _get_migration(
+    configuration: config.Config, url: str
+) -> tuple[git_repository.GitRepository, git_repository.GitRepository, str] | None:
+    """Finds a mirror of the repository left in the flat layout to be moved.
+
+    Returns
+    -------
+    tuple[GitRepository, GitRepository, str] or None
+        The mirror at its flat path, the repository at its path in the
+        configured layout and the url the mirror fetches from, or None if no
+        mirror is to be moved.
+    """
+    old = git_repository.GitRepository.from_url(parent_path=configuration.path, url=url)
+    new = git_repository.GitRepository.from_url(
+        parent_path=configuration.path, url=url, layout=configuration.layout
+    )
+    if old.local_path == new.local_path or os.path.exists(new.local_path):
+        return None
+
+    # Different urls of one repository share a mirror in other layouts.
+    remote_url = old.get_remote_url()
+    if remote_url is None or urls.canonicalize(remote_url) != urls.canonicalize(url):
+        return None
+
+    return old, new, remote_url
+
+
+def migrate_mirrors(configuration: config.Config) -> dict[str, str]:
+    """Moves mirrors stored in the flat layout to the configured layout.
+
+    A mirror is moved when the url it fetches from points to a configured
+    repository, however the url is spelled, and nothing is stored at the new
+    path yet. Mirrors are renamed, so no object is copied on one file system.
+    Object pools are told about the new paths of their members.
+
+    Parameters
+    ----------
+    configuration : Config
+        The configuration listing mirrored repositories and their layout.
+
+    Returns
+    -------
+    dict[str, str]
+        The new local path of every moved repository.
+
+    Raises
+    ------
+    FileSystemError
+        Raised when a mirror can not be moved.
+    """
+    if configuration.layout == "flat":
+        return {}
+
+    moved: dict[str, str] = {}
+
+    for url in configuration.repositories:
+        if (migration := _get_migration(configuration, url)) is None:
+            continue
+
+        old, new, remote_url = migration
+        with logger_wrapper.repository_context(url):
+            logger.info("Moving the mirror to: %r", new.local_path)
+            try:
+                os.makedirs(os.path.dirname(new.local_path), exist_ok=True)
+                os.rename(old.local_path, new.local_path)
+            except OSError as err:
+                logger.error("Unable to move the mirror.")
+                raise exceptions.FileSystemError(
+                    f"Unable to move the mirror to the path: {new.local_path!r}"
+                ) from err
+
+            if remote_url != url:
+                new.set_remote_url()
+
+            pool = git_repository.ObjectPool.from_member(new.local_path)
+            try:
+                if pool is not None:
+                    pool.update_from(new.local_path)
+                    pool.remove_member(old.local_path)
+            except exceptions.ExternalProcessError:
+                # Stale refs of the old path only keep some objects in the pool.
+                logger.warning("Unable to update the object pool of the mirror.")
+
+        moved[url] = new.local_path
+
+    return moved
@@ -0,0 +1,430 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import datetime
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import typing
+
+from easy_mirrors import config, exceptions, git_repository, logger_wrapper
+
+logger = logging.getLogger("easy_mirrors")
+
+__all__ = [
+    "MANIFEST_NAME",
+    "Bundle",
+    "Manifest",
+    "export_bundle",
+    "export_bundles",
+    "get_bundle_directory",
+]
+
+MANIFEST_NAME: typing.Final[str] = "manifest.json"
+
+_MANIFEST_VERSION: typing.Final[int] = 1
+
+
+def _get_digest(path: str) -> str:
+    digest = hashlib.sha256()
+
+    with open(path, mode="rb") as stream_in:
+        while chunk := stream_in.read(1024 * 1024):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class Bundle:
+    """One link in the chain of bundles exported from a mirror.
+
+    Attributes
+    ----------
+    sequence : int
+        The number of the export, growing across chains.
+
+    kind : str
+        Either full or incremental.
+
+    created : float
+        The unix time of the export.
+
+    refs : dict[str, str]
+        The object name of every ref of the mirror at the time of the export.
+
+    prerequisites : list[str]
+        The object names the bundle depends on, taken from the previous link.
+
+    name : str or None
+        The file name of the bundle, or None when only refs changed and no new
+        objects had to be exported.
+
+    size : int
+        The size of the bundle file in bytes.
+
+    sha256 : str or None
+        The digest of the bundle file.
+    """
+
+    def __init__(
+        self,
+        sequence: int,
+        kind: str,
+        created: float,
+        refs: dict[str, str],
+        prerequisites: list[str] | None = None,
+        name: str | None = None,
+        size: int = 0,
+        sha256: str | None = None,
+    ) -> None:
+        self.sequence = sequence
+        self.kind = kind
+        self.created = created
+        self.refs = refs
+        self.prerequisites = prerequisites or []
+        self.name = name
+        self.size = size
+        self.sha256 = sha256
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return (
+            f"{self.__class__.__name__!s}"
+            f"(sequence={self.sequence:d}, kind={self.kind!r}, name={self.name!r})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return vars(self)
+
+
+class Manifest:
+    """Chain of bundles leading from the last full bundle to the newest one.
+
+    Applying the bundles in order and then setting the refs of the last one
+    restores the mirror as of its last export.
+
+    Attributes
+    ----------
+    url : str
+        The remote repository url.
+
+    head : str or None
+        The branch HEAD of the mirror points to.
+
+    bundles : list[Bundle]
+        The full bundle followed by its incremental bundles.
+    """
+
+    def __init__(
+        self, url: str, head: str | None = None, bundles: list[Bundle] | None = None
+    ) -> None:
+        self.url = url
+        self.head = head
+        self.bundles = bundles or []
+
+    @classmethod
+    def load(cls, directory: str) -> Manifest | None:
+        """Reads the manifest stored in a bundle directory, if any.
+
+        Raises
+        ------
+        FileSystemError
+            Raised when the manifest exists but can not be read.
+        """
+        path = os.path.join(directory, MANIFEST_NAME)
+        try:
+            with open(path, encoding="utf-8") as stream_in:
+                content = json.load(stream_in)
+
+            return cls(
+                url=content["url"],
+                head=content.get("head"),
+                bundles=[Bundle(**item) for item in content["bundles"]],
+            )
+        except FileNotFoundError:
+            return None
+
+        except (OSError, ValueError, KeyError, TypeError) as err:
+            logger.error("Unable to read the manifest of bundles.")
+            raise exceptions.FileSystemError(
+                f"Unable to read the manifest at the path: {path!r}"
+            ) from err
+
+    def save(self, directory: str) -> None:
+        """Atomically writes the manifest to a bundle directory.
+
+        Raises
+        ------
+        FileSystemError
+            Raised when the manifest can not be written.
+        """
+        path = os.path.join(directory, MANIFEST_NAME)
+        try:
+            with tempfile.NamedTemporaryFile(
+                "wt",
+                dir=directory,
+                encoding="utf-8",
+                delete=False,
+                prefix=".easy_mirrors-",
+            ) as stream_out:
+                json.dump(self.to_dict(), stream_out, indent=2, sort_keys=True)
+
+            os.chmod(stream_out.name, 0o644)  # nosec
+            os.replace(stream_out.name, path)
+        except OSError as err:
+            logger.error("Unable to write the manifest of bundles.")
+            raise exceptions.FileSystemError(
+                f"Unable to write the manifest to the path: {path!r}"
+            ) from err
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return (
+            f"{self.__class__.__name__!s}"
+            f"(url={self.url!r}, bundles={len(self.bundles):d})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return {
+            "version": _MANIFEST_VERSION,
+            "url": self.url,
+            "head": self.head,
+            "bundles": [bundle.to_dict() for bundle in self.bundles],
+        }
+
+
+def get_bundle_directory(configuration: config.Config, url: str) -> str:
+    """Returns the directory holding the bundles exported from a repository."""
+    repository = git_repository.GitRepository.from_url(
+        parent_path=configuration.path,
+        url=url,
+        layout=configuration.layout,
+    )
+
+    # Bundles are arranged like the mirrors, so their names never collide.
+    return os.path.join(
+        typing.cast(str, configuration.bundle_path),
+        os.path.relpath(repository.local_path, os.path.expanduser(configuration.path)),
+    )
+
+
+def _remove_stale_bundles(directory: str, manifest: Manifest) -> None:
+    """Removes bundle files no longer referenced by the manifest."""
+    names = {bundle.name for bundle in manifest.bundles}
+
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.endswith(".bundle") and entry.name not in names:
+                logger.debug("Removing the stale bundle: %r", entry.name)
+                os.remove(entry.path)
+
+
+def _choose_bundle_kind(
+    repository: git_repository.GitRepository,
+    manifest: Manifest | None,
+    full_interval: float,
+    now: float,
+) -> tuple[str, int, list[str]]:
+    """Chooses whether the next link of a chain is a full or incremental bundle.
+
+    Returns
+    -------
+    tuple[str, int, list[str]]
+        The kind and the sequence number of the next bundle, and the object
+        names it depends on.
+    """
+    if manifest is None or not manifest.bundles:
+        return "full", 1, []
+
+    previous = manifest.bundles[-1]
+    prerequisites = sorted(set(previous.refs.values()))
+
+    # A chain is restarted once it is too old or its history was rewritten.
+    if now - manifest.bundles[0].created >= full_interval:
+        return "full", previous.sequence + 1, []
+
+    if repository.get_unknown_objects(prerequisites):
+        return "full", previous.sequence + 1, []
+
+    return "incremental", previous.sequence + 1, prerequisites
+
+
+def export_bundle(
+    repository: git_repository.GitRepository,
+    directory: str,
+    full_interval: float,
+    now: float | None = None,
+) -> Bundle | None:
+    """Exports the changes of a mirror since its previous export.
+
+    An incremental bundle holds only the objects reachable from the current
+    refs but not from the refs recorded by the previous link of the chain. A
+    new chain starts with a full bundle once the previous full bundle is older
+    than the given interval or the history it depends on has been rewritten.
+    Bundles of older chains are removed after the new manifest is written.
+
+    Parameters
+    ----------
+    repository : GitRepository
+        The local mirror to export.
+
+    directory : str
+        The directory holding the bundles and the manifest of the mirror.
+
+    full_interval : float
+        The number of seconds after which a new full bundle is exported.
+
+    now : float, optional
+        The current unix time.
+
+    Returns
+    -------
+    Bundle or None
+        The new link of the chain, or None if the refs have not changed.
+
+    Raises
+    ------
+    ExternalProcessError
+        Raised when the bundle can not be written.
+
+    FileSystemError
+        Raised when the bundle directory or the manifest can not be accessed.
+    """
+    now = time.time() if now is None else now
+    refs = repository.get_local_refs()
+
+    if not refs:
+        logger.debug("Nothing to export from the empty mirror.")
+
+        return None
+
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as err:
+        raise exceptions.FileSystemError(
+            f"Unable to create the bundle directory: {directory!r}"
+        ) from err
+
+    manifest = Manifest.load(directory)
+    if manifest is not None and manifest.bundles:
+        if manifest.bundles[-1].refs == refs:
+            logger.debug("Refs have not changed since the last export.")
+
+            return None
+
+    kind, sequence, prerequisites = _choose_bundle_kind(
+        repository, manifest, full_interval, now
+    )
+
+    bundle = Bundle(sequence, kind, now, refs, prerequisites)
+
+    name = f"{sequence:06d}-{kind!s}.bundle"
+    path = os.path.join(directory, name)
+    # The bundle gets its name only once it is complete, so a manifest never
+    # references a truncated file. Leftovers of an interrupted export are
+    # removed with the stale bundles.
+    temporary_path = os.path.join(directory, f".easy_mirrors-{name!s}")
+
+    if repository.create_bundle(temporary_path, sorted(refs), prerequisites):
+        bundle.name = name
+        try:
+            bundle.size = os.path.getsize(temporary_path)
+            bundle.sha256 = _get_digest(temporary_path)
+            os.replace(temporary_path, path)
+        except OSError as err:
+            logger.error("Unable to write the bundle.")
+            raise exceptions.FileSystemError(
+                f"Unable to write the bundle to the path: {path!r}"
+            ) from err
+
+    if kind == "full" or manifest is None:
+        manifest = Manifest(repository.url, bundles=[bundle])
+    else:
+        manifest.bundles.append(bundle)
+
+    manifest.head = repository.get_head()
+    manifest.save(directory)
+
+    if kind == "full":
+        try:
+            _remove_stale_bundles(directory, manifest)
+        except OSError:
+            logger.warning("Unable to remove bundles of the previous chain.")
+
+    logger.info("Exported the %s bundle: %r", kind, bundle.name)
+
+    return bundle
+
+
+def export_bundles(
+    configuration: config.Config,
+    repositories: typing.Iterable[str] | None = None,
+    now: datetime.datetime | None = None,
+) -> dict[str, str]:
+    """Exports bundles of mirrors changed since their previous export.
+
+    A failed export is logged and does not prevent exports of other mirrors.
+    Partial clones are skipped until every missing object is backfilled,
+    because a bundle must hold the complete history of its refs.
+
+    Parameters
+    ----------
+    configuration : Config
+        The configuration listing mirrored repositories and the bundle path.
+
+    repositories : Iterable[str], optional
+        The subset of repositories to export instead of all configured ones.
+
+    now : datetime, optional
+        The current local time.
+
+    Returns
+    -------
+    dict[str, str]
+        The kind of the bundle exported from every changed repository.
+    """
+    if configuration.bundle_path is None:
+        return {}
+
+    timestamp = (datetime.datetime.now() if now is None else now).timestamp()
+    exported: dict[str, str] = {}
+
+    for url in configuration.repositories if repositories is None else repositories:
+        repository = git_repository.GitRepository.from_url(
+            parent_path=configuration.path,
+            url=url,
+            layout=configuration.layout,
+        )
+
+        with logger_wrapper.repository_context(url):
+            if not repository.exists_locally():
+                continue
+
+            if repository.get_partial_clone_filter() is not None:
+                logger.debug("Partial clones are not exported.")
+                continue
+
+            try:
+                bundle = export_bundle(
+                    repository,
+                    get_bundle_directory(configuration, url),
+                    configuration.bundle_full_interval * 24 * 60 * 60,
+                    timestamp,
+                )
+            except (exceptions.ExternalProcessError, exceptions.FileSystemError):
+                logger.warning("Unable to export a bundle of the mirror.")
+                continue
+
+            if bundle is not None:
+                exported[url] = bundle.kind
+
+    return exported
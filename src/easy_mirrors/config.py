@@ -13,7 +13,7 @@ import os
 import re
 import typing
 
-from easy_mirrors import exceptions, fields
+from easy_mirrors import exceptions, fields, git_repository, limits, refspecs, urls
 
 logger = logging.getLogger("easy_mirrors")
 
@@ -21,6 +21,158 @@ __all__ = ["Config"]
 
 _T = typing.TypeVar("_T", bound="Config")
 
+# Partial clone filters supported by git: blob:none, blob:limit=<n>[kmg], tree:<n>.
+_FILTER_SPEC: typing.Final[re.Pattern[str]] = re.compile(
+    r"^(?:blob:none|blob:limit=\d+[kmg]?|tree:\d+)$"
+)
+
+# Names of fork families are used as directory names of their object pools.
+_FAMILY_NAME: typing.Final[re.Pattern[str]] = re.compile(r"^[\w][\w.-]*$")
+
+
+def _split_urls(value: str) -> list[str]:
+    """Splits a multi-line configuration value into repository urls."""
+    return [url for item in re.split(r"[^\w:/@.-]+", value) if (url := item.strip())]
+
+
+def _get_sections(
+    config_parser: configparser.ConfigParser, kind: str
+) -> typing.Iterator[str]:
+    """Yields the names of sections like ``[<kind>:<name>]``."""
+    for section in config_parser.sections():
+        if section.split(":")[0] == kind:
+            yield section
+
+
+def _read_options(
+    config_parser: configparser.ConfigParser,
+    section: str,
+    getters: typing.Mapping[str, str],
+) -> dict[str, typing.Any]:
+    """Reads the optional settings present in a section.
+
+    Parameters
+    ----------
+    getters : Mapping[str, str]
+        The names of parser methods used to read every optional setting.
+
+    Raises
+    ------
+    ConfigError
+        Raised when a value cannot be converted to the expected type.
+    """
+    options: dict[str, typing.Any] = {}
+
+    for name, getter in getters.items():
+        if not config_parser.has_option(section, name):
+            continue
+
+        try:
+            options[name] = getattr(config_parser, getter)(section, name)
+        except ValueError as err:
+            raise exceptions.ConfigError(
+                f"Invalid value of the configuration option: {name!r}"
+            ) from err
+
+    return options
+
+
+def _read_fork_families(
+    config_parser: configparser.ConfigParser,
+) -> dict[str, typing.Any]:
+    """Reads the [fork_families] section, every option listing one family."""
+    if not config_parser.has_section("fork_families"):
+        return {}
+
+    return {
+        "fork_families": {
+            name: _split_urls(value)
+            for name, value in config_parser.items("fork_families")
+        }
+    }
+
+
+def _read_partial_clones(
+    config_parser: configparser.ConfigParser,
+) -> dict[str, typing.Any]:
+    """Reads sections like [partial_clone:binaries] with partial clone filters.
+
+    Every section assigns one filter to a group of repositories, optionally
+    backfilled later.
+    """
+    partial_clone_filters: dict[str, str] = {}
+    backfill: list[str] = []
+
+    for section in _get_sections(config_parser, "partial_clone"):
+        try:
+            members = _split_urls(config_parser.get(section, "repositories"))
+            filter_spec = config_parser.get(section, "filter").strip()
+
+            if config_parser.getboolean(section, "backfill", fallback=False):
+                backfill.extend(members)
+        except (ValueError, configparser.Error) as err:
+            raise exceptions.ConfigError(
+                f"Invalid partial clone section: {section!r}"
+            ) from err
+
+        for url in members:
+            if partial_clone_filters.setdefault(url, filter_spec) != filter_spec:
+                raise exceptions.ConfigError(
+                    f"Repository {url!r} has several partial clone filters."
+                )
+
+    if not partial_clone_filters:
+        return {}
+
+    return {"partial_clone_filters": partial_clone_filters, "backfill": backfill}
+
+
+def _read_ref_filters(
+    config_parser: configparser.ConfigParser,
+) -> dict[str, typing.Any]:
+    """Reads sections like [refs:hosted] limiting the refs of repositories."""
+    ref_filters: dict[str, dict[str, typing.Any]] = {}
+
+    for section in _get_sections(config_parser, "refs"):
+        try:
+            members = _split_urls(config_parser.get(section, "repositories"))
+            ref_filter = {
+                "include": config_parser.get(section, "include", fallback="").split()
+                or None,
+                "exclude": config_parser.get(section, "exclude", fallback="").split(),
+                "negotiation": config_parser.get(section, "negotiation", fallback=None),
+            }
+        except configparser.Error as err:
+            raise exceptions.ConfigError(
+                f"Invalid ref filter section: {section!r}"
+            ) from err
+
+        for url in members:
+            if ref_filters.setdefault(url, ref_filter) is not ref_filter:
+                raise exceptions.ConfigError(
+                    f"Repository {url!r} has several ref filters."
+                )
+
+    return {"ref_filters": ref_filters} if ref_filters else {}
+
+
+def _read_git_config(
+    config_parser: configparser.ConfigParser,
+) -> dict[str, typing.Any]:
+    """Reads sections like [git:clone] overriding git configuration values."""
+    git_config = {
+        section.partition(":")[2].strip(): dict(config_parser.items(section, raw=True))
+        for section in _get_sections(config_parser, "git")
+    }
+
+    return {"git_config": git_config} if git_config else {}
+
+
+# Readers of the sections following the main one, each returning options.
+_SECTION_READERS: typing.Final[
+    tuple[typing.Callable[[configparser.ConfigParser], dict[str, typing.Any]], ...]
+] = (_read_fork_families, _read_partial_clones, _read_ref_filters, _read_git_config)
+
 
 class Config:
     """Configuration for local repository mirroring.
@@ -35,16 +187,420 @@ class Config:
 
     repositories : list[str]
         A list of remote repository urls to be mirrored.
+
+    jobs : int
+        The maximum number of repositories synchronized concurrently.
+
+    min_period : int or None
+        The shortest interval in minutes between two syncs of one repository.
+
+    max_period : int or None
+        The longest interval in minutes between two syncs of one repository.
+
+    host_jobs : int or None
+        The maximum number of repositories synchronized concurrently per host.
+
+    host_rate : int or None
+        The maximum number of repository syncs started per minute per host.
+
+    retries : int
+        The number of additional attempts to sync a failed repository.
+
+    retry_delay : int
+        The delay in seconds before the first retry, doubled for every next one.
+
+    metrics_port : int or None
+        The local port serving metrics in the Prometheus text format.
+
+    metrics_path : str or None
+        The file where metrics are written for the textfile collector.
+
+    shared_objects : bool
+        Detects forks of already mirrored repositories and stores their shared
+        history once in an object pool.
+
+    fork_families : dict[str, list[str]]
+        Repositories declared as forks of one project, keyed by family name.
+        Members of a family always share an object pool.
+
+    maintenance_budget : int
+        The longest time in seconds spent on maintenance of mirrors per cycle.
+
+    maintenance_window : str or None
+        The daily off-peak time window when full repacks are allowed. Full
+        repacks never run without a window.
+
+    partial_clone_filters : dict[str, str]
+        Partial clone filters, such as ``blob:none``, keyed by repository url.
+
+    backfill : list[str]
+        Partially cloned repositories whose missing objects are downloaded
+        gradually during maintenance.
+
+    ref_filters : dict[str, dict[str, Any]]
+        Included and excluded ref patterns and the fetch negotiation algorithm,
+        keyed by repository url.
+
+    bundle_path : str or None
+        The directory where bundles of changed mirrors are exported.
+
+    bundle_full_interval : int
+        The number of days after which a new chain of bundles starts with a
+        full bundle.
+
+    layout : str
+        The arrangement of mirrors inside the local root directory: flat, host
+        or hash. Layouts other than flat store every repository once, however
+        its url is spelled.
+
+    control_socket : str or None
+        The Unix domain socket accepting commands for the running daemon. The
+        daemon accepts no commands without it.
+
+    webhook_port : int or None
+        The local port receiving push webhooks of git hosts.
+
+    webhook_delay : int
+        The number of seconds push webhooks for one repository are coalesced
+        into a single sync.
+
+    ls_remote_timeout : int
+        The number of seconds after which a listing of remote refs is killed;
+        zero disables the timeout.
+
+    fetch_timeout : int
+        The number of seconds after which a fetch is killed; zero disables the
+        timeout.
+
+    clone_timeout : int
+        The number of seconds after which the initial transfer of a mirror is
+        killed; zero disables the timeout.
+
+    low_speed_limit : int or None
+        The transfer rate in bytes per second below which git aborts a stalled
+        http transfer.
+
+    low_speed_time : int
+        The number of seconds a transfer may stay below the low-speed limit.
+
+    clone_jobs : int or None
+        The maximum number of concurrent clones.
+
+    fetch_jobs : int or None
+        The maximum number of concurrent fetches.
+
+    nice : int
+        The niceness added to git processes, from 0 to 19.
+
+    ionice : str
+        The disk scheduling class of git processes: default, best-effort or
+        idle.
+
+    git_config : dict[str, dict[str, str]]
+        Git configuration values keyed by the git operation they override, such
+        as clone, fetch or repack.
     """
 
     section: typing.ClassVar[str] = "easy_mirrors"
 
+    # Optional settings with names of parser methods used to read them.
+    options: typing.ClassVar[dict[str, str]] = {
+        "bundle_full_interval": "getint",
+        "bundle_path": "get",
+        "clone_jobs": "getint",
+        "clone_timeout": "getint",
+        "control_socket": "get",
+        "host_jobs": "getint",
+        "host_rate": "getint",
+        "ionice": "get",
+        "jobs": "getint",
+        "fetch_jobs": "getint",
+        "fetch_timeout": "getint",
+        "layout": "get",
+        "low_speed_limit": "getint",
+        "low_speed_time": "getint",
+        "ls_remote_timeout": "getint",
+        "maintenance_budget": "getint",
+        "maintenance_window": "get",
+        "max_period": "getint",
+        "metrics_path": "get",
+        "metrics_port": "getint",
+        "min_period": "getint",
+        "nice": "getint",
+        "retries": "getint",
+        "retry_delay": "getint",
+        "shared_objects": "getboolean",
+        "webhook_delay": "getint",
+        "webhook_port": "getint",
+    }
+
     path: str = fields.PathField()  # type: ignore
     repositories: list[str] = fields.SequenceField()  # type: ignore
+    jobs: int = fields.IntegerField(minimum=1)  # type: ignore
+    min_period: int | None = fields.IntegerField(  # type: ignore
+        minimum=1, optional=True
+    )
+    max_period: int | None = fields.IntegerField(  # type: ignore
+        minimum=1, optional=True
+    )
+
+    host_jobs: int | None = fields.IntegerField(  # type: ignore
+        minimum=1, optional=True
+    )
+    host_rate: int | None = fields.IntegerField(  # type: ignore
+        minimum=1, optional=True
+    )
+    retries: int = fields.IntegerField(minimum=0)  # type: ignore
+    retry_delay: int = fields.IntegerField(minimum=0)  # type: ignore
+    metrics_port: int | None = fields.IntegerField(  # type: ignore
+        minimum=1, maximum=65535, optional=True
+    )
+    metrics_path: str | None = fields.PathField(optional=True)  # type: ignore
+    shared_objects: bool = fields.BooleanField()  # type: ignore
+    maintenance_budget: int = fields.IntegerField(minimum=0)  # type: ignore
+    maintenance_window: str | None = fields.TimeWindowField(  # type: ignore
+        optional=True
+    )
+    bundle_path: str | None = fields.PathField(optional=True)  # type: ignore
+    bundle_full_interval: int = fields.IntegerField(minimum=1)  # type: ignore
+    layout: str = fields.ChoiceField(git_repository.LAYOUTS)  # type: ignore
+    control_socket: str | None = fields.PathField(optional=True)  # type: ignore
+    webhook_port: int | None = fields.IntegerField(  # type: ignore
+        minimum=1, maximum=65535, optional=True
+    )
+    webhook_delay: int = fields.IntegerField(minimum=0)  # type: ignore
+    ls_remote_timeout: int = fields.IntegerField(minimum=0)  # type: ignore
+    fetch_timeout: int = fields.IntegerField(minimum=0)  # type: ignore
+    clone_timeout: int = fields.IntegerField(minimum=0)  # type: ignore
+    low_speed_limit: int | None = fields.IntegerField(  # type: ignore
+        minimum=1, optional=True
+    )
+    low_speed_time: int = fields.IntegerField(minimum=1)  # type: ignore
+    clone_jobs: int | None = fields.IntegerField(  # type: ignore
+        minimum=1, optional=True
+    )
+    fetch_jobs: int | None = fields.IntegerField(  # type: ignore
+        minimum=1, optional=True
+    )
+    nice: int = fields.IntegerField(minimum=0, maximum=19)  # type: ignore
+    ionice: str = fields.ChoiceField(limits.IONICE_CLASSES)  # type: ignore
 
-    def __init__(self, path: str, repositories: list[str]) -> None:
+    def __init__(
+        self,
+        path: str,
+        repositories: list[str],
+        jobs: int = 1,
+        min_period: int | None = None,
+        max_period: int | None = None,
+        host_jobs: int | None = None,
+        host_rate: int | None = None,
+        retries: int = 2,
+        retry_delay: int = 10,
+        metrics_port: int | None = None,
+        metrics_path: str | None = None,
+        shared_objects: bool = False,
+        fork_families: dict[str, list[str]] | None = None,
+        maintenance_budget: int = 300,
+        maintenance_window: str | None = None,
+        partial_clone_filters: dict[str, str] | None = None,
+        backfill: list[str] | None = None,
+        ref_filters: dict[str, dict[str, typing.Any]] | None = None,
+        bundle_path: str | None = None,
+        bundle_full_interval: int = 7,
+        layout: str = "flat",
+        control_socket: str | None = None,
+        webhook_port: int | None = None,
+        webhook_delay: int = 5,
+        ls_remote_timeout: int = 300,
+        fetch_timeout: int = 7200,
+        clone_timeout: int = 43200,
+        low_speed_limit: int | None = None,
+        low_speed_time: int = 60,
+        clone_jobs: int | None = None,
+        fetch_jobs: int | None = None,
+        nice: int = 0,
+        ionice: str = "default",
+        git_config: dict[str, dict[str, str]] | None = None,
+    ) -> None:
         self.path = path
         self.repositories = repositories
+        self.layout = layout
+        if self.layout != "flat":
+            self.repositories = self._deduplicate(self.repositories)
+        self.jobs = jobs
+        self.min_period = min_period
+        self.max_period = max_period
+        self.host_jobs = host_jobs
+        self.host_rate = host_rate
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.metrics_port = metrics_port
+        self.metrics_path = metrics_path
+        self.shared_objects = shared_objects
+        self.fork_families = self._validate_fork_families(fork_families or {})
+        self.maintenance_budget = maintenance_budget
+        self.maintenance_window = maintenance_window
+        self.partial_clone_filters = self._validate_partial_clone_filters(
+            partial_clone_filters or {}
+        )
+        self.backfill = sorted(set(backfill or []))
+
+        for url in self.backfill:
+            if url not in self.partial_clone_filters:
+                raise exceptions.ConfigError(
+                    f"Repository {url!r} can not be backfilled without a filter."
+                )
+
+        # Membership checks stay cheap for configurations with many repositories.
+        configured = set(self.repositories)
+
+        self.ref_filters: dict[str, dict[str, typing.Any]] = {}
+        for url, options in sorted((ref_filters or {}).items()):
+            if url not in configured:
+                raise exceptions.ConfigError(
+                    f"Repository {url!r} with a ref filter is not configured."
+                )
+
+            self.ref_filters[url] = refspecs.RefFilter(**options).to_dict()
+
+        self.bundle_path = bundle_path
+        self.bundle_full_interval = bundle_full_interval
+        self.control_socket = control_socket
+        self.webhook_port = webhook_port
+        self.webhook_delay = webhook_delay
+        self.ls_remote_timeout = ls_remote_timeout
+        self.fetch_timeout = fetch_timeout
+        self.clone_timeout = clone_timeout
+        self.low_speed_limit = low_speed_limit
+        self.low_speed_time = low_speed_time
+        self.clone_jobs = clone_jobs
+        self.fetch_jobs = fetch_jobs
+        self.nice = nice
+        self.ionice = ionice
+        self.git_config = limits.Resources(git_config=git_config).git_config
+
+        if min_period is not None and max_period is not None:
+            if min_period > max_period:
+                raise exceptions.ConfigError(
+                    "Option 'min_period' can not be greater than 'max_period'."
+                )
+
+    @staticmethod
+    def _deduplicate(repositories: list[str]) -> list[str]:
+        """Keeps the first of several urls pointing to the same repository."""
+        unique: dict[str, str] = {}
+
+        for url in repositories:
+            if (first := unique.setdefault(urls.canonicalize(url), url)) != url:
+                logger.warning("Repository %r is already configured as %r.", url, first)
+
+        return list(unique.values())
+
+    def _validate_fork_families(
+        self, fork_families: dict[str, list[str]]
+    ) -> dict[str, list[str]]:
+        families: dict[str, list[str]] = {}
+        members: dict[str, str] = {}
+        configured = set(self.repositories)
+
+        for name, family_urls in fork_families.items():
+            if not _FAMILY_NAME.match(name):
+                raise exceptions.ConfigError(
+                    f"Invalid name of the fork family: {name!r}"
+                )
+
+            for url in family_urls:
+                if url not in configured:
+                    raise exceptions.ConfigError(
+                        f"Repository {url!r} of the fork family {name!r} "
+                        "is not configured."
+                    )
+
+                if members.setdefault(url, name) != name:
+                    raise exceptions.ConfigError(
+                        f"Repository {url!r} belongs to several fork families."
+                    )
+
+            families[name] = sorted(set(family_urls))
+
+        return families
+
+    def _validate_partial_clone_filters(
+        self, partial_clone_filters: dict[str, str]
+    ) -> dict[str, str]:
+        configured = set(self.repositories)
+
+        for url, filter_spec in partial_clone_filters.items():
+            if url not in configured:
+                raise exceptions.ConfigError(
+                    f"Repository {url!r} with a partial clone filter is not configured."
+                )
+
+            if not _FILTER_SPEC.match(filter_spec):
+                raise exceptions.ConfigError(
+                    f"Invalid partial clone filter: {filter_spec!r}"
+                )
+
+        return dict(sorted(partial_clone_filters.items()))
+
+    def get_ref_filter(self, url: str) -> refspecs.RefFilter | None:
+        """Returns the selection of refs mirrored from a repository, if limited."""
+        if (options := self.ref_filters.get(url)) is None:
+            return None
+
+        return refspecs.RefFilter(**options)
+
+    def get_periods(self, period: int) -> tuple[int, int]:
+        """Returns the bounds of the synchronization interval in minutes.
+
+        A bound that is not configured is derived from the one that is, so the
+        default period never overrides an explicit bound.
+
+        Parameters
+        ----------
+        period : int
+            The default synchronization period in minutes.
+        """
+        if self.min_period is not None and self.max_period is not None:
+            return self.min_period, self.max_period
+
+        if self.min_period is not None:
+            return self.min_period, max(self.min_period, period)
+
+        if self.max_period is not None:
+            return min(self.max_period, period), self.max_period
+
+        return period, period
+
+    def get_timeouts(self) -> limits.Timeouts:
+        """Returns the limits on the duration of git operations."""
+        return limits.Timeouts(
+            ls_remote=self.ls_remote_timeout or None,
+            fetch=self.fetch_timeout or None,
+            clone=self.clone_timeout or None,
+            low_speed_limit=self.low_speed_limit,
+            low_speed_time=self.low_speed_time,
+        )
+
+    def get_operation_limiter(self) -> limits.OperationLimiter:
+        """Returns the caps on concurrent clones and fetches."""
+        return limits.OperationLimiter(
+            {"clone": self.clone_jobs, "fetch": self.fetch_jobs}
+        )
+
+    def get_resources(self) -> limits.Resources:
+        """Returns the priority and the configuration overrides of git."""
+        return limits.Resources(
+            nice=self.nice, ionice=self.ionice, git_config=self.git_config
+        )
+
+    def get_fork_family(self, url: str) -> str | None:
+        """Returns the name of the declared fork family of a repository, if any."""
+        for name, family_urls in self.fork_families.items():
+            if url in family_urls:
+                return name
+
+        return None
 
     @classmethod
     def load(cls: type[_T], path: str) -> _T:
@@ -98,17 +654,21 @@ class Config:
         ):
             raise exceptions.ConfigError("File does not match expected schema.")
 
+        options = _read_options(config_parser, cls.section, cls.options)
+        for read_sections in _SECTION_READERS:
+            options.update(read_sections(config_parser))
+
         return cls(
             path=config_parser.get(cls.section, "path"),  # type: ignore
-            repositories=[
-                url
-                for item in re.split(
-                    r"[^\w:/@.-]+", config_parser.get(cls.section, "repositories")
-                )
-                if (url := item.strip())
-            ],
+            repositories=_split_urls(config_parser.get(cls.section, "repositories")),
+            **options,
         )
 
+    @property
+    def state_path(self) -> str:
+        """The local path to the database holding the synchronization history."""
+        return os.path.join(self.path, ".easy_mirrors.sqlite3")
+
     def __str__(self) -> str:
         return json.dumps(self.to_dict(), indent=2)  # serialize
 
@@ -120,5 +680,5 @@ class Config:
             f"(path={str(self.path)!r}, repositories={self.repositories!s})"
         )
 
-    def to_dict(self) -> dict[str, list[str]]:
+    def to_dict(self) -> dict[str, typing.Any]:
         return vars(self)
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+import threading
+import typing
+
+from easy_mirrors import exceptions
+
+if typing.TYPE_CHECKING:
+    from easy_mirrors import daemon
+
+logger = logging.getLogger("easy_mirrors")
+
+__all__ = ["COMMANDS", "ControlServer", "send_command", "start_server"]
+
+COMMANDS: typing.Final[tuple[str, ...]] = ("pause", "resume", "status", "sync")
+
+# Requests are single lines of JSON, so anything longer is malformed.
+_MAX_REQUEST_SIZE: typing.Final[int] = 1024 * 1024
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    """Answers one request read from a connection to the control socket."""
+
+    server: ControlServer
+
+    def handle(self) -> None:
+        line = self.rfile.readline(_MAX_REQUEST_SIZE)
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be an object")
+
+            response = self.server.execute(request)
+        except ValueError as err:
+            response = {"ok": False, "error": f"Invalid request: {err!s}"}
+
+        self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+
+
+class ControlServer(socketserver.ThreadingUnixStreamServer):
+    """Unix domain socket accepting commands for a running daemon.
+
+    Every connection carries one request and one response, each a JSON object
+    on a single line. Requests name one of the supported commands:
+
+    - ``sync`` syncs the listed ``repositories`` right away,
+    - ``status`` describes syncs in flight, requested and queued,
+    - ``pause`` and ``resume`` stop and start scheduled syncs.
+
+    The socket is accessible to its owner only.
+
+    Parameters
+    ----------
+    path : str
+        The local path to the socket.
+
+    mirror_daemon : Daemon
+        The daemon receiving the commands.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, path: str, mirror_daemon: daemon.Daemon) -> None:
+        # A failed bind closes the server, which needs the path of the socket.
+        self.path = path
+        self.mirror_daemon = mirror_daemon
+
+        super().__init__(path, _ControlHandler)
+
+        os.chmod(path, 0o600)
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return f"{self.__class__.__name__!s}(path={self.path!r})"
+
+    def execute(self, request: dict[str, typing.Any]) -> dict[str, typing.Any]:
+        """Runs a command and returns the response sent back to the client."""
+        command = request.get("command")
+
+        if command == "sync":
+            repositories = request.get("repositories")
+            if not repositories or not isinstance(repositories, list):
+                return {"ok": False, "error": "No repositories to sync."}
+
+            requested, unknown = self.mirror_daemon.request_sync(
+                [str(url) for url in repositories]
+            )
+
+            return {"ok": not unknown, "requested": requested, "unknown": unknown}
+
+        if command == "status":
+            return {"ok": True, **self.mirror_daemon.get_status()}
+
+        if command == "pause":
+            self.mirror_daemon.pause()
+
+            return {"ok": True, "paused": True}
+
+        if command == "resume":
+            self.mirror_daemon.resume()
+
+            return {"ok": True, "paused": False}
+
+        return {"ok": False, "error": f"Unknown command: {command!r}"}
+
+    def server_close(self) -> None:
+        """Closes the socket and removes its file."""
+        super().server_close()
+
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def send_command(
+    path: str, command: str, timeout: float = 10.0, **arguments: typing.Any
+) -> dict[str, typing.Any]:
+    """Sends a command to the daemon listening on the control socket.
+
+    Parameters
+    ----------
+    path : str
+        The local path to the control socket.
+
+    command : str
+        The name of the command.
+
+    timeout : float, default=10.0
+        The number of seconds to wait for the response.
+
+    **arguments
+        The arguments of the command, such as a list of ``repositories``.
+
+    Returns
+    -------
+    dict[str, Any]
+        The response of the daemon.
+
+    Raises
+    ------
+    FileSystemError
+        Raised when the daemon can not be reached.
+    """
+    request = json.dumps({"command": command, **arguments}).encode("utf-8") + b"\n"
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.settimeout(timeout)
+            connection.connect(path)
+            connection.sendall(request)
+
+            with connection.makefile("rb") as stream_in:
+                return json.loads(stream_in.readline())
+    except (OSError, ValueError) as err:
+        raise exceptions.FileSystemError(
+            f"Unable to reach the daemon at the control socket: {path!r}"
+        ) from err
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Removes a socket left by a daemon that is no longer running."""
+    try:
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            raise exceptions.FileSystemError(
+                f"The control socket path is taken by another file: {path!r}"
+            )
+    except FileNotFoundError:
+        return
+
+    try:
+        send_command(path, "status", timeout=1.0)
+    except exceptions.FileSystemError:
+        logger.debug("Removing the stale control socket: %r", path)
+        os.remove(path)
+    else:
+        raise exceptions.FileSystemError(
+            f"Another daemon is listening on the control socket: {path!r}"
+        )
+
+
+def start_server(path: str, mirror_daemon: daemon.Daemon) -> ControlServer:
+    """Serves the control socket of a daemon from a background thread.
+
+    Raises
+    ------
+    FileSystemError
+        Raised when the socket can not be bound, for example because another
+        daemon is already listening on it.
+    """
+    try:
+        _remove_stale_socket(path)
+        server = ControlServer(path, mirror_daemon)
+    except (exceptions.FileSystemError, OSError) as err:
+        logger.error("Unable to start the control server.")
+        raise exceptions.FileSystemError(
+            f"Unable to listen for commands on the control socket: {path!r}"
+        ) from err
+
+    threading.Thread(
+        target=server.serve_forever, name="easy_mirrors-control", daemon=True
+    ).start()
+    logger.info("Listening for commands on the control socket: %r", path)
+
+    return server
@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+import typing
+
+from easy_mirrors import (
+    api,
+    bundles,
+    config,
+    git_repository,
+    inventory,
+    maintenance,
+    metrics,
+    scheduler,
+    state,
+    urls,
+    watcher,
+)
+
+logger = logging.getLogger("easy_mirrors")
+
+__all__ = ["Daemon"]
+
+# Options applied when the daemon starts, whose changes need a restart.
+_RESTART_OPTIONS: typing.Final[tuple[str, ...]] = (
+    "control_socket",
+    "metrics_port",
+    "webhook_delay",
+    "webhook_port",
+)
+
+# Options limiting concurrent syncs, which replace the shared dispatcher.
+_DISPATCH_OPTIONS: typing.Final[tuple[str, ...]] = (
+    "clone_jobs",
+    "fetch_jobs",
+    "host_jobs",
+    "host_rate",
+    "jobs",
+)
+
+
+class Daemon:
+    """Long-running synchronization loop driven by the adaptive scheduler.
+
+    Instead of mirroring every repository and sleeping for a fixed period, the
+    daemon syncs only repositories whose own interval has elapsed and sleeps
+    until the earliest next one becomes due. Every cycle exports bundles of the
+    synced mirrors, if configured, and ends with maintenance of the synced
+    mirrors that need it.
+
+    Syncs requested on demand, for example through the control socket, run at
+    once on a separate thread, alongside the running cycle, and share with it
+    one dispatcher, so that together they stay within the concurrency limits.
+    A repository being synced, exported or maintained by the cycle is synced
+    again once the cycle finishes, and the cycle leaves alone repositories
+    handled on request. While paused, the daemon runs requested syncs only.
+
+    Parameters
+    ----------
+    configuration : Config
+        The configuration listing repositories to mirror.
+
+    state_store : StateStore
+        The store holding the synchronization history of repositories.
+
+    min_interval : float
+        The shortest interval in seconds between two syncs of one repository.
+
+    max_interval : float
+        The longest interval in seconds between two syncs of one repository.
+
+    period : int, optional
+        The default synchronization period in minutes, from which the interval
+        bounds of a reloaded configuration are derived. Without it, reloads
+        keep the initial bounds.
+    """
+
+    def __init__(
+        self,
+        configuration: config.Config,
+        state_store: state.StateStore,
+        min_interval: float,
+        max_interval: float,
+        period: int | None = None,
+    ) -> None:
+        self.configuration = configuration
+        self.state_store = state_store
+        self.period = period
+        self.scheduler = scheduler.Scheduler(min_interval, max_interval)
+        self.inventory = inventory.Inventory(configuration.path)
+        self.dispatcher = api.Dispatcher(configuration)
+        self.paused = False
+
+        # Control requests arrive from other threads while a cycle is running.
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._requests = threading.Event()
+        self._requested: dict[str, None] = {}
+        # Repositories handled by the cycle and on request, from their sync to
+        # their maintenance, which are never handled by both at once.
+        self._in_flight: list[str] = []
+        self._requested_in_flight: list[str] = []
+
+        states = state_store.get_all()
+        for url in configuration.repositories:
+            self.scheduler.add(url, states.get(url))
+
+    def reload(self, configuration: config.Config) -> tuple[list[str], list[str]]:
+        """Replaces the configuration used by the next cycles.
+
+        Only the difference between the old and the new list of repositories
+        is applied to the schedule: added repositories become due according to
+        their history, removed ones are never synced again, and the remaining
+        ones keep their intervals within the new bounds. Syncs already running
+        are not affected. Changes of options applied only on start, such as
+        the ports of servers, are logged as needing a restart.
+
+        Returns
+        -------
+        tuple[list[str], list[str]]
+            The added and the removed repositories.
+        """
+        old, new = set(self.configuration.repositories), set(configuration.repositories)
+
+        added, removed = sorted(new - old), sorted(old - new)
+        states = self.state_store.get_all() if added else {}
+
+        with self._lock:
+            for url in added:
+                self.scheduler.add(url, states.get(url))
+
+            for url in removed:
+                self.scheduler.remove(url)
+                self._requested.pop(url, None)
+
+            if self.period is not None:
+                min_period, max_period = configuration.get_periods(self.period)
+                self.scheduler.set_bounds(min_period * 60, max_period * 60)
+
+        if changed := [
+            name
+            for name in _RESTART_OPTIONS
+            if getattr(configuration, name) != getattr(self.configuration, name)
+        ]:
+            logger.warning(
+                "Changes of %s take effect after a restart.", ", ".join(changed)
+            )
+
+        if configuration.layout != self.configuration.layout:
+            api.migrate_mirrors(configuration)
+
+        # Mirrors are moved by a migration, so they are indexed again.
+        if (configuration.path, configuration.layout) != (
+            self.configuration.path,
+            self.configuration.layout,
+        ):
+            self.inventory = inventory.Inventory(configuration.path)
+
+        # Syncs already running finish within the limits of the old dispatcher.
+        if any(
+            getattr(configuration, name) != getattr(self.configuration, name)
+            for name in _DISPATCH_OPTIONS
+        ):
+            self.dispatcher = api.Dispatcher(configuration)
+
+        self.configuration = configuration
+        git_repository.set_resources(configuration.get_resources())
+        logger.info(
+            "Configuration applied: %d repositories added, %d removed.",
+            len(added),
+            len(removed),
+        )
+
+        return added, removed
+
+    def wake(self) -> None:
+        """Cuts the sleep before the next cycle short."""
+        self._wakeup.set()
+
+    def request_sync(
+        self, repositories: typing.Iterable[str]
+    ) -> tuple[list[str], list[str]]:
+        """Syncs repositories right away, regardless of their schedule.
+
+        Repositories are matched against the configured ones by their canonical
+        urls, so any spelling of a configured url is accepted.
+
+        Returns
+        -------
+        tuple[list[str], list[str]]
+            The configured urls of the requested repositories and the requested
+            repositories that are not configured.
+        """
+        canonical = {
+            urls.canonicalize(url): url for url in self.configuration.repositories
+        }
+        requested, unknown = [], []
+
+        with self._lock:
+            for url in repositories:
+                if url not in self.scheduler:
+                    url = canonical.get(urls.canonicalize(url), url)
+
+                if url in self.scheduler:
+                    self._requested[url] = None
+                    requested.append(url)
+                else:
+                    unknown.append(url)
+
+        if requested:
+            logger.info("Sync requested for %d repositories.", len(requested))
+            self._requests.set()
+
+        return requested, unknown
+
+    def pause(self) -> None:
+        """Stops starting scheduled syncs; requested syncs still run."""
+        with self._lock:
+            self.paused = True
+
+        logger.info("Scheduled syncs paused.")
+
+    def resume(self) -> None:
+        """Starts scheduled syncs again."""
+        with self._lock:
+            self.paused = False
+
+        logger.info("Scheduled syncs resumed.")
+        self.wake()
+
+    def get_status(self, limit: int = 20) -> dict[str, typing.Any]:
+        """Describes syncs in flight, requested ones and the earliest due ones.
+
+        Parameters
+        ----------
+        limit : int, default=20
+            The maximum number of queued repositories described.
+        """
+        with self._lock:
+            queue = self.scheduler.get_queue()
+
+            return {
+                "paused": self.paused,
+                "in_flight": self._in_flight + self._requested_in_flight,
+                "requested": list(self._requested),
+                "queued": [{"url": url, "due": due} for due, url in queue[:limit]],
+                "total": len(self.scheduler),
+            }
+
+    def _sync(self, urls: list[str]) -> dict[str, str]:
+        """Syncs and reschedules repositories, then exports and maintains them."""
+        statuses = api.make_mirrors(
+            self.configuration,
+            state_store=self.state_store,
+            repositories=urls,
+            mirrors=self.inventory,
+            dispatcher=self.dispatcher,
+        )
+
+        with self._lock:
+            for url, status in statuses.items():
+                self.scheduler.reschedule(url, status)
+
+        synced = [
+            url for url, status in statuses.items() if status in state.SUCCESS_STATUSES
+        ]
+
+        # Bundles are exported right after fetches, before any repack.
+        bundles.export_bundles(self.configuration, repositories=synced)
+
+        # Mirrors are maintained after fetches within a separate budget. Only
+        # the synced mirrors are inspected, so a short cycle never scans the
+        # pack directories of every mirror.
+        maintenance.run_maintenance(self.configuration, repositories=synced)
+
+        return statuses
+
+    def run_requested(self) -> dict[str, str]:
+        """Syncs requested repositories that the cycle is not syncing.
+
+        Returns
+        -------
+        dict[str, str]
+            The outcome for every synced repository.
+        """
+        with self._lock:
+            urls = [url for url in self._requested if url not in self._in_flight]
+            for url in urls:
+                del self._requested[url]
+
+            self._requested_in_flight = urls
+
+        if not urls:
+            return {}
+
+        try:
+            return self._sync(urls)
+        finally:
+            with self._lock:
+                self._requested_in_flight = []
+
+    def run_once(self) -> float:
+        """Syncs every due repository and returns the delay until the next one.
+
+        Repositories being synced on request are left to that sync, which
+        reschedules them.
+
+        Returns
+        -------
+        float
+            The number of seconds until the next repository becomes due.
+        """
+        with self._lock:
+            urls = []
+            if not self.paused:
+                urls = [
+                    url
+                    for url in self.scheduler.pop_due()
+                    if url not in self._requested_in_flight
+                ]
+
+            self._in_flight = urls
+
+        if urls:
+            try:
+                self._sync(urls)
+            finally:
+                with self._lock:
+                    self._in_flight = []
+
+                    # Requests held back while the cycle handled them.
+                    if self._requested:
+                        self._requests.set()
+
+            if self.configuration.metrics_path is not None:
+                metrics.write_textfile(self.configuration.metrics_path)
+
+        with self._lock:
+            if self.paused or (next_due := self.scheduler.next_due()) is None:
+                return self.scheduler.max_interval  # nothing to mirror
+
+        return max(0.0, next_due - time.time())
+
+    def _serve_requests(self) -> typing.NoReturn:
+        """Runs requested syncs as soon as they arrive."""
+        while True:
+            self._requests.wait()
+            self._requests.clear()
+
+            try:
+                self.run_requested()
+            except Exception:
+                logger.error("Unable to run the requested syncs.", exc_info=True)
+
+    def run_forever(
+        self, config_watcher: watcher.ConfigWatcher | None = None
+    ) -> typing.NoReturn:
+        """Runs synchronization cycles until the process is interrupted.
+
+        Parameters
+        ----------
+        config_watcher : ConfigWatcher, optional
+            The watcher of the configuration file, whose new configurations are
+            applied between cycles and cut the sleep before the next one short.
+        """
+        if config_watcher is not None:
+            config_watcher.on_change = self.wake
+
+        threading.Thread(
+            target=self._serve_requests, name="easy_mirrors-requests", daemon=True
+        ).start()
+
+        while True:
+            # Wake-ups arriving from now on are handled by the cycle below.
+            self._wakeup.clear()
+
+            if config_watcher is not None and (
+                configuration := config_watcher.get_configuration()
+            ):
+                self.reload(configuration)
+
+            if (delay := self.run_once()) > 0:
+                logger.info("Next attempt: %d minute(s)", math.ceil(delay / 60))
+                self._wakeup.wait(delay)
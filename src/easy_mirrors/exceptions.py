@@ -5,7 +5,12 @@
 
 import subprocess  # nosec
 
-__all__ = ["ConfigError", "ExternalProcessError", "FileSystemError"]
+__all__ = [
+    "ConfigError",
+    "ExternalProcessError",
+    "FileSystemError",
+    "ProcessTimeoutError",
+]
 
 
 class ConfigError(ValueError):
@@ -33,3 +38,12 @@ class FileSystemError(OSError):
     or input and output operations on the current working machine. This includes all
     system-level errors generated by failed system calls.
     """
+
+
+class ProcessTimeoutError(ExternalProcessError):
+    """The custom exception class to represent external processes killed after
+    running longer than allowed.
+
+    This exception is used when a git process stops making progress, for example
+    on a half-open connection, and has been killed with its child processes.
+    """
@@ -8,11 +8,24 @@ from __future__ import annotations
 import abc
 import collections.abc
 import os
+import re
 import typing
 
 from easy_mirrors import exceptions
 
-__all__ = ["PathField", "SequenceField"]
+__all__ = [
+    "BooleanField",
+    "ChoiceField",
+    "IntegerField",
+    "PathField",
+    "SequenceField",
+    "TimeWindowField",
+]
+
+# A daily time window such as 01:00-05:00, which may span midnight.
+_TIME_WINDOW: typing.Final[re.Pattern[str]] = re.compile(
+    r"^([01]\d|2[0-3]):([0-5]\d)-([01]\d|2[0-3]):([0-5]\d)$"
+)
 
 _T = typing.TypeVar("_T")
 _V = typing.TypeVar("_V")
@@ -38,20 +51,113 @@ class _Field(abc.ABC, typing.Generic[_V, _T]):
         raise NotImplementedError
 
 
-class PathField(_Field[str, str]):
-    """A specialized field for handling file system path inputs in configurations."""
+class BooleanField(_Field[bool, bool]):
+    """A field that accepts a boolean flag."""
 
-    def process_value(self, value: str) -> str:
+    def process_value(self, value: bool) -> bool:
+        """Checks that the input is a boolean value.
+
+        Parameters
+        ----------
+        value : bool
+            The input value to process.
+
+        Returns
+        -------
+        bool
+            The validated boolean value.
+
+        Raises
+        ------
+        ConfigError
+            Raised when the provided value is not a boolean.
+        """
+        if not isinstance(value, bool):
+            raise exceptions.ConfigError(
+                f"Value of {self.name!r} must be boolean, "
+                f"but received: {type(value).__name__!s}"
+            )
+
+        return value
+
+
+class IntegerField(_Field[typing.Optional[int], typing.Optional[int]]):
+    """A field that accepts an integer value restricted to an inclusive range.
+
+    Optional fields additionally accept none to denote an unset value.
+    """
+
+    def __init__(
+        self,
+        minimum: int | None = None,
+        maximum: int | None = None,
+        optional: bool = False,
+    ) -> None:
+        self.minimum = minimum
+        self.maximum = maximum
+        self.optional = optional
+
+    def process_value(self, value: int | None) -> int | None:
+        """Checks the integer input for validity and range constraints.
+
+        Parameters
+        ----------
+        value : int or None
+            The input value to process.
+
+        Returns
+        -------
+        int or None
+            The validated integer value.
+
+        Raises
+        ------
+        ConfigError
+            Raised when the provided value is not an integer or out of range.
+        """
+        if value is None and self.optional:
+            return None
+
+        # Boolean values are integers in python, but never meaningful here.
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise exceptions.ConfigError(
+                f"Value of {self.name!r} must be integer, "
+                f"but received: {type(value).__name__!s}"
+            )
+
+        if self.minimum is not None and value < self.minimum:
+            raise exceptions.ConfigError(
+                f"Value of {self.name!r} must be at least {self.minimum:d}."
+            )
+
+        if self.maximum is not None and value > self.maximum:
+            raise exceptions.ConfigError(
+                f"Value of {self.name!r} must be at most {self.maximum:d}."
+            )
+
+        return value
+
+
+class PathField(_Field[typing.Optional[str], typing.Optional[str]]):
+    """A specialized field for handling file system path inputs in configurations.
+
+    Optional fields additionally accept none to denote an unset path.
+    """
+
+    def __init__(self, optional: bool = False) -> None:
+        self.optional = optional
+
+    def process_value(self, value: str | None) -> str | None:
         """Checks the path input for validity and expand it to an absolute format.
 
         Parameters
         ----------
-        value : str
+        value : str or None
             The input value to process.
 
         Returns
         -------
-        str
+        str or None
             A normalized and user-expanded path object.
 
         Raises
@@ -59,6 +165,9 @@ class PathField(_Field[str, str]):
         ConfigError
             Raised when the provided value is empty or not a valid path type.
         """
+        if value is None and self.optional:
+            return None
+
         if not isinstance(value, str):
             raise exceptions.ConfigError(
                 f"Path must be string, but received: {type(value).__name__!s}"
@@ -106,3 +215,78 @@ class SequenceField(_Field[typing.Iterable[str], list[str]]):
             raise exceptions.ConfigError("All items in sequence must be strings.")
 
         return sorted(set(value))  # remove all duplicates
+
+
+class TimeWindowField(_Field[typing.Optional[str], typing.Optional[str]]):
+    """A field that accepts a daily time window in the ``HH:MM-HH:MM`` format.
+
+    Optional fields additionally accept none to denote an unrestricted window.
+    """
+
+    def __init__(self, optional: bool = False) -> None:
+        self.optional = optional
+
+    def process_value(self, value: str | None) -> str | None:
+        """Checks that the input describes a valid time window.
+
+        Parameters
+        ----------
+        value : str or None
+            The input value to process.
+
+        Returns
+        -------
+        str or None
+            The time window without surrounding whitespace.
+
+        Raises
+        ------
+        ConfigError
+            Raised when the provided value is not a valid time window.
+        """
+        if value is None and self.optional:
+            return None
+
+        if not isinstance(value, str) or not _TIME_WINDOW.match(
+            value := value.replace(" ", "")
+        ):
+            raise exceptions.ConfigError(
+                f"Value of {self.name!r} must be a time window like 01:00-05:00."
+            )
+
+        return value
+
+
+class ChoiceField(_Field[str, str]):
+    """A field that accepts one of the listed string values."""
+
+    def __init__(self, choices: typing.Sequence[str]) -> None:
+        self.choices = tuple(choices)
+
+    def process_value(self, value: str) -> str:
+        """Checks that the input is one of the allowed values.
+
+        Parameters
+        ----------
+        value : str
+            The input value to process.
+
+        Returns
+        -------
+        str
+            The value without surrounding whitespace and in lowercase.
+
+        Raises
+        ------
+        ConfigError
+            Raised when the provided value is not one of the allowed values.
+        """
+        if (
+            not isinstance(value, str)
+            or (value := value.strip().lower()) not in self.choices
+        ):
+            raise exceptions.ConfigError(
+                f"Value of {self.name!r} must be one of: {', '.join(self.choices)!s}"
+            )
+
+        return value
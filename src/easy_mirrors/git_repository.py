@@ -5,22 +5,75 @@
 
 from __future__ import annotations
 
+import asyncio
+import codecs
 import configparser
+import contextlib
+import hashlib
 import json
 import logging
 import os
+import re
 import shlex
+import signal
 import subprocess  # nosec
+import threading
+import time
 import typing
 
-from easy_mirrors import exceptions
+from easy_mirrors import exceptions, limits, metrics, refspecs, transfers, urls
 
 logger = logging.getLogger("easy_mirrors")
 
-__all__ = ["GitRepository"]
+__all__ = [
+    "LAYOUTS",
+    "GitRepository",
+    "ObjectPool",
+    "find_mirrors",
+    "get_local_path",
+    "get_object_names",
+    "read_remotes",
+    "set_resources",
+]
+
+# Arrangements of mirrors inside the mirror root: directly in it, in a tree of
+# host and owner directories, or in a tree sharded by a hash of the url.
+LAYOUTS: typing.Final[tuple[str, ...]] = ("flat", "host", "hash")
+
+# The directory inside the mirror root holding object pools of fork families.
+POOLS_DIRECTORY: typing.Final[str] = ".easy_mirrors-pools"
+
+# The number of objects missing from a partial clone requested at once.
+_BACKFILL_BATCH_SIZE: typing.Final[int] = 512
+
+# The number of bytes of git output read at once by asynchronous commands.
+_CHUNK_SIZE: typing.Final[int] = 64 * 1024
+
+# Line breaks of git output, where progress meters redraw themselves after
+# carriage returns.
+_LINE_BREAK: typing.Final[re.Pattern[str]] = re.compile(r"\r\n?|\n")
+
+# Git commands run by every maintenance task of a mirror, in order.
+_MAINTENANCE_TASKS: typing.Final[dict[str, tuple[str, ...]]] = {
+    "commit-graph": ("git commit-graph write --reachable --split --no-progress",),
+    # Small packs are merged into bigger ones and indexed together without
+    # rewriting the whole repository.
+    "incremental-repack": (
+        "git multi-pack-index write --no-progress",
+        "git multi-pack-index expire --no-progress",
+        "git multi-pack-index repack --no-progress --batch-size=512m",
+    ),
+    # Objects borrowed from an object pool are left out of the new pack, in
+    # which case git skips the bitmap index.
+    "full-repack": ("git repack -a -d -l -q --write-bitmap-index",),
+    "pack-refs": ("git pack-refs --all --prune",),
+}
 
 _T = typing.TypeVar("_T", bound="GitRepository")
 
+# The resource envelope every git process of this process is spawned in.
+_resources: limits.Resources = limits.Resources()
+
 
 def _get_repository_name(url: str) -> str:
     """Returns the name of a particular repository specified by its url.
@@ -40,12 +93,397 @@ def _get_repository_name(url: str) -> str:
     return name if name.endswith(".git") else f"{name}.git"
 
 
-def _run_git_command(cmd: str, /, cwd: str | None = None, silent: bool = False) -> None:
+def get_local_path(parent_path: str, url: str, layout: str = "flat") -> str:
+    """Returns the local path to the mirror of a repository.
+
+    The flat layout stores every mirror directly in the parent directory under
+    the last segment of its url. The other layouts rely on the canonical url,
+    so that different spellings of one repository share a mirror and mirrors
+    with the same name from different owners never collide.
+
+    Parameters
+    ----------
+    parent_path : str
+        The directory where mirrors are stored.
+
+    url : str
+        The remote repository url.
+
+    layout : str, default="flat"
+        One of flat, host (``github.com/python/cpython.git``) or hash
+        (``ab/cd/cpython-abcdef012345.git``).
+
+    Returns
+    -------
+    str
+        The local path to the mirror.
+    """
+    parent_path = os.path.expanduser(parent_path)
+    name = _get_repository_name(url)
+
+    if layout == "flat":
+        return os.path.join(parent_path, name)
+
+    canonical_url = urls.canonicalize(url)
+
+    if layout == "host":
+        host, _, path = canonical_url.partition("/")
+        owners = [item for item in path.split("/")[:-1] if item not in {"", ".", ".."}]
+
+        return os.path.join(parent_path, host or "local", *owners, name)
+
+    # Two levels of 256 directories keep every directory small.
+    digest = hashlib.sha256(canonical_url.encode("utf-8")).hexdigest()
+
+    return os.path.join(
+        parent_path, digest[:2], digest[2:4], f"{name[:-4]!s}-{digest[:12]!s}.git"
+    )
+
+
+def read_remotes(path: str) -> dict[str, bool]:
+    """Returns the url of every remote of a local repository and its mirror flag.
+
+    Parameters
+    ----------
+    path : str
+        The local path to a bare git repository.
+
+    Returns
+    -------
+    dict[str, bool]
+        Whether the remote is mirrored, keyed by the url of the remote.
+    """
+    # Several values of one key, such as fetch refspecs, are not an error.
+    config_parser = configparser.ConfigParser(strict=False)
+    try:
+        config_parser.read(os.path.join(path, "config"), encoding="utf-8")
+    except configparser.Error:
+        return {}
+
+    remotes: dict[str, bool] = {}
+    for section in config_parser.sections():
+        if section.startswith("remote") and (
+            url := config_parser[section].get("url", "").strip()
+        ):
+            try:
+                remotes.setdefault(
+                    url, config_parser.getboolean(section, "mirror", fallback=False)
+                )
+            except ValueError:
+                remotes.setdefault(url, False)
+
+    return remotes
+
+
+def find_mirrors(parent_path: str) -> list[str]:
+    """Returns the local paths to every mirror stored in any layout.
+
+    Directories named like mirrors are not searched further, and hidden
+    directories, such as the one holding object pools, are skipped.
+    """
+    paths: list[str] = []
+
+    directories = [os.path.expanduser(parent_path)]
+    while directories:
+        try:
+            with os.scandir(directories.pop()) as entries:
+                for entry in entries:
+                    if entry.name.startswith(".") or not entry.is_dir():
+                        continue
+
+                    if entry.name.endswith(".git"):
+                        paths.append(entry.path)
+                    else:
+                        directories.append(entry.path)
+        except OSError:
+            continue
+
+    return sorted(paths)
+
+
+def _parse_refs(output: str) -> dict[str, str]:
+    """Parses the output of git ls-remote into a mapping of refs to object names.
+
+    Peeled tag entries and the symbolic HEAD are ignored because they are not
+    stored as refs in a mirrored repository.
+
+    Parameters
+    ----------
+    output : str
+        Lines of the form ``<object name> TAB <ref name>``.
+
+    Returns
+    -------
+    dict[str, str]
+        The object name of every advertised ref.
+    """
+    refs: dict[str, str] = {}
+
+    for line in output.splitlines():
+        object_name, _, ref = line.strip().partition("\t")
+        if not ref.startswith("refs/") or ref.endswith("^{}"):
+            continue
+
+        refs[ref] = object_name
+
+    return refs
+
+
+def _read_local_refs(path: str) -> dict[str, str]:
+    """Reads all refs of a bare repository from packed-refs and loose ref files.
+
+    Parameters
+    ----------
+    path : str
+        The local path to a bare git repository.
+
+    Returns
+    -------
+    dict[str, str]
+        The object name of every ref stored in the repository.
+    """
+    refs: dict[str, str] = {}
+
+    try:
+        with open(os.path.join(path, "packed-refs"), encoding="utf-8") as stream_in:
+            for line in stream_in:
+                # Skip the header and the peeled object names of annotated tags.
+                if line.startswith(("#", "^")):
+                    continue
+
+                object_name, _, ref = line.strip().partition(" ")
+                if ref:
+                    refs[ref] = object_name
+    except FileNotFoundError:
+        pass
+
+    # Loose refs take precedence over their packed counterparts.
+    for root, _, filenames in os.walk(os.path.join(path, "refs")):
+        for filename in filenames:
+            ref_path = os.path.join(root, filename)
+            try:
+                with open(ref_path, encoding="utf-8") as stream_in:
+                    object_name = stream_in.read().strip()
+            except OSError:
+                continue
+
+            if object_name and not object_name.startswith("ref:"):
+                ref = os.path.relpath(ref_path, path).replace(os.sep, "/")
+                refs[ref] = object_name
+
+    return refs
+
+
+def _read_fetch_refspecs(path: str) -> list[str]:
+    """Reads the fetch refspecs of the origin remote from a repository config."""
+    fetch_refspecs: list[str] = []
+    in_origin = False
+
+    try:
+        with open(os.path.join(path, "config"), encoding="utf-8") as stream_in:
+            for line in (line.strip() for line in stream_in):
+                if line.startswith("["):
+                    in_origin = re.match(r'^\[remote\s+"origin"\]', line) is not None
+                    continue
+
+                name, separator, value = line.partition("=")
+                if in_origin and separator and name.strip().lower() == "fetch":
+                    fetch_refspecs.append(value.strip())
+    except OSError:
+        pass
+
+    return fetch_refspecs
+
+
+def _parse_head(output: str) -> str | None:
+    """Returns the branch the remote HEAD points to from git ls-remote --symref."""
+    for line in output.splitlines():
+        target, _, name = line.strip().partition("\t")
+        if name == "HEAD" and target.startswith("ref: "):
+            return target[len("ref: ") :].strip()
+
+    return None
+
+
+def get_object_names(path: str) -> set[str]:
+    """Returns the object names referenced by the refs of a local repository."""
+    return set(_read_local_refs(path).values())
+
+
+def _get_refs_fingerprint(refs: typing.Mapping[str, str]) -> str:
+    """Returns a stable digest that identifies the state of the given refs."""
+    digest = hashlib.sha256()
+
+    for ref, object_name in sorted(refs.items()):
+        digest.update(f"{object_name!s} {ref!s}\n".encode("utf-8"))
+
+    return digest.hexdigest()
+
+
+def _get_operation(cmd: str) -> str:
+    """Returns the name of the git subcommand, such as fetch or clone."""
+    arguments = iter(shlex.split(cmd)[1:])
+
+    for argument in arguments:
+        if argument in {"-c", "-C"}:
+            next(arguments, None)  # skip the value of the global option
+        elif not argument.startswith("-"):
+            return argument
+
+    return "git"
+
+
+def set_resources(resources: limits.Resources) -> None:
+    """Sets the priority and the configuration overrides of git processes."""
+    global _resources
+
+    _resources = resources
+
+
+def _get_arguments(cmd: str) -> list[str]:
+    """Returns the arguments spawning a git command within the envelope."""
+    return _resources.get_command(_get_operation(cmd), shlex.split(cmd))
+
+
+def _get_environment() -> dict[str, str]:
+    """Returns the environment variables for spawned git processes."""
+    env: dict[str, str] = {
+        "TERM": "dump",
+        # Disable the prompting of the git credential helper and avoids blocking
+        # when the user is required to enter authentication credentials.
+        "GIT_TERMINAL_PROMPT": "0",
+    }
+    env.update(os.environ)
+
+    return env
+
+
+def _log_completion(cmd: str, started: float, returncode: int | None) -> None:
+    """Reports the outcome and the duration of a finished git command."""
+    logger.info(
+        "The command %r exited with code %s.",
+        cmd,
+        returncode,
+        extra={
+            "operation": _get_operation(cmd),
+            "duration_ms": round((time.monotonic() - started) * 1000, 3),
+            "exit_code": returncode,
+        },
+    )
+
+
+def _forward_line(line: str, transfer: transfers.Transfer | None) -> None:
+    """Logs a line of git output, keeping progress meters out of the logs."""
+    if transfer is not None and transfer.feed(line):
+        # Only the final state of every meter is worth keeping.
+        if line.endswith("done.") or line.startswith("remote: Total"):
+            logger.debug(line)
+
+        return
+
+    logger.info(line)
+
+
+def _kill_process_group(pid: int) -> None:
+    """Kills a git process started in its own session and all its children."""
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except (PermissionError, ProcessLookupError):
+        pass  # the group has already exited
+
+
+def _write_input(stream: typing.IO[str], text: str) -> None:
+    """Writes the input of a git command and closes its standard input."""
+    try:
+        stream.write(text)
+        stream.close()
+    except (BrokenPipeError, ValueError):
+        pass  # the process exited or has been killed
+
+
+@contextlib.contextmanager
+def _supervise(
+    process: subprocess.Popen[str], timeout: float | None, stdin: str | None
+) -> typing.Iterator[threading.Event]:
+    """Watches a running git command, killing its process group when needed.
+
+    A watchdog kills the command after its timeout and sets the yielded event.
+    The input is written from another thread, so that a command answering
+    every line as it reads it never blocks on a full pipe of output.
+    """
+    timed_out = threading.Event()
+
+    def expire() -> None:
+        timed_out.set()
+        _kill_process_group(process.pid)
+
+    watchdog: threading.Timer | None = None
+    if timeout is not None:
+        watchdog = threading.Timer(timeout, expire)
+        watchdog.daemon = True
+        watchdog.start()
+
+    writer: threading.Thread | None = None
+    if process.stdin is not None:
+        writer = threading.Thread(
+            target=_write_input, args=(process.stdin, stdin or ""), daemon=True
+        )
+        writer.start()
+
+    try:
+        yield timed_out
+    except BaseException:
+        # The git process left its session, so it is not interrupted together
+        # with this program.
+        _kill_process_group(process.pid)
+        raise
+    finally:
+        if watchdog is not None:
+            watchdog.cancel()
+        if writer is not None:
+            writer.join()
+
+
+def _read_output(
+    stream: typing.IO[str] | None, capture: bool, transfer: transfers.Transfer | None
+) -> str:
+    """Collects the output of a git command or forwards it to the logs."""
+    captured: list[str] = []
+    for line in stream or ():
+        if capture:
+            captured.append(line)
+        elif line := line.rstrip():
+            _forward_line(line, transfer)
+
+    return "".join(captured)
+
+
+def _raise_timeout(
+    cmd: str, timeout: float | None, err: BaseException
+) -> typing.NoReturn:
+    logger.error("The command was killed after %s second(s).", timeout)
+    raise exceptions.ProcessTimeoutError(
+        f"Timed out executing the command: {cmd!r}"
+    ) from err
+
+
+def _run_git_command(
+    cmd: str,
+    /,
+    cwd: str | None = None,
+    silent: bool = False,
+    capture: bool = False,
+    stdin: str | None = None,
+    timeout: float | None = None,
+    transfer: transfers.Transfer | None = None,
+) -> str:
     """Executes the provided git command in a new process.
 
     This function is required to run the specified git command in a controlled
     environment to avoid authentication prompts interfering with execution.
-    In silent mode, no output is generated during its execution.
+    The output of the command is forwarded line by line to the logging system,
+    so that it stays attributable to its repository when several commands run
+    concurrently. In silent mode, no output is generated during its execution.
 
     Parameters
     ----------
@@ -59,30 +497,140 @@ def _run_git_command(cmd: str, /, cwd: str | None = None, silent: bool = False)
     silent : bool, default=False
         Suppresses stdout and stderr output during execution when enabled.
 
+    capture : bool, default=False
+        Collects stdout and returns it instead of forwarding it to the logs.
+
+    stdin : str, optional
+        The input written to the command while its output is read.
+
+    timeout : float, optional
+        The number of seconds after which a watchdog kills the process group of
+        the command, so that children such as ssh are killed as well.
+
+    transfer : Transfer, optional
+        The accounting receiving the figures reported by the output of a clone
+        or a fetch, whose progress meters are then left out of the logs.
+
+    Returns
+    -------
+    str
+        The captured standard output, or an empty string without capture.
+
     Raises
     ------
     ExternalProcessError
         Raised when the git command execution fails.
+
+    ProcessTimeoutError
+        Raised when the git command has been killed after its timeout.
     """
-    env: dict[str, str] = {
-        "TERM": "dump",
-        # Disable the prompting of the git credential helper and avoids blocking
-        # when the user is required to enter authentication credentials.
-        "GIT_TERMINAL_PROMPT": "0",
-    }
-    env.update(os.environ)
+    output, started, returncode = "", time.monotonic(), None
+    try:
+        with metrics.track_operation(_get_operation(cmd)):
+            with subprocess.Popen(  # nosec
+                _get_arguments(cmd),
+                cwd=cwd,
+                env=_get_environment(),
+                errors="replace",
+                shell=False,
+                start_new_session=True,
+                stdin=subprocess.DEVNULL if stdin is None else subprocess.PIPE,
+                stderr=subprocess.DEVNULL if silent else subprocess.STDOUT,
+                stdout=(
+                    subprocess.PIPE
+                    if capture or not silent
+                    else subprocess.DEVNULL  # suppress output
+                ),
+                text=True,
+            ) as process:
+                with _supervise(process, timeout, stdin) as timed_out:
+                    output = _read_output(process.stdout, capture, transfer)
+
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(cmd, typing.cast(float, timeout))
+
+            if (returncode := process.returncode) != 0:
+                raise subprocess.CalledProcessError(returncode, cmd)
+    except subprocess.TimeoutExpired as err:
+        _raise_timeout(cmd, timeout, err)
+    except (OSError, subprocess.CalledProcessError) as err:
+        if not silent:
+            logger.error(
+                "An error occurred on while attempting to execute the command."
+            )
+        raise exceptions.ExternalProcessError(
+            f"Failed to execute the command: {cmd!r}"
+        ) from err
+    finally:
+        _log_completion(cmd, started, returncode)
+        if transfer is not None:
+            transfer.finish(time.monotonic() - started)
+
+    return output
+
+
+async def _run_git_command_async(
+    cmd: str,
+    /,
+    cwd: str | None = None,
+    silent: bool = False,
+    capture: bool = False,
+    timeout: float | None = None,
+    transfer: transfers.Transfer | None = None,
+) -> str:
+    """Executes the provided git command in a new process without blocking.
+
+    This coroutine is the asynchronous counterpart of the function above. When
+    the awaiting task is cancelled, the running git process is killed before
+    the cancellation propagates, so no orphaned children are left behind.
+
+    Parameters
+    ----------
+    cmd : str
+        The git command to execute. It should look like a normal shell command.
+
+    cwd : str, optional
+        The working directory in which to run the command.
+
+    silent : bool, default=False
+        Suppresses stdout and stderr output during execution when enabled.
+
+    capture : bool, default=False
+        Collects stdout and returns it instead of forwarding it to the logs.
+
+    timeout : float, optional
+        The number of seconds after which the process group of the command is
+        killed.
+
+    transfer : Transfer, optional
+        The accounting receiving the figures reported by a clone or a fetch.
+
+    Returns
+    -------
+    str
+        The captured standard output, or an empty string without capture.
+
+    Raises
+    ------
+    ExternalProcessError
+        Raised when the git command execution fails.
 
-    stdout = stderr = subprocess.DEVNULL if silent else None  # streams
+    ProcessTimeoutError
+        Raised when the git command has been killed after its timeout.
+    """
+    captured: list[str] = []
+    started, returncode = time.monotonic(), None
     try:
-        subprocess.check_call(  # nosec
-            shlex.split(cmd),
-            cwd=cwd,
-            env=env,
-            shell=False,
-            stderr=stderr,
-            stdout=stdout,
-        )
-    except subprocess.CalledProcessError as err:
+        with metrics.track_operation(_get_operation(cmd)):
+            returncode = await asyncio.wait_for(
+                _communicate(cmd, cwd, silent, capture, captured, transfer), timeout
+            )
+
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, cmd)
+    except asyncio.TimeoutError as err:
+        _raise_timeout(cmd, timeout, err)
+    except (OSError, ValueError, subprocess.CalledProcessError) as err:
         if not silent:
             logger.error(
                 "An error occurred on while attempting to execute the command."
@@ -90,6 +638,77 @@ def _run_git_command(cmd: str, /, cwd: str | None = None, silent: bool = False)
         raise exceptions.ExternalProcessError(
             f"Failed to execute the command: {cmd!r}"
         ) from err
+    finally:
+        _log_completion(cmd, started, returncode)
+        if transfer is not None:
+            transfer.finish(time.monotonic() - started)
+
+    return "".join(captured)
+
+
+async def _read_lines(stream: asyncio.StreamReader) -> typing.AsyncIterator[str]:
+    """Yields the lines of git output, which progress meters end with carriage
+    returns only.
+
+    The output is read in chunks, so that a long run of progress meters never
+    exceeds the line length limit of the stream reader.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    while chunk := await stream.read(_CHUNK_SIZE):
+        *lines, pending = _LINE_BREAK.split(pending + decoder.decode(chunk))
+        for line in lines:
+            yield line
+
+    if pending := pending + decoder.decode(b"", final=True):
+        yield pending
+
+
+async def _communicate(
+    cmd: str,
+    cwd: str | None,
+    silent: bool,
+    capture: bool,
+    captured: list[str],
+    transfer: transfers.Transfer | None = None,
+) -> int:
+    """Runs a git process and consumes its output until it terminates.
+
+    The process group is killed when the awaiting task is cancelled or the
+    output cannot be read.
+    """
+    process = await asyncio.create_subprocess_exec(  # nosec
+        *_get_arguments(cmd),
+        cwd=cwd,
+        env=_get_environment(),
+        start_new_session=True,
+        stderr=subprocess.DEVNULL if silent else subprocess.STDOUT,
+        stdout=(
+            subprocess.PIPE if capture or not silent else subprocess.DEVNULL
+        ),  # suppress output
+    )
+    try:
+        if process.stdout is not None and capture:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            while chunk := await process.stdout.read(_CHUNK_SIZE):
+                captured.append(decoder.decode(chunk))
+            captured.append(decoder.decode(b"", final=True))
+        elif process.stdout is not None:
+            async for line in _read_lines(process.stdout):
+                if line := line.rstrip():
+                    _forward_line(line, transfer)
+
+        return await process.wait()
+    except BaseException:
+        if process.returncode is None:
+            _kill_process_group(process.pid)
+            await process.wait()
+
+        # The pipe is closed once every killed child has released it.
+        if process.stdout is not None:
+            with contextlib.suppress(OSError, ValueError):
+                await process.stdout.read()
+        raise
 
 
 class GitRepository:
@@ -102,14 +721,41 @@ class GitRepository:
 
     url : str
         The remote repository url.
+
+    remote_fingerprint : str or None
+        The digest of the refs advertised by the remote repository, available
+        once its existence has been verified.
+
+    transfer : Transfer
+        The data received by clones and fetches of this repository.
     """
 
-    def __init__(self, local_path: str, url: str) -> None:
+    def __init__(
+        self,
+        local_path: str,
+        url: str,
+        ref_filter: refspecs.RefFilter | None = None,
+        timeouts: limits.Timeouts | None = None,
+        transfer: transfers.Transfer | None = None,
+    ) -> None:
         self.local_path = local_path
         self.url = url
 
+        self._ref_filter = ref_filter
+        self._timeouts = timeouts or limits.Timeouts()
+        self._transfer = transfers.Transfer() if transfer is None else transfer
+        self._remote_refs: dict[str, str] | None = None
+
     @classmethod
-    def from_url(cls: type[_T], parent_path: str, url: str) -> _T:
+    def from_url(
+        cls: type[_T],
+        parent_path: str,
+        url: str,
+        ref_filter: refspecs.RefFilter | None = None,
+        layout: str = "flat",
+        timeouts: limits.Timeouts | None = None,
+        transfer: transfers.Transfer | None = None,
+    ) -> _T:
         """Creates a repository instance from its remote url.
 
         This method initializes a repository object using only the remote
@@ -124,16 +770,29 @@ class GitRepository:
         url : str
             The remote repository url.
 
+        ref_filter : RefFilter, optional
+            The selection of refs to mirror instead of all of them.
+
+        layout : str, default="flat"
+            The arrangement of mirrors inside the parent directory.
+
+        timeouts : Timeouts, optional
+            The limits on the duration of operations talking to the remote.
+
+        transfer : Transfer, optional
+            The accounting of the data received by clones and fetches.
+
         Returns
         -------
         Repository
             A new instance of the repository class with the computed local path.
         """
         return cls(
-            local_path=os.path.join(
-                os.path.expanduser(parent_path), _get_repository_name(url)
-            ),
+            local_path=get_local_path(parent_path, url, layout),
             url=url,
+            ref_filter=ref_filter,
+            timeouts=timeouts,
+            transfer=transfer,
         )
 
     def __str__(self) -> str:
@@ -148,25 +807,496 @@ class GitRepository:
         )
 
     def to_dict(self) -> dict[str, str]:
-        return vars(self)
+        return {key: value for key, value in vars(self).items() if key[0] != "_"}
+
+    @property
+    def transfer(self) -> transfers.Transfer:
+        return self._transfer
+
+    @property
+    def remote_fingerprint(self) -> str | None:
+        if self._remote_refs is None:
+            return None
+
+        return _get_refs_fingerprint(self._remote_refs)
+
+    def get_local_refs(self) -> dict[str, str]:
+        """Returns the object name of every ref stored in the local mirror."""
+        return _read_local_refs(self.local_path)
+
+    def get_head(self) -> str | None:
+        """Returns the branch HEAD of the local mirror points to, if any."""
+        try:
+            with open(
+                os.path.join(self.local_path, "HEAD"), encoding="utf-8"
+            ) as stream_in:
+                target = stream_in.read().strip()
+        except OSError:
+            return None
+
+        if target.startswith("ref: "):
+            return target[len("ref: ") :].strip()
+
+        return None
+
+    def get_local_fingerprint(self) -> str:
+        """Returns the digest of the refs stored in the local mirror."""
+        return _get_refs_fingerprint(_read_local_refs(self.local_path))
+
+    def is_up_to_date(self) -> bool:
+        """Determines whether the local mirror already holds every remote ref.
+
+        The comparison relies on the refs captured by the last remote existence
+        check, so no additional network round trip is needed.
+
+        Returns
+        -------
+        bool
+            True if the local refs match the remote ones, otherwise false.
+        """
+        if self._remote_refs is None:
+            return False
+
+        return self.remote_fingerprint == self.get_local_fingerprint()
+
+    @property
+    def remote_object_names(self) -> set[str]:
+        """The object names advertised by the remote repository, if known."""
+        return set((self._remote_refs or {}).values())
+
+    def _get_git(self, *options: str) -> str:
+        """Returns git with global options of commands talking to the remote."""
+        return " ".join(["git", *options, self._timeouts.get_config_options()]).rstrip()
+
+    def _clone_command(
+        self, reference: str | None = None, filter_spec: str | None = None
+    ) -> str:
+        options = "--mirror --no-hardlinks --progress"
+        if reference is not None:
+            # Objects found in the pool are neither transferred nor stored again.
+            options += " --reference-if-able {0!r}".format(reference)
+        if filter_spec is not None:
+            options += " --filter={0!s}".format(filter_spec)
+
+        return "{0!s} clone {1!s} -- {2!r} {3!r}".format(
+            self._get_git(), options, self.url, str(self.local_path)
+        )
+
+    def _init_commands(
+        self, ref_filter: refspecs.RefFilter, filter_spec: str | None = None
+    ) -> list[str]:
+        # A mirror clone would transfer every ref, so it is configured by hand.
+        commands = [
+            "git config remote.origin.url {0!r}".format(self.url),
+            "git config remote.origin.mirror true",
+        ]
+        commands.extend(
+            "git config --add remote.origin.fetch {0!r}".format(refspec)
+            for refspec in ref_filter.get_refspecs()
+        )
+        if filter_spec is not None:
+            commands.extend(
+                [
+                    "git config core.repositoryformatversion 1",
+                    "git config extensions.partialclone origin",
+                    "git config remote.origin.promisor true",
+                    f"git config remote.origin.partialclonefilter {filter_spec!s}",
+                ]
+            )
+
+        return commands
+
+    def _fetch_command(self) -> str:
+        if self._ref_filter is not None:
+            return "{0!s} fetch --all --prune --progress --verbose".format(
+                self._get_git(self._ref_filter.get_config_options())
+            )
+
+        return "{0!s} fetch --all --prune --progress --verbose".format(self._get_git())
+
+    def _ls_remote_command(self) -> str:
+        if self._ref_filter is not None and (
+            options := self._ref_filter.get_ls_remote_options()
+        ):
+            return "{0!s} ls-remote --exit-code {1!s} -- {2!r}".format(
+                self._get_git(), options, self.url
+            )
+
+        return "{0!s} ls-remote --exit-code -- {1!r}".format(self._get_git(), self.url)
+
+    def _symref_command(self) -> str:
+        return "{0!s} ls-remote --symref -- {1!r} HEAD".format(
+            self._get_git(), self.url
+        )
+
+    def _add_alternate(self, reference: str) -> None:
+        alternates_path = os.path.join(self.local_path, "objects", "info", "alternates")
+
+        os.makedirs(os.path.dirname(alternates_path), exist_ok=True)
+        with open(alternates_path, mode="at", encoding="utf-8") as stream_out:
+            stream_out.write(os.path.abspath(os.path.join(reference, "objects")) + "\n")
+
+    def _filter_remote_refs(self, output: str) -> dict[str, str]:
+        refs = _parse_refs(output)
+        if self._ref_filter is None:
+            return refs
 
-    def create_local_copy(self) -> None:
+        return {
+            ref: name for ref, name in refs.items() if self._ref_filter.matches(ref)
+        }
+
+    def create_local_copy(
+        self, reference: str | None = None, filter_spec: str | None = None
+    ) -> None:
         """Clones a mirrored copy of the repository onto the local machine.
 
         This method creates a local mirror of the repository, providing the most
         efficient way to back up a git repository while optimizing storage. It retains
         all branches, tags, and references while significantly reducing disk space.
 
+        Parameters
+        ----------
+        reference : str, optional
+            The local path to a repository whose objects are borrowed through
+            git alternates instead of being downloaded.
+
+        filter_spec : str, optional
+            The partial clone filter, such as ``blob:none``. Objects left out by
+            the filter are not downloaded by this clone and later fetches.
+
         Raises
         ------
         ExternalProcessError
             If the cloning process fails or the repository cannot be fetched.
         """
+        if self._ref_filter is None:
+            _run_git_command(
+                self._clone_command(reference, filter_spec),
+                timeout=self._timeouts.clone,
+                transfer=self._transfer,
+            )
+            # A clone lists no refs, so every remote ref counts as created.
+            self._transfer.add(
+                transfers.Transfer(ref_updates=len(self._remote_refs or {}))
+            )
+
+            return
+
+        _run_git_command(
+            "git init --bare --quiet -- {0!r}".format(str(self.local_path)),
+            silent=True,
+        )
+        for cmd in self._init_commands(self._ref_filter, filter_spec):
+            _run_git_command(cmd, cwd=self.local_path, silent=True)
+
+        if reference is not None:
+            self._add_alternate(reference)
+
+        # The first fetch transfers the whole history like a clone.
         _run_git_command(
-            "git clone --mirror --no-hardlinks -- {0!r} {1!r}".format(
-                self.url, str(self.local_path)
+            self._fetch_command(),
+            cwd=self.local_path,
+            timeout=self._timeouts.clone,
+            transfer=self._transfer,
+        )
+
+        head = _parse_head(
+            _run_git_command(
+                self._symref_command(),
+                capture=True,
+                silent=True,
+                timeout=self._timeouts.ls_remote,
+            )
+        )
+        if head is not None and self._ref_filter.matches(head):
+            _run_git_command(
+                "git symbolic-ref HEAD {0!s}".format(head),
+                cwd=self.local_path,
+                silent=True,
+            )
+
+    async def create_local_copy_async(
+        self, reference: str | None = None, filter_spec: str | None = None
+    ) -> None:
+        """Asynchronous counterpart of :meth:`create_local_copy`."""
+        if self._ref_filter is None:
+            await _run_git_command_async(
+                self._clone_command(reference, filter_spec),
+                timeout=self._timeouts.clone,
+                transfer=self._transfer,
+            )
+            self._transfer.add(
+                transfers.Transfer(ref_updates=len(self._remote_refs or {}))
+            )
+
+            return
+
+        await _run_git_command_async(
+            "git init --bare --quiet -- {0!r}".format(str(self.local_path)),
+            silent=True,
+        )
+        for cmd in self._init_commands(self._ref_filter, filter_spec):
+            await _run_git_command_async(cmd, cwd=self.local_path, silent=True)
+
+        if reference is not None:
+            self._add_alternate(reference)
+
+        await _run_git_command_async(
+            self._fetch_command(),
+            cwd=self.local_path,
+            timeout=self._timeouts.clone,
+            transfer=self._transfer,
+        )
+
+        head = _parse_head(
+            await _run_git_command_async(
+                self._symref_command(),
+                capture=True,
+                silent=True,
+                timeout=self._timeouts.ls_remote,
             )
         )
+        if head is not None and self._ref_filter.matches(head):
+            await _run_git_command_async(
+                "git symbolic-ref HEAD {0!s}".format(head),
+                cwd=self.local_path,
+                silent=True,
+            )
+
+    def apply_ref_filter(self) -> bool:
+        """Aligns the fetch refspecs of an existing mirror with its ref filter.
+
+        Refs excluded by a changed filter are deleted, because git fetch --prune
+        only removes refs that disappeared from the remote.
+
+        Returns
+        -------
+        bool
+            True if the mirror has been reconfigured, otherwise false.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when the mirror can not be reconfigured.
+        """
+        expected = (
+            list(refspecs.DEFAULT_REFSPECS)
+            if self._ref_filter is None
+            else self._ref_filter.get_refspecs()
+        )
+        if _read_fetch_refspecs(self.local_path) == expected:
+            return False
+
+        first, *others = expected
+        _run_git_command(
+            "git config --replace-all remote.origin.fetch {0!r}".format(first),
+            cwd=self.local_path,
+            silent=True,
+        )
+        for refspec in others:
+            _run_git_command(
+                "git config --add remote.origin.fetch {0!r}".format(refspec),
+                cwd=self.local_path,
+                silent=True,
+            )
+
+        if self._ref_filter is not None:
+            output = _run_git_command(
+                "git for-each-ref --format=%(refname)",
+                cwd=self.local_path,
+                capture=True,
+                silent=True,
+            )
+            if excluded := [
+                ref for ref in output.split() if not self._ref_filter.matches(ref)
+            ]:
+                logger.info("Deleting %d ref(s) excluded by the filter.", len(excluded))
+                _run_git_command(
+                    "git update-ref --stdin",
+                    cwd=self.local_path,
+                    silent=True,
+                    stdin="".join(f"delete {ref!s}\n" for ref in excluded),
+                )
+
+        return True
+
+    def get_partial_clone_filter(self) -> str | None:
+        """Returns the filter of a partially cloned mirror, if any."""
+        # Several values of one key, such as fetch refspecs, are not an error.
+        config_parser = configparser.ConfigParser(strict=False)
+        config_parser.read(os.path.join(self.local_path, "config"))
+
+        for section in config_parser.sections():
+            if section.startswith("remote") and (
+                filter_spec := config_parser[section].get("partialclonefilter")
+            ):
+                return filter_spec.strip()
+
+        return None
+
+    def get_missing_objects(self) -> list[str]:
+        """Returns the names of objects left out by the partial clone filter.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when the objects of the mirror can not be listed.
+        """
+        # Missing objects are only reported, never downloaded one by one.
+        output = _run_git_command(
+            "git rev-list --objects --all --missing=print",
+            cwd=self.local_path,
+            silent=True,
+            capture=True,
+        )
+
+        return [line[1:].strip() for line in output.splitlines() if line[:1] == "?"]
+
+    def backfill(self, batch_size: int = _BACKFILL_BATCH_SIZE) -> int:
+        """Downloads one batch of objects left out by the partial clone filter.
+
+        Once nothing is missing anymore, the filter is removed, so later fetches
+        download complete history.
+
+        Parameters
+        ----------
+        batch_size : int
+            The maximum number of objects requested from the remote.
+
+        Returns
+        -------
+        int
+            The number of objects requested from the remote.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when the objects can not be downloaded.
+        """
+        if not (missing := self.get_missing_objects()[:batch_size]):
+            # Git fails to unset a key that is not set, which is the case after
+            # a repeated backfill.
+            if self.get_partial_clone_filter() is not None:
+                _run_git_command(
+                    "git config --unset remote.origin.partialclonefilter",
+                    cwd=self.local_path,
+                    silent=True,
+                )
+                logger.info("Every object of the partial mirror has been downloaded.")
+
+            return 0
+
+        # This is the request git itself makes for objects missing from a
+        # partial clone, so the remote sends exactly the listed objects.
+        _run_git_command(
+            self._get_git("-c fetch.negotiationAlgorithm=noop")
+            + " fetch origin --no-tags --no-write-fetch-head --recurse-submodules=no "
+            "--filter=blob:none " + " ".join(missing),
+            cwd=self.local_path,
+            silent=True,
+            timeout=self._timeouts.fetch,
+        )
+
+        return len(missing)
+
+    def get_unknown_objects(self, object_names: typing.Iterable[str]) -> set[str]:
+        """Returns the given object names missing from the local mirror.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when the objects of the mirror can not be looked up.
+        """
+        if not (object_names := sorted(set(object_names))):
+            return set()
+
+        output = _run_git_command(
+            "git cat-file --batch-check",
+            cwd=self.local_path,
+            silent=True,
+            capture=True,
+            stdin="".join(f"{object_name!s}\n" for object_name in object_names),
+        )
+
+        return {
+            line.split()[0] for line in output.splitlines() if line.endswith(" missing")
+        }
+
+    def create_bundle(
+        self,
+        path: str,
+        refs: typing.Iterable[str],
+        prerequisites: typing.Iterable[str] = (),
+    ) -> bool:
+        """Writes the given refs and the objects they need to a bundle file.
+
+        Parameters
+        ----------
+        path : str
+            The local path to the bundle file.
+
+        refs : Iterable[str]
+            The names of refs stored in the bundle.
+
+        prerequisites : Iterable[str], optional
+            The object names the receiving repository is known to have. Their
+            history is left out, which makes the bundle incremental.
+
+        Returns
+        -------
+        bool
+            False if the refs need no objects besides the prerequisites, so no
+            bundle has been written, otherwise true.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when the bundle can not be written.
+        """
+        revisions = "".join(f"{ref!s}\n" for ref in refs) + "".join(
+            f"^{object_name!s}\n" for object_name in prerequisites
+        )
+
+        # Git refuses to write a bundle without objects, so it is checked first.
+        if not _run_git_command(
+            "git rev-list --objects --max-count=1 --stdin",
+            cwd=self.local_path,
+            silent=True,
+            capture=True,
+            stdin=revisions,
+        ).strip():
+            return False
+
+        _run_git_command(
+            "git bundle create --quiet {0!r} --stdin".format(os.path.abspath(path)),
+            cwd=self.local_path,
+            silent=True,
+            stdin=revisions,
+        )
+
+        return True
+
+    def run_maintenance(self, task: str) -> None:
+        """Runs a maintenance task, such as commit-graph, in the local mirror.
+
+        Parameters
+        ----------
+        task : str
+            One of backfill, commit-graph, incremental-repack, full-repack or
+            pack-refs.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when a git command of the task fails.
+        """
+        if task == "backfill":
+            self.backfill()
+
+            return
+
+        for cmd in _MAINTENANCE_TASKS[task]:
+            _run_git_command(cmd, cwd=self.local_path, silent=True)
 
     def exists_locally(self) -> bool:
         """Determines whether the repository exists locally.
@@ -191,37 +1321,90 @@ class GitRepository:
             if not os.path.exists(os.path.join(self.local_path, component_name)):
                 return False
 
-        config_parser = configparser.ConfigParser()
+        # Check each remote for a matching url.
+        return read_remotes(self.local_path).get(self.url.strip(), False)
+
+    def get_remote_url(self) -> str | None:
+        """Returns the url the local mirror fetches from, if any."""
+        config_parser = configparser.ConfigParser(strict=False)
         config_parser.read(os.path.join(self.local_path, "config"))
 
-        # Check each remote section for a matching url.
-        for section in (
-            section
-            for section in config_parser.sections()
-            if section.startswith("remote")
-        ):
-            if config_parser[section].get("url", "").strip() == self.url.strip():
-                return config_parser.getboolean(section, "mirror", fallback=False)
+        if config_parser.has_option('remote "origin"', "url"):
+            return config_parser.get('remote "origin"', "url").strip()
 
-        return False
+        return None
+
+    def set_remote_url(self) -> None:
+        """Makes the local mirror fetch from the url of this instance.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when the configuration of the mirror can not be updated.
+        """
+        _run_git_command(
+            "git config remote.origin.url {0!r}".format(self.url),
+            cwd=self.local_path,
+            silent=True,
+        )
 
     def exists_on_remote(self) -> bool:
         """Determines whether the repository exists on the remote server.
 
         This method verifies if the repository is accessible at the given remote url.
+        The advertised refs are remembered to detect whether a fetch is needed.
 
         Returns
         -------
         bool
             True if the repository exists on the remote server, otherwise false.
+
+        Raises
+        ------
+        ProcessTimeoutError
+            Raised when the remote does not answer in time, which says nothing
+            about its existence.
         """
         try:
-            _run_git_command(
-                "git ls-remote --exit-code -- {0!r}".format(self.url), silent=True
+            output = _run_git_command(
+                self._ls_remote_command(),
+                capture=True,
+                silent=True,
+                timeout=self._timeouts.ls_remote,
             )
+        except exceptions.ProcessTimeoutError:
+            self._remote_refs = None
+            raise
+
         except exceptions.ExternalProcessError:
+            self._remote_refs = None
+
             return False
 
+        self._remote_refs = self._filter_remote_refs(output)
+
+        return True
+
+    async def exists_on_remote_async(self) -> bool:
+        """Asynchronous counterpart of :meth:`exists_on_remote`."""
+        try:
+            output = await _run_git_command_async(
+                self._ls_remote_command(),
+                capture=True,
+                silent=True,
+                timeout=self._timeouts.ls_remote,
+            )
+        except exceptions.ProcessTimeoutError:
+            self._remote_refs = None
+            raise
+
+        except exceptions.ExternalProcessError:
+            self._remote_refs = None
+
+            return False
+
+        self._remote_refs = self._filter_remote_refs(output)
+
         return True
 
     def update_local_copy(self) -> None:
@@ -234,4 +1417,208 @@ class GitRepository:
         ExternalProcessError
             If fetching updates from the remote repository fails.
         """
-        _run_git_command("git fetch --all --prune --verbose", cwd=self.local_path)
+        _run_git_command(
+            self._fetch_command(),
+            cwd=self.local_path,
+            timeout=self._timeouts.fetch,
+            transfer=self._transfer,
+        )
+
+    async def update_local_copy_async(self) -> None:
+        """Asynchronous counterpart of :meth:`update_local_copy`."""
+        await _run_git_command_async(
+            self._fetch_command(),
+            cwd=self.local_path,
+            timeout=self._timeouts.fetch,
+            transfer=self._transfer,
+        )
+
+    def push_local_copy(self) -> None:
+        """Pushes every ref of the local mirror to the remote repository.
+
+        Remote refs missing from the mirror are deleted, so the remote ends up
+        identical to the mirror. With a ref filter, only the mirrored refs are
+        pushed and pruned, and refs left out of the mirror are kept.
+
+        Raises
+        ------
+        ExternalProcessError
+            If the remote repository rejects the push.
+        """
+        if self._ref_filter is None:
+            cmd = "git push --mirror --quiet {0!r}".format(self.url)
+        else:
+            cmd = "git push --prune --quiet {0!r} {1!s}".format(
+                self.url, shlex.join(self._ref_filter.get_refspecs())
+            )
+
+        _run_git_command(cmd, cwd=self.local_path)
+
+
+class ObjectPool:
+    """Bare repository holding the objects shared by a family of forks.
+
+    Members of a family borrow objects from the pool through git alternates,
+    so history shared by the forks is downloaded and stored only once. The pool
+    keeps the refs of every member under ``refs/members/``, which keeps all
+    borrowed objects reachable; the pool must never be pruned on its own.
+
+    Attributes
+    ----------
+    path : str
+        The local directory where the pool is stored.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    @classmethod
+    def from_family(cls, parent_path: str, family: str) -> ObjectPool:
+        """Creates a pool instance for the named family of forks."""
+        return cls(
+            os.path.join(
+                os.path.expanduser(parent_path), POOLS_DIRECTORY, f"{family!s}.git"
+            )
+        )
+
+    @classmethod
+    def from_member(cls, local_path: str) -> ObjectPool | None:
+        """Returns the pool a mirrored repository borrows objects from, if any."""
+        try:
+            with open(
+                os.path.join(local_path, "objects", "info", "alternates"),
+                encoding="utf-8",
+            ) as stream_in:
+                alternates = [line.strip() for line in stream_in]
+        except OSError:
+            return None
+
+        for objects_path in alternates:
+            path = os.path.dirname(os.path.normpath(objects_path))
+            if os.path.basename(os.path.dirname(path)) == POOLS_DIRECTORY:
+                return cls(path)
+
+        return None
+
+    @classmethod
+    def find_all(cls, parent_path: str) -> list[ObjectPool]:
+        """Returns every pool stored in the mirror directory."""
+        try:
+            with os.scandir(
+                os.path.join(os.path.expanduser(parent_path), POOLS_DIRECTORY)
+            ) as entries:
+                return sorted(
+                    (cls(entry.path) for entry in entries if entry.is_dir()),
+                    key=lambda pool: pool.path,
+                )
+        except OSError:
+            return []
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return f"{self.__class__.__name__!s}(path={str(self.path)!r})"
+
+    def exists(self) -> bool:
+        """Determines whether the pool has been initialized."""
+        return os.path.isdir(os.path.join(self.path, "objects"))
+
+    def create(self) -> None:
+        """Initializes an empty pool unless it exists already.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when the bare repository can not be initialized.
+        """
+        if not self.exists():
+            _run_git_command(
+                "git init --bare --quiet -- {0!r}".format(self.path), silent=True
+            )
+
+    def get_object_names(self) -> set[str]:
+        """Returns the object names referenced by the members of the pool."""
+        return get_object_names(self.path)
+
+    def add_member(self, local_path: str, deduplicate: bool = True) -> None:
+        """Makes a mirrored repository borrow objects from the pool.
+
+        Parameters
+        ----------
+        local_path : str
+            The local path to the mirrored repository.
+
+        deduplicate : bool, default=True
+            Repacks the repository to drop objects now stored in the pool. This
+            is unnecessary for repositories cloned with the pool as reference.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when the objects of the repository can not be shared.
+        """
+        self.update_from(local_path)
+
+        alternates_path = os.path.join(local_path, "objects", "info", "alternates")
+        objects_path = os.path.abspath(os.path.join(self.path, "objects"))
+        try:
+            with open(alternates_path, encoding="utf-8") as stream_in:
+                alternates = [line.strip() for line in stream_in if line.strip()]
+        except FileNotFoundError:
+            alternates = []
+
+        if objects_path not in alternates:
+            os.makedirs(os.path.dirname(alternates_path), exist_ok=True)
+            with open(alternates_path, mode="at", encoding="utf-8") as stream_out:
+                stream_out.write(objects_path + "\n")
+
+        if deduplicate:
+            # Objects available through alternates are left out of new packs.
+            _run_git_command("git repack -a -d -l -q", cwd=local_path, silent=True)
+
+    def update_from(self, local_path: str) -> None:
+        """Copies new objects of a member into the pool and records its refs.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when the objects can not be fetched from the member.
+        """
+        _run_git_command(
+            "git fetch --prune --no-tags --quiet -- {0!r} "
+            "'+refs/*:{1!s}*'".format(
+                os.path.abspath(local_path), self._get_member_namespace(local_path)
+            ),
+            cwd=self.path,
+            silent=True,
+        )
+
+    def remove_member(self, local_path: str) -> None:
+        """Drops the refs recorded for a member that has moved or been removed.
+
+        Raises
+        ------
+        ExternalProcessError
+            Raised when the refs of the pool can not be updated.
+        """
+        output = _run_git_command(
+            "git for-each-ref --format='%(refname)' {0!s}".format(
+                self._get_member_namespace(local_path)
+            ),
+            cwd=self.path,
+            silent=True,
+            capture=True,
+        )
+        if refs := output.split():
+            _run_git_command(
+                "git update-ref --stdin",
+                cwd=self.path,
+                silent=True,
+                stdin="".join(f"delete {ref!s}\n" for ref in refs),
+            )
+
+    @staticmethod
+    def _get_member_namespace(local_path: str) -> str:
+        member = hashlib.sha256(os.path.abspath(local_path).encode("utf-8"))
+
+        return f"refs/members/{member.hexdigest()[:16]!s}/"
@@ -0,0 +1,401 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import contextlib
+import logging
+import math
+import random
+import re
+import shutil
+import threading
+import time
+import typing
+
+from easy_mirrors import exceptions
+
+logger = logging.getLogger("easy_mirrors")
+
+__all__ = [
+    "IONICE_CLASSES",
+    "HostLimiter",
+    "OperationLimiter",
+    "Resources",
+    "Timeouts",
+    "TokenBucket",
+    "get_backoff_delay",
+]
+
+# Arguments of ionice selecting the disk scheduling class of git processes.
+IONICE_CLASSES: typing.Final[dict[str, tuple[str, ...]]] = {
+    "default": (),
+    "best-effort": ("-c", "2", "-n", "7"),
+    "idle": ("-c", "3"),
+}
+
+_OPERATION: typing.Final[re.Pattern[str]] = re.compile(r"^[a-z][a-z-]*$")
+_CONFIG_KEY: typing.Final[re.Pattern[str]] = re.compile(r"^[\w-]+(\.[^\s=]+)?\.[\w-]+$")
+
+# The longest delay in seconds between two attempts to sync a repository.
+_MAX_BACKOFF_DELAY: typing.Final[float] = 600.0
+
+
+def get_backoff_delay(attempt: int, base: float) -> float:
+    """Returns the delay before a retry using capped exponential backoff.
+
+    Half of the delay is randomized, so that repositories failing together
+    do not retry in lockstep against the same host.
+
+    Parameters
+    ----------
+    attempt : int
+        The number of the retry, starting from one.
+
+    base : float
+        The delay in seconds before the first retry.
+
+    Returns
+    -------
+    float
+        The number of seconds to wait before the retry.
+    """
+    delay = min(_MAX_BACKOFF_DELAY, base * 2 ** (attempt - 1))
+
+    return delay / 2 + random.uniform(0, delay / 2)  # nosec
+
+
+class Timeouts:
+    """Limits on the duration of git operations talking to a remote.
+
+    An operation still running when its timeout expires is killed together
+    with its child processes, such as ssh or remote helpers. The low-speed
+    threshold makes git itself abort http transfers that stall.
+
+    Parameters
+    ----------
+    ls_remote : float, optional
+        The number of seconds a listing of remote refs may take.
+
+    fetch : float, optional
+        The number of seconds a fetch into an existing mirror may take.
+
+    clone : float, optional
+        The number of seconds the initial transfer of a new mirror may take.
+
+    low_speed_limit : int, optional
+        The transfer rate in bytes per second below which an http transfer is
+        considered stalled.
+
+    low_speed_time : int, default=60
+        The number of seconds a transfer may stay below the low-speed limit.
+    """
+
+    def __init__(
+        self,
+        ls_remote: float | None = None,
+        fetch: float | None = None,
+        clone: float | None = None,
+        low_speed_limit: int | None = None,
+        low_speed_time: int = 60,
+    ) -> None:
+        self.ls_remote = ls_remote
+        self.fetch = fetch
+        self.clone = clone
+        self.low_speed_limit = low_speed_limit
+        self.low_speed_time = low_speed_time
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return (
+            f"{self.__class__.__name__!s}(ls_remote={self.ls_remote!r}, "
+            f"fetch={self.fetch!r}, clone={self.clone!r})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return vars(self)
+
+    def get_config_options(self) -> str:
+        """Returns global git options aborting stalled http transfers."""
+        if self.low_speed_limit is None:
+            return ""
+
+        return (
+            f"-c http.lowSpeedLimit={self.low_speed_limit:d} "
+            f"-c http.lowSpeedTime={self.low_speed_time:d}"
+        )
+
+
+class TokenBucket:
+    """Token bucket allowing a steady rate of requests with a limited burst.
+
+    Parameters
+    ----------
+    rate : float
+        The number of tokens added to the bucket per minute.
+
+    capacity : float, default=1.0
+        The maximum number of tokens the bucket can hold.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0) -> None:
+        self.rate = rate / 60  # tokens per second
+        self.capacity = max(1.0, capacity)
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def try_acquire(self) -> float:
+        """Takes one token if available.
+
+        Returns
+        -------
+        float
+            Zero when a token has been taken, otherwise the number of seconds
+            until the next token becomes available.
+        """
+        with self._lock:
+            now = time.monotonic()
+
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+
+            if self._tokens >= 1:
+                self._tokens -= 1
+
+                return 0.0
+
+            return (1 - self._tokens) / self.rate
+
+
+class HostLimiter:
+    """Limits the number of concurrent syncs and their rate for every host.
+
+    Each host gets its own counter of running syncs and its own token bucket,
+    so that a saturated host never delays repositories stored elsewhere.
+
+    Parameters
+    ----------
+    max_jobs : int, optional
+        The maximum number of concurrent syncs against one host.
+
+    rate : int, optional
+        The maximum number of syncs started against one host per minute.
+    """
+
+    def __init__(self, max_jobs: int | None = None, rate: int | None = None) -> None:
+        self.max_jobs = max_jobs
+        self.rate = rate
+
+        self._lock = threading.Lock()
+        self._running: collections.Counter[str] = collections.Counter()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    def _get_bucket(self, host: str) -> TokenBucket | None:
+        if self.rate is None:
+            return None
+
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, capacity=self.max_jobs or 1)
+
+        return self._buckets[host]
+
+    def try_acquire(self, host: str) -> float:
+        """Reserves a sync slot against the host without blocking.
+
+        Returns
+        -------
+        float
+            Zero when the slot has been reserved, infinity when the host runs
+            the maximum number of syncs, otherwise the number of seconds until
+            the rate limit allows a new sync.
+        """
+        with self._lock:
+            if self.max_jobs is not None and self._running[host] >= self.max_jobs:
+                return math.inf
+
+            bucket = self._get_bucket(host)
+            if bucket is not None and (delay := bucket.try_acquire()) > 0:
+                return delay
+
+            self._running[host] += 1
+
+            return 0.0
+
+    def release(self, host: str) -> None:
+        """Frees a sync slot reserved against the host."""
+        with self._lock:
+            self._running[host] -= 1
+
+    @contextlib.asynccontextmanager
+    async def acquire_async(self, host: str) -> typing.AsyncIterator[None]:
+        """Holds a sync slot against the host while suspending other tasks."""
+        if self.max_jobs is not None and host not in self._semaphores:
+            self._semaphores[host] = asyncio.Semaphore(self.max_jobs)
+
+        async with self._semaphores.get(host) or contextlib.nullcontext():
+            bucket = self._get_bucket(host)
+            while bucket is not None and (delay := bucket.try_acquire()) > 0:
+                await asyncio.sleep(delay)
+
+            yield
+
+
+class OperationLimiter:
+    """Limits the number of concurrent operations of every kind.
+
+    Clones transfer and index whole histories and need far more processor
+    time, memory and disk bandwidth than incremental fetches, so they get a
+    cap of their own. Operations without a cap are not limited.
+
+    Parameters
+    ----------
+    max_jobs : Mapping[str, int or None]
+        The maximum number of concurrent operations keyed by their kind, such
+        as clone or fetch.
+    """
+
+    def __init__(self, max_jobs: typing.Mapping[str, int | None]) -> None:
+        self.max_jobs = {
+            operation: jobs for operation, jobs in max_jobs.items() if jobs is not None
+        }
+
+        self._semaphores = {
+            operation: threading.BoundedSemaphore(jobs)
+            for operation, jobs in self.max_jobs.items()
+        }
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return f"{self.__class__.__name__!s}(max_jobs={self.max_jobs!r})"
+
+    def try_acquire(self, operation: str) -> bool:
+        """Reserves a slot for an operation without blocking.
+
+        Returns
+        -------
+        bool
+            True if the slot has been reserved, or false if every slot of the
+            operation is taken.
+        """
+        if (semaphore := self._semaphores.get(operation)) is None:
+            return True
+
+        return semaphore.acquire(blocking=False)
+
+    def release(self, operation: str) -> None:
+        """Frees a slot reserved for an operation."""
+        if (semaphore := self._semaphores.get(operation)) is not None:
+            semaphore.release()
+
+
+class Resources:
+    """Resource envelope of spawned git processes.
+
+    Git processes can be run with a lower processor and disk scheduling
+    priority through the nice and ionice utilities, and every git operation
+    can get its own configuration overrides, such as ``pack.threads`` or
+    ``core.packedGitLimit`` for clones.
+
+    Parameters
+    ----------
+    nice : int, default=0
+        The niceness added to git processes, from 0 to 19.
+
+    ionice : str, default="default"
+        The disk scheduling class of git processes: default, best-effort or
+        idle.
+
+    git_config : Mapping[str, Mapping[str, str]], optional
+        Git configuration values keyed by the git operation they apply to, such
+        as clone, fetch or repack.
+
+    Raises
+    ------
+    ConfigError
+        Raised when an operation or a configuration key is invalid.
+    """
+
+    def __init__(
+        self,
+        nice: int = 0,
+        ionice: str = "default",
+        git_config: typing.Mapping[str, typing.Mapping[str, str]] | None = None,
+    ) -> None:
+        self.nice = nice
+        self.ionice = ionice
+        self.git_config = {
+            operation: dict(sorted(values.items()))
+            for operation, values in sorted((git_config or {}).items())
+        }
+
+        if ionice not in IONICE_CLASSES:
+            raise exceptions.ConfigError(f"Unknown ionice class: {ionice!r}")
+
+        for operation, values in self.git_config.items():
+            if not _OPERATION.match(operation):
+                raise exceptions.ConfigError(f"Invalid git operation: {operation!r}")
+
+            for name, value in values.items():
+                if not _CONFIG_KEY.match(name) or "\n" in value:
+                    raise exceptions.ConfigError(
+                        f"Invalid git configuration of {operation!r}: {name!r}"
+                    )
+
+        self._prefix: list[str] = []
+        for utility, arguments in (
+            ("ionice", IONICE_CLASSES[ionice]),
+            ("nice", ("-n", str(nice)) if nice else ()),
+        ):
+            if not arguments:
+                continue
+
+            if (path := shutil.which(utility)) is None:
+                logger.warning("The %r utility is not available, ignoring it.", utility)
+                continue
+
+            self._prefix.extend([path, *arguments])
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return (
+            f"{self.__class__.__name__!s}"
+            f"(nice={self.nice!r}, ionice={self.ionice!r})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return {
+            "nice": self.nice,
+            "ionice": self.ionice,
+            "git_config": self.git_config,
+        }
+
+    def get_command(self, operation: str, arguments: list[str]) -> list[str]:
+        """Returns the arguments running a git command within the envelope.
+
+        Parameters
+        ----------
+        operation : str
+            The git subcommand, such as clone or fetch.
+
+        arguments : list[str]
+            The arguments of the command, starting with the git executable.
+        """
+        executable, *rest = arguments
+
+        options: list[str] = []
+        for name, value in self.git_config.get(operation, {}).items():
+            options.extend(["-c", f"{name!s}={value!s}"])
+
+        return [*self._prefix, executable, *options, *rest]
@@ -5,28 +5,183 @@
 
 from __future__ import annotations
 
+import atexit
+import contextlib
+import contextvars
+import copy
+import datetime
+import json
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
 import typing
 
-__all__ = ["setup"]
+__all__ = [
+    "JsonFormatter",
+    "RepositoryFilter",
+    "repository_context",
+    "setup",
+]
 
+_repository: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "easy_mirrors_repository", default="-"
+)
+_attempt: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "easy_mirrors_attempt", default=1
+)
 
-def setup(level: str = "INFO") -> None:
-    """Sets up the logging system for the application."""
+# Optional attributes passed to log calls through the extra argument.
+_EXTRA_FIELDS: typing.Final[tuple[str, ...]] = ("operation", "duration_ms", "exit_code")
+
+# The listener writing the records queued by the application logger, if any.
+_listener: logging.handlers.QueueListener | None = None
+
+
+@contextlib.contextmanager
+def repository_context(url: str, attempt: int | None = None) -> typing.Iterator[None]:
+    """Attributes all log records emitted inside this block to a repository.
+
+    The number of the attempt is inherited from the enclosing block if omitted.
+    """
+    repository_token = _repository.set(url)
+    attempt_token = None if attempt is None else _attempt.set(attempt)
+    try:
+        yield
+    finally:
+        if attempt_token is not None:
+            _attempt.reset(attempt_token)
+        _repository.reset(repository_token)
+
+
+class RepositoryFilter(logging.Filter):
+    """Injects the repository being processed into every log record."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # Records passed through a queue have already been attributed.
+        if not hasattr(record, "repository"):
+            record.repository = _repository.get()
+            record.attempt = _attempt.get()
+
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats log records as single-line JSON objects with stable fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        document: dict[str, typing.Any] = {
+            "time": datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "repository": getattr(record, "repository", None),
+            "attempt": getattr(record, "attempt", None),
+        }
+        for name in _EXTRA_FIELDS:
+            document[name] = getattr(record, name, None)
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            document["exception"] = record.exc_text
+
+        return json.dumps(document, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands records over to the listener thread without formatting them."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only the message and the traceback are rendered here, so the handlers
+        # behind the listener still apply their own formatters.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+
+def _enable_queue(logger: logging.Logger) -> logging.handlers.QueueListener:
+    """Moves the handlers of a logger behind a queue served by a thread."""
+    records: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+
+    listener = logging.handlers.QueueListener(
+        records, *logger.handlers, respect_handler_level=True
+    )
+    handler = _QueueHandler(records)
+    # Context variables are only visible in the thread that emits the record.
+    handler.addFilter(RepositoryFilter())
+
+    logger.handlers = [handler]
+
+    listener.start()
+    atexit.register(listener.stop)
+
+    return listener
+
+
+def _disable_queue() -> None:
+    """Stops the listener started by a previous setup once its queue is empty."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        atexit.unregister(_listener.stop)
+        _listener = None
+
+
+def setup(
+    level: str = "INFO", log_format: str = "text", use_queue: bool = False
+) -> None:
+    """Sets up the logging system for the application.
+
+    Parameters
+    ----------
+    level : str, default="INFO"
+        The name of the lowest severity level of displayed messages.
+
+    log_format : str, default="text"
+        Either ``text`` for human-readable lines or ``json`` for JSON objects.
+
+    use_queue : bool, default=False
+        Writes log records from a background thread, so threads emitting them
+        never wait for the stream. A repeated setup replaces the thread.
+    """
+    global _listener
+
+    _disable_queue()
     logging.config.dictConfig(
         {
             "disable_existing_loggers": False,
+            "filters": {
+                "repository": {
+                    "()": RepositoryFilter,
+                },
+            },
             "formatters": {
                 "default": {
-                    "format": "%(asctime)s - %(levelname)s :: %(name)s :: %(message)s",
+                    "format": (
+                        "%(asctime)s - %(levelname)s :: %(name)s :: "
+                        "%(repository)s :: %(message)s"
+                    ),
+                },
+                "json": {
+                    "()": JsonFormatter,
                 },
             },
             "handlers": {
                 "stderr": {
                     "class": "logging.StreamHandler",
-                    "formatter": "default",
+                    "filters": ["repository"],
+                    "formatter": "json" if log_format == "json" else "default",
                     "stream": "ext://sys.stderr",
                 },
             },
@@ -52,3 +207,6 @@ def setup(level: str = "INFO") -> None:
             "version": 1,
         }
     )
+
+    if use_queue:
+        _listener = _enable_queue(logging.getLogger("easy_mirrors"))
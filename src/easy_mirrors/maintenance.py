@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import datetime
+import logging
+import os
+import time
+import typing
+
+from easy_mirrors import config, exceptions, git_repository, logger_wrapper
+
+logger = logging.getLogger("easy_mirrors")
+
+__all__ = ["PackStatistics", "get_tasks", "is_within_window", "run_maintenance"]
+
+# The number of packs that triggers merging small packs together.
+_INCREMENTAL_PACK_LIMIT: typing.Final[int] = 8
+# The number of packs that triggers a full repack during off-peak hours.
+_FULL_PACK_LIMIT: typing.Final[int] = 50
+# The longest time in seconds a bitmap index is kept before a full repack.
+_FULL_REPACK_INTERVAL: typing.Final[float] = 7 * 24 * 60 * 60
+
+
+class PackStatistics:
+    """Summary of the pack files stored in a mirror.
+
+    Attributes
+    ----------
+    packs : int
+        The number of pack files.
+
+    newest_pack : float
+        The modification time of the most recent pack file.
+
+    bitmap : float or None
+        The modification time of the bitmap index, if any.
+
+    commit_graph : float or None
+        The modification time of the commit-graph, if any.
+    """
+
+    def __init__(
+        self,
+        packs: int = 0,
+        newest_pack: float = 0.0,
+        bitmap: float | None = None,
+        commit_graph: float | None = None,
+    ) -> None:
+        self.packs = packs
+        self.newest_pack = newest_pack
+        self.bitmap = bitmap
+        self.commit_graph = commit_graph
+
+    @classmethod
+    def from_path(cls, local_path: str) -> PackStatistics:
+        """Collects statistics of a mirror without running any git process."""
+        statistics = cls()
+
+        try:
+            with os.scandir(os.path.join(local_path, "objects", "pack")) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".pack"):
+                        statistics.packs += 1
+                        statistics.newest_pack = max(
+                            statistics.newest_pack, entry.stat().st_mtime
+                        )
+                    elif entry.name.endswith(".bitmap"):
+                        statistics.bitmap = entry.stat().st_mtime
+        except OSError:
+            return statistics
+
+        for path in (
+            ("objects", "info", "commit-graph"),
+            ("objects", "info", "commit-graphs", "commit-graph-chain"),
+        ):
+            try:
+                mtime = os.stat(os.path.join(local_path, *path)).st_mtime
+            except OSError:
+                continue
+
+            statistics.commit_graph = max(statistics.commit_graph or 0.0, mtime)
+
+        return statistics
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return f"{self.__class__.__name__!s}(packs={self.packs:d})"
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return vars(self)
+
+
+def is_within_window(window: str, moment: datetime.time) -> bool:
+    """Determines whether a time of day falls into a daily time window.
+
+    Parameters
+    ----------
+    window : str
+        The time window in the ``HH:MM-HH:MM`` format, which may span midnight.
+
+    moment : datetime.time
+        The time of day to check.
+
+    Returns
+    -------
+    bool
+        True if the time falls into the window, otherwise false.
+    """
+    start, end = (datetime.time.fromisoformat(item) for item in window.split("-"))
+
+    if start <= end:
+        return start <= moment < end
+
+    return moment >= start or moment < end  # the window spans midnight
+
+
+def get_tasks(
+    statistics: PackStatistics, full_repack: bool, now: float | None = None
+) -> list[str]:
+    """Selects maintenance tasks needed by a mirror, cheapest ones last.
+
+    Parameters
+    ----------
+    statistics : PackStatistics
+        The summary of the pack files stored in the mirror.
+
+    full_repack : bool
+        Allows rewriting all packs into one with a bitmap index.
+
+    now : float, optional
+        The current unix time.
+
+    Returns
+    -------
+    list[str]
+        The names of tasks to run in the given order.
+    """
+    if not statistics.packs:
+        return []
+
+    now = time.time() if now is None else now
+    tasks: list[str] = []
+
+    if (
+        full_repack
+        and statistics.packs > 1
+        and (
+            statistics.bitmap is None
+            or statistics.packs >= _FULL_PACK_LIMIT
+            or now - statistics.bitmap >= _FULL_REPACK_INTERVAL
+        )
+    ):
+        tasks.append("full-repack")
+    elif statistics.packs >= _INCREMENTAL_PACK_LIMIT:
+        tasks.append("incremental-repack")
+
+    # Fetched packs make the commit-graph incomplete; split graphs are cheap
+    # to extend, so it is refreshed after every fetch.
+    if tasks or (statistics.commit_graph or 0.0) < statistics.newest_pack:
+        tasks.extend(["pack-refs", "commit-graph"])
+
+    return tasks
+
+
+def run_maintenance(
+    configuration: config.Config,
+    repositories: typing.Iterable[str] | None = None,
+    now: datetime.datetime | None = None,
+) -> dict[str, list[str]]:
+    """Maintains mirrors within the configured time budget.
+
+    Mirrors with the most packs are maintained first. Once the budget is spent,
+    the remaining mirrors wait for the next cycle; a running task is never
+    interrupted. Full repacks run only within the configured off-peak window
+    and never when no window is configured, and partial clones configured for
+    backfill download one batch of their missing objects per cycle.
+
+    Parameters
+    ----------
+    configuration : Config
+        The configuration listing mirrored repositories.
+
+    repositories : Iterable[str], optional
+        The subset of repositories to maintain instead of all configured ones.
+
+    now : datetime, optional
+        The current local time.
+
+    Returns
+    -------
+    dict[str, list[str]]
+        The tasks completed for every maintained repository.
+    """
+    if configuration.maintenance_budget <= 0:
+        return {}
+
+    now = datetime.datetime.now() if now is None else now
+    # Full repacks rewrite every pack, so they never run without a window.
+    full_repack = configuration.maintenance_window is not None and is_within_window(
+        configuration.maintenance_window, now.time()
+    )
+
+    candidates: list[tuple[int, git_repository.GitRepository, list[str]]] = []
+    for url in configuration.repositories if repositories is None else repositories:
+        repository = git_repository.GitRepository.from_url(
+            parent_path=configuration.path,
+            url=url,
+            layout=configuration.layout,
+            timeouts=configuration.get_timeouts(),
+        )
+        statistics = PackStatistics.from_path(repository.local_path)
+
+        tasks = get_tasks(statistics, full_repack, now.timestamp())
+        if (
+            url in configuration.backfill
+            and repository.get_partial_clone_filter() is not None
+        ):
+            tasks.append("backfill")
+
+        if tasks:
+            candidates.append((statistics.packs, repository, tasks))
+
+    candidates.sort(key=lambda item: item[0], reverse=True)
+
+    started = time.monotonic()
+    completed: dict[str, list[str]] = {}
+
+    for index, (_, repository, tasks) in enumerate(candidates):
+        if time.monotonic() - started >= configuration.maintenance_budget:
+            logger.info(
+                "Maintenance budget is spent, %d mirror(s) postponed.",
+                len(candidates) - index,
+            )
+            break
+
+        with logger_wrapper.repository_context(repository.url):
+            for task in tasks:
+                try:
+                    repository.run_maintenance(task)
+                except exceptions.ExternalProcessError:
+                    logger.warning("Maintenance task %r failed.", task)
+                    break
+
+                completed.setdefault(repository.url, []).append(task)
+
+            logger.debug("Completed maintenance: %s", completed.get(repository.url))
+
+    return completed
@@ -0,0 +1,390 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import contextlib
+import http.server
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+import typing
+
+from easy_mirrors import exceptions, state, transfers
+
+logger = logging.getLogger("easy_mirrors")
+
+__all__ = [
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "Registry",
+    "REGISTRY",
+    "record_cycle_transfer",
+    "record_sync",
+    "record_transfer",
+    "start_http_server",
+    "track_operation",
+    "write_textfile",
+]
+
+_LabelValues = typing.Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+
+    return repr(float(value))
+
+
+class Registry:
+    """Collection of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: list[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        with self._lock:
+            self._metrics.append(metric)
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics)
+
+        return "".join(line + "\n" for metric in metrics for line in metric.render())
+
+
+REGISTRY: typing.Final[Registry] = Registry()
+
+
+class _Metric:
+    kind: typing.ClassVar[str]
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: typing.Sequence[str] = (),
+        registry: Registry = REGISTRY,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _get_label_values(self, labels: dict[str, str]) -> _LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name!r} requires labels: {self.labelnames}")
+
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_sample(
+        self,
+        name: str,
+        label_values: _LabelValues,
+        value: float,
+        extra: dict[str, str] | None = None,
+    ) -> str:
+        labels = dict(zip(self.labelnames, label_values, strict=True), **(extra or {}))
+        if not labels:
+            return f"{name!s} {_format_value(value)!s}"
+
+        formatted = ",".join(
+            f'{key!s}="{_escape(value)!s}"' for key, value in labels.items()
+        )
+
+        return f"{name!s}{{{formatted!s}}} {_format_value(value)!s}"
+
+    def _samples(self) -> typing.Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> typing.Iterator[str]:
+        yield f"# HELP {self.name!s} {self.documentation!s}"
+        yield f"# TYPE {self.name!s} {self.kind!s}"
+
+        with self._lock:
+            yield from self._samples()
+
+
+class Counter(_Metric):
+    """Monotonically increasing value, such as the number of failures."""
+
+    kind = "counter"
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[_LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> typing.Iterator[str]:
+        for key, value in sorted(self._values.items()):
+            yield self._format_sample(self.name, key, value)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down, such as the number of running processes."""
+
+    kind = "gauge"
+
+    def __init__(self, *args: typing.Any, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[_LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def _samples(self) -> typing.Iterator[str]:
+        for key, value in sorted(self._values.items()):
+            yield self._format_sample(self.name, key, value)
+
+
+class Histogram(_Metric):
+    """Distribution of observed values, such as durations of git operations."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        *args: typing.Any,
+        buckets: typing.Sequence[float] = (0.1, 1.0, 10.0, 60.0, 600.0),
+        **kwargs: typing.Any,
+    ) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+        self._counts: dict[_LabelValues, list[int]] = {}
+        self._sums: dict[_LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._get_label_values(labels)
+        with self._lock:
+            counts = self._counts.setdefault(key, [0] * len(self.buckets))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+
+            self._sums[key] = self._sums.get(key, 0.0) + value
+
+    def snapshot(self) -> dict[_LabelValues, tuple[int, float]]:
+        """Returns the number and the sum of observations for every label set."""
+        with self._lock:
+            return {
+                key: (counts[-1], self._sums[key])
+                for key, counts in self._counts.items()
+            }
+
+    def _samples(self) -> typing.Iterator[str]:
+        for key, counts in sorted(self._counts.items()):
+            for bound, count in zip(self.buckets, counts, strict=True):
+                yield self._format_sample(
+                    f"{self.name!s}_bucket", key, count, {"le": _format_value(bound)}
+                )
+
+            yield self._format_sample(f"{self.name!s}_count", key, counts[-1])
+            yield self._format_sample(f"{self.name!s}_sum", key, self._sums[key])
+
+
+OPERATION_DURATION: typing.Final[Histogram] = Histogram(
+    "easy_mirrors_git_operation_duration_seconds",
+    "Duration of git operations.",
+    labelnames=("operation",),
+    buckets=(0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0, 3600.0),
+)
+OPERATIONS_IN_FLIGHT: typing.Final[Gauge] = Gauge(
+    "easy_mirrors_git_operations_in_flight",
+    "Number of git operations currently running.",
+    labelnames=("operation",),
+)
+OPERATION_FAILURES: typing.Final[Counter] = Counter(
+    "easy_mirrors_git_operation_failures_total",
+    "Number of failed git operations.",
+    labelnames=("operation",),
+)
+FAILURES: typing.Final[Counter] = Counter(
+    "easy_mirrors_failures_total",
+    "Number of failed repository synchronizations by kind.",
+    labelnames=("kind",),
+)
+SYNCS: typing.Final[Counter] = Counter(
+    "easy_mirrors_syncs_total",
+    "Number of repository synchronizations by outcome.",
+    labelnames=("status",),
+)
+LAST_SUCCESS: typing.Final[Gauge] = Gauge(
+    "easy_mirrors_repository_last_success_timestamp_seconds",
+    "Unix time of the last successful synchronization of a repository.",
+    labelnames=("repository",),
+)
+SYNC_DURATION: typing.Final[Gauge] = Gauge(
+    "easy_mirrors_repository_sync_duration_seconds",
+    "Duration of the last synchronization of a repository.",
+    labelnames=("repository",),
+)
+CYCLE_DURATION: typing.Final[Gauge] = Gauge(
+    "easy_mirrors_cycle_duration_seconds",
+    "Duration of the last mirroring cycle.",
+)
+RECEIVED_BYTES: typing.Final[Counter] = Counter(
+    "easy_mirrors_repository_received_bytes_total",
+    "Number of bytes received by clones and fetches of a repository.",
+    labelnames=("repository",),
+)
+RECEIVED_OBJECTS: typing.Final[Counter] = Counter(
+    "easy_mirrors_repository_received_objects_total",
+    "Number of objects received by clones and fetches of a repository.",
+    labelnames=("repository",),
+)
+REF_UPDATES: typing.Final[Counter] = Counter(
+    "easy_mirrors_repository_ref_updates_total",
+    "Number of refs created, updated or deleted in the mirror of a repository.",
+    labelnames=("repository",),
+)
+CYCLE_RECEIVED_BYTES: typing.Final[Gauge] = Gauge(
+    "easy_mirrors_cycle_received_bytes",
+    "Number of bytes received during the last mirroring cycle.",
+)
+CYCLE_RECEIVED_OBJECTS: typing.Final[Gauge] = Gauge(
+    "easy_mirrors_cycle_received_objects",
+    "Number of objects received during the last mirroring cycle.",
+)
+CYCLE_REF_UPDATES: typing.Final[Gauge] = Gauge(
+    "easy_mirrors_cycle_ref_updates",
+    "Number of refs updated during the last mirroring cycle.",
+)
+
+
+@contextlib.contextmanager
+def track_operation(operation: str) -> typing.Iterator[None]:
+    """Measures a git operation and counts it as a failure if it raises."""
+    OPERATIONS_IN_FLIGHT.inc(operation=operation)
+    started = time.monotonic()
+    try:
+        yield
+    except BaseException:
+        OPERATION_FAILURES.inc(operation=operation)
+        raise
+    finally:
+        OPERATIONS_IN_FLIGHT.dec(operation=operation)
+        OPERATION_DURATION.observe(time.monotonic() - started, operation=operation)
+
+
+def record_sync(url: str, status: str, duration: float) -> None:
+    """Updates metrics describing the outcome of one repository synchronization."""
+    SYNCS.inc(status=status)
+    SYNC_DURATION.set(duration, repository=url)
+
+    if status in state.SUCCESS_STATUSES:
+        LAST_SUCCESS.set(time.time(), repository=url)
+    elif status in state.FAILURE_STATUSES:
+        FAILURES.inc(kind=status)
+
+
+def record_transfer(url: str, transfer: transfers.Transfer) -> None:
+    """Adds the data received by one repository synchronization to its totals."""
+    RECEIVED_BYTES.inc(transfer.received_bytes, repository=url)
+    RECEIVED_OBJECTS.inc(transfer.objects, repository=url)
+    REF_UPDATES.inc(transfer.ref_updates, repository=url)
+
+
+def record_cycle_transfer(transfer: transfers.Transfer) -> None:
+    """Updates metrics describing the data received during a whole cycle."""
+    CYCLE_RECEIVED_BYTES.set(transfer.received_bytes)
+    CYCLE_RECEIVED_OBJECTS.set(transfer.objects)
+    CYCLE_REF_UPDATES.set(transfer.ref_updates)
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    registry: typing.ClassVar[Registry] = REGISTRY
+
+    def do_GET(self) -> None:  # noqa: N802
+        body = self.registry.render().encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: typing.Any) -> None:  # noqa: A002
+        logger.debug(format, *args)
+
+
+def start_http_server(
+    port: int, address: str = "127.0.0.1"
+) -> http.server.ThreadingHTTPServer:
+    """Serves metrics over http from a background thread.
+
+    Raises
+    ------
+    FileSystemError
+        Raised when the server socket can not be bound.
+    """
+    try:
+        server = http.server.ThreadingHTTPServer((address, port), _MetricsHandler)
+    except OSError as err:
+        logger.error("Unable to start the metrics server.")
+        raise exceptions.FileSystemError(
+            f"Unable to listen for metrics requests on port: {port:d}"
+        ) from err
+
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="easy_mirrors-metrics", daemon=True
+    ).start()
+
+    return server
+
+
+def write_textfile(path: str, registry: Registry = REGISTRY) -> None:
+    """Atomically writes metrics to a file read by the textfile collector.
+
+    Raises
+    ------
+    FileSystemError
+        Raised when the file can not be written.
+    """
+    try:
+        with tempfile.NamedTemporaryFile(
+            "wt",
+            dir=os.path.dirname(path) or os.curdir,
+            encoding="utf-8",
+            delete=False,
+            prefix=".easy_mirrors-",
+        ) as stream_out:
+            stream_out.write(registry.render())
+
+        os.chmod(stream_out.name, 0o644)  # nosec
+        os.replace(stream_out.name, path)
+    except OSError as err:
+        logger.error("Unable to write metrics to the specified path.")
+        raise exceptions.FileSystemError(
+            f"Unable to write metrics to the path: {path!r}"
+        ) from err
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import fnmatch
+import re
+import typing
+
+from easy_mirrors import exceptions
+
+__all__ = ["DEFAULT_REFSPECS", "NEGOTIATION_ALGORITHMS", "RefFilter"]
+
+# The refspec written by git clone --mirror.
+DEFAULT_REFSPECS: typing.Final[tuple[str, ...]] = ("+refs/*:refs/*",)
+
+NEGOTIATION_ALGORITHMS: typing.Final[frozenset[str]] = frozenset(
+    {"consecutive", "default", "noop", "skipping"}
+)
+
+# Patterns follow the rules of refspecs: a full ref name with one wildcard.
+_PATTERN: typing.Final[re.Pattern[str]] = re.compile(
+    r"^refs/[^\s*:^~?\[\\]*\*?[^\s*:^~?\[\\]*$"
+)
+
+
+class RefFilter:
+    """Selection of refs mirrored from a repository with many refs.
+
+    Included patterns become the fetch refspecs of the mirror, so that git sends
+    them as protocol v2 ref prefixes and the remote advertises only matching
+    refs. Excluded patterns become negative refspecs.
+
+    Parameters
+    ----------
+    include : Sequence[str], optional
+        Patterns of mirrored refs, such as ``refs/heads/*``; all refs by default.
+
+    exclude : Sequence[str], optional
+        Patterns of refs never mirrored, such as ``refs/pull/*``.
+
+    negotiation : str, optional
+        The fetch negotiation algorithm, such as ``skipping``, which sends fewer
+        commits to remotes with long histories.
+
+    Raises
+    ------
+    ConfigError
+        Raised when a pattern or the negotiation algorithm is invalid.
+    """
+
+    def __init__(
+        self,
+        include: typing.Sequence[str] | None = None,
+        exclude: typing.Sequence[str] | None = None,
+        negotiation: str | None = None,
+    ) -> None:
+        self.include = sorted(set(include or ["refs/*"]))
+        self.exclude = sorted(set(exclude or []))
+        self.negotiation = negotiation
+
+        for pattern in self.include + self.exclude:
+            if not _PATTERN.match(pattern):
+                raise exceptions.ConfigError(f"Invalid ref pattern: {pattern!r}")
+
+        if negotiation is not None and negotiation not in NEGOTIATION_ALGORITHMS:
+            raise exceptions.ConfigError(
+                f"Unknown negotiation algorithm: {negotiation!r}"
+            )
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return (
+            f"{self.__class__.__name__!s}"
+            f"(include={self.include!s}, exclude={self.exclude!s})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return vars(self)
+
+    def matches(self, ref: str) -> bool:
+        """Determines whether a ref is mirrored."""
+        return any(
+            fnmatch.fnmatchcase(ref, pattern) for pattern in self.include
+        ) and not any(fnmatch.fnmatchcase(ref, pattern) for pattern in self.exclude)
+
+    def get_refspecs(self) -> list[str]:
+        """Returns the fetch refspecs of the mirror, negative ones last."""
+        return [f"+{pattern!s}:{pattern!s}" for pattern in self.include] + [
+            f"^{pattern!s}" for pattern in self.exclude
+        ]
+
+    def get_ls_remote_options(self) -> str:
+        """Returns options limiting the refs listed by git ls-remote.
+
+        Git sends ref prefixes for heads and tags only, so other patterns are
+        filtered after the listing.
+        """
+        options: dict[str, str] = {"refs/heads/": "--heads", "refs/tags/": "--tags"}
+
+        selected: set[str] = set()
+        for pattern in self.include:
+            if (prefix := pattern[: pattern.find("/", 5) + 1]) not in options:
+                return ""
+
+            selected.add(options[prefix])
+
+        return " ".join(sorted(selected))
+
+    def get_config_options(self) -> str:
+        """Returns global git options tuning fetches of the mirror."""
+        options = "-c protocol.version=2"
+        if self.negotiation is not None:
+            options += f" -c fetch.negotiationAlgorithm={self.negotiation!s}"
+
+        return options
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import time
+import typing
+
+from easy_mirrors import state
+
+logger = logging.getLogger("easy_mirrors")
+
+__all__ = ["Scheduler"]
+
+# Multipliers applied to the interval of a repository after each sync.
+_CHANGED_FACTOR: typing.Final[float] = 0.5
+_UNCHANGED_FACTOR: typing.Final[float] = 1.5
+
+
+class Scheduler:
+    """Priority queue of repositories ordered by the time their next sync is due.
+
+    Every repository has its own synchronization interval kept within the given
+    bounds. The interval shrinks each time a sync brings in new refs and grows
+    each time the repository turns out to be unchanged, so frequently updated
+    repositories are polled more often than dormant ones.
+
+    Parameters
+    ----------
+    min_interval : float
+        The shortest interval in seconds between two syncs of one repository.
+
+    max_interval : float
+        The longest interval in seconds between two syncs of one repository.
+    """
+
+    def __init__(self, min_interval: float, max_interval: float) -> None:
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+
+        self._counter = itertools.count()
+        self._heap: list[tuple[float, int, str]] = []
+        # The sequence number of the only valid heap entry of each repository.
+        self._entries: dict[str, int] = {}
+        self._intervals: dict[str, float] = {}
+
+    def __contains__(self, url: object) -> bool:
+        return url in self._intervals
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def _push(self, url: str, due: float) -> None:
+        sequence = next(self._counter)
+        self._entries[url] = sequence
+
+        heapq.heappush(self._heap, (due, sequence, url))
+
+    def set_bounds(
+        self, min_interval: float, max_interval: float, now: float | None = None
+    ) -> None:
+        """Replaces the bounds of the synchronization intervals.
+
+        The interval of every repository is clamped to the new bounds, and
+        queued syncs due later than the new longest interval allows are brought
+        forward.
+        """
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+
+        for url, interval in self._intervals.items():
+            self._intervals[url] = self._clamp(interval)
+
+        latest = (time.time() if now is None else now) + self.max_interval
+        for due, sequence, url in list(self._heap):
+            if self._entries.get(url) == sequence and due > latest:
+                self._push(url, latest)
+
+    def add(
+        self,
+        url: str,
+        repository_state: state.RepositoryState | None = None,
+        now: float | None = None,
+    ) -> None:
+        """Starts tracking a repository, using its recorded history when known.
+
+        Repositories without history are due immediately. Otherwise the initial
+        interval is derived from how long ago their refs changed last time.
+        """
+        if url in self._intervals:
+            return
+
+        now = time.time() if now is None else now
+        interval, due = self.min_interval, now
+
+        if repository_state is not None:
+            if repository_state.last_change is not None:
+                interval = self._clamp((now - repository_state.last_change) / 2)
+
+            # Repositories that failed last time are retried without delay.
+            if (
+                repository_state.last_sync is not None
+                and not repository_state.consecutive_failures
+            ):
+                due = repository_state.last_sync + interval
+
+        self._intervals[url] = interval
+        self._push(url, due)
+
+    def remove(self, url: str) -> None:
+        """Stops tracking a repository; its queued entry is discarded lazily."""
+        self._intervals.pop(url, None)
+        self._entries.pop(url, None)
+
+    def next_due(self) -> float | None:
+        """Returns the time when the earliest repository becomes due, if any."""
+        while self._heap:
+            due, sequence, url = self._heap[0]
+            if self._entries.get(url) == sequence:
+                return due
+
+            heapq.heappop(self._heap)  # drop stale entries
+
+        return None
+
+    def get_queue(self) -> list[tuple[float, str]]:
+        """Returns queued repositories with the times they are due, earliest first."""
+        return sorted(
+            (due, url)
+            for due, sequence, url in self._heap
+            if self._entries.get(url) == sequence
+        )
+
+    def pop_due(self, now: float | None = None) -> list[str]:
+        """Removes and returns every repository whose sync is due.
+
+        Returned repositories are not queued again until they are rescheduled.
+        """
+        now = time.time() if now is None else now
+        urls: list[str] = []
+
+        while (due := self.next_due()) is not None and due <= now:
+            _, _, url = heapq.heappop(self._heap)
+            del self._entries[url]
+
+            urls.append(url)
+
+        return urls
+
+    def reschedule(self, url: str, status: str, now: float | None = None) -> float:
+        """Queues a repository again according to the outcome of its last sync.
+
+        Parameters
+        ----------
+        url : str
+            The remote repository url.
+
+        status : str
+            The outcome of the last synchronization of the repository.
+
+        now : float, optional
+            The current unix time.
+
+        Returns
+        -------
+        float
+            The interval in seconds until the next sync of the repository.
+        """
+        if url not in self._intervals:
+            return 0.0  # the repository has been removed in the meantime
+
+        now = time.time() if now is None else now
+        interval = self._intervals[url]
+
+        if status in {"cloned", "fetched"}:
+            interval = self._clamp(interval * _CHANGED_FACTOR)
+        elif status in state.SUCCESS_STATUSES or status == "skipped":
+            interval = self._clamp(interval * _UNCHANGED_FACTOR)
+        else:
+            # Failed repositories keep their pace but are retried soon.
+            self._push(url, now + self.min_interval)
+
+            return self.min_interval
+
+        self._intervals[url] = interval
+        self._push(url, now + interval)
+
+        logger.debug("Next sync of %r in %.0f second(s).", url, interval)
+
+        return interval
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import typing
+
+from easy_mirrors import exceptions, transfers
+
+logger = logging.getLogger("easy_mirrors")
+
+__all__ = ["FAILURE_STATUSES", "SUCCESS_STATUSES", "RepositoryState", "StateStore"]
+
+# Outcomes of a single repository synchronization.
+SUCCESS_STATUSES: typing.Final[frozenset[str]] = frozenset(
+    {"cloned", "fetched", "unchanged"}
+)
+FAILURE_STATUSES: typing.Final[frozenset[str]] = frozenset(
+    {"failed", "missing", "timeout"}
+)
+
+_SCHEMA: typing.Final[str] = """
+CREATE TABLE IF NOT EXISTS syncs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration REAL NOT NULL,
+    status TEXT NOT NULL,
+    fingerprint TEXT,
+    error TEXT,
+    objects INTEGER,
+    received_bytes INTEGER,
+    ref_updates INTEGER
+);
+CREATE INDEX IF NOT EXISTS syncs_url_index ON syncs (url, started_at);
+CREATE TABLE IF NOT EXISTS repositories (
+    url TEXT PRIMARY KEY,
+    last_sync REAL,
+    last_success REAL,
+    last_duration REAL,
+    last_change REAL,
+    fingerprint TEXT,
+    consecutive_failures INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Columns added to the history after its first release, created on upgrade.
+_TRANSFER_COLUMNS: typing.Final[tuple[str, ...]] = (
+    "objects",
+    "received_bytes",
+    "ref_updates",
+)
+
+_HISTORY_COLUMNS: typing.Final[tuple[str, ...]] = (
+    "started_at",
+    "duration",
+    "status",
+    "fingerprint",
+    "error",
+    *_TRANSFER_COLUMNS,
+)
+
+
+class RepositoryState:
+    """Represents the synchronization history of a single repository.
+
+    Attributes
+    ----------
+    url : str
+        The remote repository url.
+
+    last_sync : float or None
+        The unix time of the last synchronization attempt.
+
+    last_success : float or None
+        The unix time of the last successful synchronization.
+
+    last_duration : float or None
+        The duration of the last successful synchronization in seconds.
+
+    last_change : float or None
+        The unix time when a change of the remote refs was last observed.
+
+    fingerprint : str or None
+        The digest of the remote refs seen during the last successful sync.
+
+    consecutive_failures : int
+        The number of failed synchronizations since the last success.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        last_sync: float | None = None,
+        last_success: float | None = None,
+        last_duration: float | None = None,
+        last_change: float | None = None,
+        fingerprint: str | None = None,
+        consecutive_failures: int = 0,
+    ) -> None:
+        self.url = url
+        self.last_sync = last_sync
+        self.last_success = last_success
+        self.last_duration = last_duration
+        self.last_change = last_change
+        self.fingerprint = fingerprint
+        self.consecutive_failures = consecutive_failures
+
+    def __str__(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return (
+            f"{self.__class__.__name__!s}"
+            f"(url={self.url!r}, last_success={self.last_success!r}, "
+            f"consecutive_failures={self.consecutive_failures:d})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return vars(self)
+
+
+class StateStore:
+    """Persistent synchronization history backed by a local SQLite database.
+
+    Records are accepted without touching the disk: they are queued and then
+    written in batches by a dedicated thread, so that many concurrent workers
+    never serialize on database writes. The database works in WAL mode to let
+    readers proceed while a batch is being committed.
+
+    Parameters
+    ----------
+    path : str
+        The local path to the database file.
+
+    batch_size : int, default=256
+        The maximum number of records committed in one transaction.
+    """
+
+    def __init__(self, path: str, batch_size: int = 256) -> None:
+        self.path = path
+        self.batch_size = batch_size
+
+        try:
+            os.makedirs(os.path.dirname(path) or os.curdir, exist_ok=True)
+
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            self._connection.executescript(_SCHEMA)
+            self._upgrade()
+        except (OSError, sqlite3.Error) as err:
+            logger.error("Unable to open the synchronization state database.")
+            raise exceptions.FileSystemError(
+                f"Unable to open the state database at path: {path!r}"
+            ) from err
+
+        self._lock = threading.Lock()
+        self._queue: queue.Queue[tuple[typing.Any, ...] | None] = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_batches, name="easy_mirrors-state", daemon=True
+        )
+        self._writer.start()
+
+    def _upgrade(self) -> None:
+        """Adds the columns missing from a database of an earlier version."""
+        columns = {
+            row[1] for row in self._connection.execute("PRAGMA table_info(syncs)")
+        }
+
+        with self._connection:
+            for name in _TRANSFER_COLUMNS:
+                if name not in columns:
+                    self._connection.execute(
+                        f"ALTER TABLE syncs ADD COLUMN {name!s} INTEGER"
+                    )
+
+    def __enter__(self) -> StateStore:
+        return self
+
+    def __exit__(self, *args: typing.Any) -> None:
+        self.close()
+
+    def record(
+        self,
+        url: str,
+        status: str,
+        started_at: float,
+        duration: float,
+        fingerprint: str | None = None,
+        error: str | None = None,
+        transfer: transfers.Transfer | None = None,
+    ) -> None:
+        """Queues the outcome of one repository synchronization for writing."""
+        received: tuple[int | None, ...] = (None, None, None)
+        if transfer is not None:
+            received = (transfer.objects, transfer.received_bytes, transfer.ref_updates)
+
+        self._queue.put(
+            (url, started_at, duration, status, fingerprint, error, *received)
+        )
+
+    def flush(self) -> None:
+        """Blocks until every queued record has been committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        """Commits pending records and releases the database connection."""
+        if not self._writer.is_alive():
+            return
+
+        self._queue.put(None)  # stop the writer after the pending records
+        self._writer.join()
+
+        with self._lock:
+            self._connection.close()
+
+    def get(self, url: str) -> RepositoryState | None:
+        """Returns the recorded state of a repository, if any."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, last_sync, last_success, last_duration, last_change, "
+                "fingerprint, consecutive_failures FROM repositories WHERE url = ?",
+                (url,),
+            ).fetchone()
+
+        return RepositoryState(*row) if row is not None else None
+
+    def get_all(self) -> dict[str, RepositoryState]:
+        """Returns the recorded state of every known repository."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT url, last_sync, last_success, last_duration, last_change, "
+                "fingerprint, consecutive_failures FROM repositories"
+            ).fetchall()
+
+        return {row[0]: RepositoryState(*row) for row in rows}
+
+    def get_history(self, url: str, limit: int = 100) -> list[dict[str, typing.Any]]:
+        """Returns the most recent synchronizations of a repository."""
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT {', '.join(_HISTORY_COLUMNS)!s} FROM syncs "  # nosec
+                "WHERE url = ? ORDER BY started_at DESC LIMIT ?",
+                (url, limit),
+            ).fetchall()
+
+        return [dict(zip(_HISTORY_COLUMNS, row, strict=True)) for row in rows]
+
+    def get_transfers(
+        self, since: float = 0.0, limit: int = 20
+    ) -> list[dict[str, typing.Any]]:
+        """Returns the repositories that received the most data.
+
+        Parameters
+        ----------
+        since : float, default=0.0
+            The unix time from which synchronizations are taken into account.
+
+        limit : int, default=20
+            The maximum number of repositories to return.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            The objects, bytes and ref updates received by every repository,
+            from the largest number of bytes.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT url, COALESCE(SUM(objects), 0), "
+                "COALESCE(SUM(received_bytes), 0), COALESCE(SUM(ref_updates), 0), "
+                "COUNT(*) FROM syncs WHERE started_at >= ? GROUP BY url "
+                "ORDER BY 3 DESC, url LIMIT ?",
+                (since, limit),
+            ).fetchall()
+
+        return [
+            dict(
+                zip(
+                    ("url", "objects", "received_bytes", "ref_updates", "syncs"),
+                    row,
+                    strict=True,
+                )
+            )
+            for row in rows
+        ]
+
+    def _write_batches(self) -> None:
+        stop = False
+
+        while not stop:
+            batch = [self._queue.get()]  # block until there is work to do
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for item in batch if item is not None]
+            stop = len(records) != len(batch)
+            try:
+                if records:
+                    self._write(records)
+            except sqlite3.Error:
+                logger.exception("Unable to save the synchronization state.")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, records: list[tuple[typing.Any, ...]]) -> None:
+        with self._lock, self._connection:  # one transaction per batch
+            self._connection.executemany(
+                "INSERT INTO syncs (url, started_at, duration, status, fingerprint, "
+                "error, objects, received_bytes, ref_updates) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                records,
+            )
+
+            for url, started_at, duration, status, fingerprint, *_ in records:
+                self._update_repository(url, started_at, duration, status, fingerprint)
+
+    def _update_repository(
+        self,
+        url: str,
+        started_at: float,
+        duration: float,
+        status: str,
+        fingerprint: str | None,
+    ) -> None:
+        row = self._connection.execute(
+            "SELECT last_success, last_duration, last_change, fingerprint, "
+            "consecutive_failures FROM repositories WHERE url = ?",
+            (url,),
+        ).fetchone()
+        last_success, last_duration, last_change, last_fingerprint, failures = row or (
+            None,
+            None,
+            None,
+            None,
+            0,
+        )
+
+        if status in SUCCESS_STATUSES:
+            finished_at = started_at + duration
+            if fingerprint is not None and fingerprint != last_fingerprint:
+                last_change = finished_at
+                last_fingerprint = fingerprint
+
+            last_success, last_duration, failures = finished_at, duration, 0
+
+        elif status in FAILURE_STATUSES:
+            failures += 1
+
+        self._connection.execute(
+            "INSERT OR REPLACE INTO repositories (url, last_sync, last_success, "
+            "last_duration, last_change, fingerprint, consecutive_failures) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (
+                url,
+                started_at,
+                last_success,
+                last_duration,
+                last_change,
+                last_fingerprint,
+                failures,
+            ),
+        )
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import re
+import threading
+import typing
+
+__all__ = ["Transfer", "format_size", "parse_size"]
+
+_UNITS: typing.Final[dict[str, int]] = {
+    "bytes": 1,
+    "KiB": 1024,
+    "MiB": 1024**2,
+    "GiB": 1024**3,
+    "TiB": 1024**4,
+}
+
+# Progress meters of git, such as "Receiving objects:  45% (136/302)". Without a
+# terminal every update of a meter is written as a line of its own.
+_PROGRESS: typing.Final[re.Pattern[str]] = re.compile(
+    r"^(?:remote: )?[A-Z][a-z ]+:\s+\d+% \(\d+/\d+\)"
+)
+_RECEIVED: typing.Final[re.Pattern[str]] = re.compile(
+    r"^(?:Receiving|Unpacking) objects:\s+\d+% \((?P<objects>\d+)/\d+\)"
+    r"(?:, (?P<size>[\d.]+ (?:bytes|[KMGT]iB)))?"
+)
+_TOTAL: typing.Final[re.Pattern[str]] = re.compile(r"^remote: Total (?P<objects>\d+)")
+
+# Ref lines of git fetch --verbose; unchanged and rejected refs are flagged by
+# an equals sign and an exclamation mark.
+_REF_UPDATE: typing.Final[re.Pattern[str]] = re.compile(
+    r"^ (?P<flag>[ +\-t*!=]) \S.*? -> \S+"
+)
+
+
+def parse_size(text: str) -> int:
+    """Converts a size printed by git, such as ``5.73 MiB``, into bytes.
+
+    Raises
+    ------
+    ValueError
+        Raised when the text is not a size.
+    """
+    value, _, unit = text.strip().partition(" ")
+    if unit not in _UNITS:
+        raise ValueError(f"Unknown size unit: {unit!r}")
+
+    return round(float(value) * _UNITS[unit])
+
+
+def format_size(size: float) -> str:
+    """Returns a human readable size in binary units."""
+    *units, unit = _UNITS
+    for candidate in units:
+        if abs(size) < 1024:
+            unit = candidate
+            break
+        size /= 1024
+
+    return f"{size:.0f} bytes" if unit == "bytes" else f"{size:.2f} {unit!s}"
+
+
+class Transfer:
+    """Amount of data received from remotes by clones and fetches.
+
+    The figures are read from the progress and summary output of git, so they
+    describe the packs as they come over the wire: objects and bytes received,
+    refs updated and the time spent transferring. Instances are safe to share
+    between threads, so one of them can aggregate a whole cycle.
+
+    Attributes
+    ----------
+    objects : int
+        The number of objects received.
+
+    received_bytes : int
+        The number of bytes received. Git reports no size for transfers that
+        complete faster than its progress meter updates.
+
+    ref_updates : int
+        The number of refs created, updated or deleted.
+
+    elapsed : float
+        The number of seconds spent in clones and fetches.
+    """
+
+    def __init__(
+        self,
+        objects: int = 0,
+        received_bytes: int = 0,
+        ref_updates: int = 0,
+        elapsed: float = 0.0,
+    ) -> None:
+        self.objects = objects
+        self.received_bytes = received_bytes
+        self.ref_updates = ref_updates
+        self.elapsed = elapsed
+
+        self._lock = threading.Lock()
+        # The latest figures of the command in progress, which overwrite each
+        # other until the command finishes.
+        self._pending: dict[str, int] = {}
+
+    def __str__(self) -> str:
+        return (
+            f"{self.objects:d} object(s), {format_size(self.received_bytes)!s}, "
+            f"{self.ref_updates:d} ref update(s) in {self.elapsed:.1f} second(s)"
+        )
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return (
+            f"{self.__class__.__name__!s}"
+            f"(objects={self.objects:d}, received_bytes={self.received_bytes:d}, "
+            f"ref_updates={self.ref_updates:d})"
+        )
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return {
+            "objects": self.objects,
+            "received_bytes": self.received_bytes,
+            "ref_updates": self.ref_updates,
+            "elapsed": self.elapsed,
+        }
+
+    @property
+    def throughput(self) -> float:
+        """The average number of bytes received per second."""
+        return self.received_bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def feed(self, line: str) -> bool:
+        """Reads the figures reported by one line of git output.
+
+        Returns
+        -------
+        bool
+            True if the line belongs to a progress meter or a summary of git,
+            otherwise false.
+        """
+        line = line.rstrip()
+
+        if match := _RECEIVED.match(line):
+            with self._lock:
+                self._pending["received"] = int(match["objects"])
+                if match["size"] is not None:
+                    self._pending["bytes"] = parse_size(match["size"])
+        elif match := _TOTAL.match(line):
+            with self._lock:
+                self._pending["total"] = int(match["objects"])
+        elif match := _REF_UPDATE.match(line):
+            if match["flag"] not in "=!":
+                with self._lock:
+                    self._pending["refs"] = self._pending.get("refs", 0) + 1
+
+            return False
+        elif not _PROGRESS.match(line):
+            return False
+
+        return True
+
+    def finish(self, elapsed: float) -> None:
+        """Adds the figures of a finished git command to the totals.
+
+        Parameters
+        ----------
+        elapsed : float
+            The duration of the command in seconds.
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+            # The count of the pack announced by the remote stands in for
+            # transfers too small for a progress meter of their own.
+            self.objects += pending.get("received") or pending.get("total", 0)
+            self.received_bytes += pending.get("bytes", 0)
+            self.ref_updates += pending.get("refs", 0)
+            self.elapsed += elapsed
+
+    def add(self, other: Transfer) -> None:
+        """Adds the totals of another transfer to this one."""
+        with self._lock:
+            self.objects += other.objects
+            self.received_bytes += other.received_bytes
+            self.ref_updates += other.ref_updates
+            self.elapsed += other.elapsed
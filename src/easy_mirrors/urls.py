@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import posixpath
+import re
+import typing
+import urllib.parse
+
+__all__ = ["canonicalize", "get_host", "rewrite_host"]
+
+# The scp-like syntax accepted by git: [user@]host:path/to/repository.git
+_SCP_LIKE_URL: typing.Final[re.Pattern[str]] = re.compile(
+    r"^(?:(?P<user>[^@/]+)@)?(?P<host>[^:/]+):(?P<path>(?!//).*)$"
+)
+
+
+def get_host(url: str) -> str:
+    """Returns the host name of a repository url.
+
+    Parameters
+    ----------
+    url : str
+        The repository url in any syntax supported by git.
+
+    Returns
+    -------
+    str
+        The lowercase host name without user information and port, or an
+        empty string for local repositories.
+    """
+    if "://" in url:
+        return (urllib.parse.urlsplit(url).hostname or "").lower()
+
+    if match := _SCP_LIKE_URL.match(url):
+        return match.group("host").lower()
+
+    return ""  # local path
+
+
+def rewrite_host(url: str, hosts: typing.Mapping[str, str]) -> str:
+    """Moves a repository url to another host, keeping its path and user.
+
+    Parameters
+    ----------
+    url : str
+        The repository url in any syntax supported by git.
+
+    hosts : Mapping[str, str]
+        New host names, optionally with a port, keyed by lowercase old ones.
+
+    Returns
+    -------
+    str
+        The url with its host replaced, or the url itself if its host is not
+        listed or it points to a local repository.
+    """
+    if (new_host := hosts.get(get_host(url))) is None:
+        return url
+
+    if "://" in url:
+        parts = urllib.parse.urlsplit(url)
+        user, at, _ = parts.netloc.rpartition("@")
+
+        return urllib.parse.urlunsplit(parts._replace(netloc=user + at + new_host))
+
+    match = typing.cast(re.Match[str], _SCP_LIKE_URL.match(url))
+    user = "" if match.group("user") is None else match.group("user") + "@"
+
+    return f"{user!s}{new_host!s}:{match.group('path')!s}"
+
+
+def canonicalize(url: str) -> str:
+    """Returns one spelling shared by every url of a repository.
+
+    The scheme, user information, port and the ``.git`` suffix are dropped
+    and the host name is lowercased, so that ssh and https urls of the same
+    repository match.
+
+    Parameters
+    ----------
+    url : str
+        The repository url in any syntax supported by git.
+
+    Returns
+    -------
+    str
+        The host name followed by the normalized path, such as
+        ``github.com/python/cpython``, or only the path for local repositories.
+    """
+    if "://" in url:
+        host, path = get_host(url), urllib.parse.urlsplit(url).path
+    elif match := _SCP_LIKE_URL.match(url):
+        host, path = match.group("host").lower(), match.group("path")
+    else:
+        host, path = "", url
+
+    path = posixpath.normpath("/" + path.strip("/")).removesuffix(".git")
+
+    return host + path.rstrip("/")
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import threading
+import typing
+
+from easy_mirrors import config, exceptions
+
+logger = logging.getLogger("easy_mirrors")
+
+__all__ = ["ConfigWatcher"]
+
+# Events reported when a file is written in place or replaced by a rename.
+_IN_CLOSE_WRITE: typing.Final[int] = 0x00000008
+_IN_MOVED_TO: typing.Final[int] = 0x00000080
+_IN_CREATE: typing.Final[int] = 0x00000100
+_IN_NONBLOCK: typing.Final[int] = 0x00000800
+_IN_CLOEXEC: typing.Final[int] = 0x00080000
+
+_EVENT: typing.Final[struct.Struct] = struct.Struct("iIII")
+
+# Editors write a file in several steps, so events are merged for this long.
+_SETTLE_DELAY: typing.Final[float] = 0.5
+
+
+def _get_signature(path: str) -> tuple[int, int, int] | None:
+    """Returns what changes whenever a file is modified or replaced."""
+    try:
+        status = os.stat(path)
+    except OSError:
+        return None
+
+    return status.st_ino, status.st_size, status.st_mtime_ns
+
+
+class _Inotify:
+    """Minimal binding to the inotify interface of the Linux kernel."""
+
+    def __init__(self, directory: str) -> None:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+
+        self.fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+        if libc.inotify_add_watch(self.fd, os.fsencode(directory), mask) < 0:
+            os.close(self.fd)
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed")
+
+    def read(self, timeout: float) -> set[str]:
+        """Waits for events and returns names of the changed files."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        names: set[str] = set()
+        offset = 0
+        while offset + _EVENT.size <= len(data):
+            _, _, _, length = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            names.add(os.fsdecode(data[offset : offset + length].rstrip(b"\0")))
+            offset += length
+
+        return names
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class ConfigWatcher:
+    """Reloads the configuration in a background thread when its file changes.
+
+    The directory holding the file is watched with inotify where available,
+    which also catches editors replacing the file by a rename. Elsewhere, the
+    file is polled for changes of its size, modification time and inode.
+    Parsing happens in the background thread, so a large configuration never
+    delays running syncs. A configuration that fails to load is reported and
+    ignored until the file changes again.
+
+    Parameters
+    ----------
+    path : str
+        The local path to the configuration file.
+
+    load : Callable[[], Config]
+        The function loading the configuration from the file.
+
+    interval : float, default=5.0
+        The number of seconds between two checks of the file when polling.
+
+    on_change : Callable[[], None], optional
+        The function called from the background thread whenever a new
+        configuration has been loaded.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        load: typing.Callable[[], config.Config],
+        interval: float = 5.0,
+        on_change: typing.Callable[[], None] | None = None,
+    ) -> None:
+        self.path = os.path.abspath(path)
+        self.load = load
+        self.interval = interval
+        self.on_change = on_change
+
+        self.changed = threading.Event()
+
+        self._lock = threading.Lock()
+        self._configuration: config.Config | None = None
+        self._signature = _get_signature(self.path)
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return f"{self.__class__.__name__!s}(path={self.path!r})"
+
+    def start(self) -> None:
+        """Starts watching the configuration file in a daemon thread."""
+        # The watch is set up first, so no change after this call is missed.
+        try:
+            inotify: _Inotify | None = _Inotify(os.path.dirname(self.path))
+        except (AttributeError, OSError, TypeError):
+            logger.debug("Inotify is not available, polling the configuration.")
+            inotify = None
+
+        self._thread = threading.Thread(
+            target=self._run, args=(inotify,), name="easy_mirrors-config", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops watching the configuration file."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def wait(self, timeout: float) -> bool:
+        """Sleeps until the timeout elapses or a new configuration is loaded.
+
+        Returns
+        -------
+        bool
+            True if a new configuration is available, otherwise false.
+        """
+        return self.changed.wait(timeout)
+
+    def get_configuration(self) -> config.Config | None:
+        """Takes the configuration loaded since the last call, if any."""
+        with self._lock:
+            configuration, self._configuration = self._configuration, None
+            self.changed.clear()
+
+        return configuration
+
+    def check(self) -> bool:
+        """Loads the configuration if its file has changed since the last check.
+
+        Returns
+        -------
+        bool
+            True if a new configuration has been loaded, otherwise false.
+        """
+        if (signature := _get_signature(self.path)) in {None, self._signature}:
+            return False
+
+        self._signature = signature
+        try:
+            configuration = self.load()
+        except (exceptions.ConfigError, exceptions.FileSystemError):
+            logger.error("Keeping the previous configuration.")
+
+            return False
+
+        logger.info("Configuration reloaded from: %r", self.path)
+        with self._lock:
+            self._configuration = configuration
+            self.changed.set()
+
+        if self.on_change is not None:
+            self.on_change()
+
+        return True
+
+    def _run(self, inotify: _Inotify | None) -> None:
+        try:
+            while not self._stopped.is_set():
+                if inotify is None:
+                    self._stopped.wait(self.interval)
+                elif os.path.basename(self.path) in inotify.read(self.interval):
+                    self._stopped.wait(_SETTLE_DELAY)
+                    inotify.read(0)  # drop events of the same write
+
+                # The file is also checked when no event arrives, which covers
+                # configurations linked from other directories.
+                self.check()
+        finally:
+            if inotify is not None:
+                inotify.close()
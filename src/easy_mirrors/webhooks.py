@@ -0,0 +1,334 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+from __future__ import annotations
+
+import email.message
+import hashlib
+import hmac
+import http.server
+import json
+import logging
+import os
+import threading
+import time
+import typing
+
+from easy_mirrors import exceptions, urls
+
+if typing.TYPE_CHECKING:
+    from easy_mirrors import config, daemon
+
+logger = logging.getLogger("easy_mirrors")
+
+__all__ = [
+    "SECRET_VARIABLE",
+    "Coalescer",
+    "WebhookServer",
+    "get_repository_urls",
+    "start_server",
+]
+
+# The shared secret is read from the environment, so it never appears in the
+# configuration written to logs.
+SECRET_VARIABLE: typing.Final[str] = "EASY_MIRRORS_WEBHOOK_SECRET"
+
+# Events changing refs; deliveries without an event header are accepted too.
+_EVENTS: typing.Final[frozenset[str]] = frozenset(
+    {"create", "delete", "push", "push hook", "tag push hook"}
+)
+
+_MAX_PAYLOAD_SIZE: typing.Final[int] = 25 * 1024 * 1024
+
+# Keys of the repository urls in payloads of GitHub and GitLab; other keys, such
+# as html_url or homepage, point to web pages of the repository.
+_URL_KEYS: typing.Final[tuple[str, ...]] = (
+    "clone_url",
+    "ssh_url",
+    "git_url",
+    "git_http_url",
+    "git_ssh_url",
+    "url",
+)
+
+
+def get_repository_urls(payload: typing.Any) -> set[str]:
+    """Returns every url of the pushed repository found in a webhook payload.
+
+    GitHub describes the repository in ``repository`` and GitLab additionally
+    in ``project``, each with several urls for different protocols. Only keys
+    known to hold clone urls are read.
+    """
+    found: set[str] = set()
+    if not isinstance(payload, dict):
+        return found
+
+    for key in ("repository", "project"):
+        if isinstance(section := payload.get(key), dict):
+            found.update(
+                value
+                for name in _URL_KEYS
+                if isinstance(value := section.get(name), str) and value
+            )
+
+    return found
+
+
+class Coalescer:
+    """Merges bursts of events for one repository into a single sync request.
+
+    The first event of a repository starts a delay, and events arriving for it
+    until the delay elapses are absorbed. The sync is requested from a daemon
+    thread once the delay elapses and starts right away, so a repository lags
+    a push little more than the delay.
+
+    Parameters
+    ----------
+    request_sync : Callable[[list[str]], Any]
+        The function requesting syncs of repositories.
+
+    delay : float
+        The number of seconds events are collected before a sync is requested.
+    """
+
+    def __init__(
+        self, request_sync: typing.Callable[[list[str]], typing.Any], delay: float
+    ) -> None:
+        self.request_sync = request_sync
+        self.delay = delay
+
+        self._condition = threading.Condition()
+        self._pending: dict[str, float] = {}
+        self._thread: threading.Thread | None = None
+
+    def __repr__(self) -> str:
+        """Returns string representation of an instance for debugging."""
+
+        return f"{self.__class__.__name__!s}(delay={self.delay!r})"
+
+    def add(self, url: str, now: float | None = None) -> bool:
+        """Schedules a sync request for a repository.
+
+        Returns
+        -------
+        bool
+            True if a new request has been scheduled, or false if the event has
+            been merged into a pending one.
+        """
+        now = time.monotonic() if now is None else now
+
+        with self._condition:
+            if url in self._pending:
+                return False
+
+            self._pending[url] = now + self.delay
+            self._condition.notify()
+
+        return True
+
+    def flush(self, now: float | None = None) -> list[str]:
+        """Requests syncs of repositories whose delay has elapsed."""
+        now = time.monotonic() if now is None else now
+
+        with self._condition:
+            due = [url for url, deadline in self._pending.items() if deadline <= now]
+            for url in due:
+                del self._pending[url]
+
+        if due:
+            self.request_sync(due)
+
+        return due
+
+    def start(self) -> None:
+        """Starts requesting syncs from a daemon thread."""
+        self._thread = threading.Thread(
+            target=self._run, name="easy_mirrors-webhooks", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+
+                timeout = min(self._pending.values()) - time.monotonic()
+                if timeout > 0:
+                    self._condition.wait(timeout)
+
+            self.flush()
+
+
+class _WebhookHandler(http.server.BaseHTTPRequestHandler):
+    server: WebhookServer
+
+    def do_POST(self) -> None:  # noqa: N802
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            length = -1
+
+        if not 0 <= length <= _MAX_PAYLOAD_SIZE:
+            self._respond(411, {"error": "A payload of a known size is required."})
+            return
+
+        body = self.rfile.read(length)
+        if not self.server.verify(body, self.headers):
+            logger.warning("Rejected a webhook with an invalid signature.")
+            self._respond(403, {"error": "Invalid signature."})
+            return
+
+        event = self.headers.get("X-GitHub-Event") or self.headers.get(
+            "X-Gitlab-Event", ""
+        )
+        if event and event.lower() not in _EVENTS:
+            self._respond(200, {"ignored": event})
+            return
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._respond(400, {"error": "The payload is not valid JSON."})
+            return
+
+        if (url := self.server.match(get_repository_urls(payload))) is None:
+            logger.debug("Webhook for a repository that is not configured.")
+            self._respond(404, {"error": "The repository is not configured."})
+            return
+
+        self.server.coalescer.add(url)
+        self._respond(202, {"repository": url})
+
+    def _respond(self, code: int, content: dict[str, typing.Any]) -> None:
+        body = json.dumps(content).encode("utf-8")
+
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: typing.Any) -> None:  # noqa: A002
+        logger.debug(format, *args)
+
+
+class WebhookServer(http.server.ThreadingHTTPServer):
+    """Http endpoint turning push webhooks into sync requests of a daemon.
+
+    Payloads of GitHub and GitLab push events are matched against configured
+    repositories by their canonical urls. When a secret is set, deliveries
+    must carry either a GitHub HMAC signature of the payload or the GitLab
+    token equal to the secret.
+
+    Parameters
+    ----------
+    server_address : tuple[str, int]
+        The local address and port to listen on.
+
+    mirror_daemon : Daemon
+        The daemon syncing the repositories.
+
+    delay : float
+        The number of seconds events for one repository are coalesced.
+
+    secret : str, optional
+        The secret shared with the git hosts.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        server_address: tuple[str, int],
+        mirror_daemon: daemon.Daemon,
+        delay: float,
+        secret: str | None = None,
+    ) -> None:
+        super().__init__(server_address, _WebhookHandler)
+        self.mirror_daemon = mirror_daemon
+        self.secret = secret
+        self.coalescer = Coalescer(mirror_daemon.request_sync, delay)
+
+        # Canonical urls of the configured repositories, built once for every
+        # configuration applied by the daemon.
+        self._lock = threading.Lock()
+        self._canonical: tuple[config.Config, dict[str, str]] | None = None
+
+    def _get_canonical(self) -> dict[str, str]:
+        configuration = self.mirror_daemon.configuration
+
+        with self._lock:
+            if self._canonical is None or self._canonical[0] is not configuration:
+                self._canonical = configuration, {
+                    urls.canonicalize(url): url for url in configuration.repositories
+                }
+
+            return self._canonical[1]
+
+    def match(self, candidates: typing.Iterable[str]) -> str | None:
+        """Returns the configured url of a repository spelled in any way."""
+        canonical = self._get_canonical()
+
+        for candidate in sorted(candidates):
+            if (url := canonical.get(urls.canonicalize(candidate))) is not None:
+                return url
+
+        return None
+
+    def verify(self, body: bytes, headers: email.message.Message) -> bool:
+        """Determines whether a delivery comes from a host knowing the secret."""
+        if not self.secret:
+            return True
+
+        # Headers are compared as bytes, since they may hold any character.
+        if (signature := headers.get("X-Hub-Signature-256")) is not None:
+            digest = hmac.new(self.secret.encode("utf-8"), body, hashlib.sha256)
+
+            return hmac.compare_digest(
+                signature.encode("utf-8"), f"sha256={digest.hexdigest()!s}".encode()
+            )
+
+        return hmac.compare_digest(
+            headers.get("X-Gitlab-Token", "").encode("utf-8"),
+            self.secret.encode("utf-8"),
+        )
+
+
+def start_server(
+    port: int,
+    mirror_daemon: daemon.Daemon,
+    delay: float,
+    address: str = "127.0.0.1",
+) -> WebhookServer:
+    """Receives webhooks over http from a background thread.
+
+    Raises
+    ------
+    FileSystemError
+        Raised when the server socket can not be bound.
+    """
+    try:
+        server = WebhookServer(
+            (address, port),
+            mirror_daemon,
+            delay,
+            secret=os.environ.get(SECRET_VARIABLE),
+        )
+    except OSError as err:
+        logger.error("Unable to start the webhook server.")
+        raise exceptions.FileSystemError(
+            f"Unable to listen for webhooks on port: {port:d}"
+        ) from err
+
+    if not server.secret:
+        logger.warning("Webhooks are accepted without a secret.")
+
+    server.coalescer.start()
+    threading.Thread(
+        target=server.serve_forever, name="easy_mirrors-webhook-server", daemon=True
+    ).start()
+
+    return server
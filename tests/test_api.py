@@ -3,12 +3,17 @@
 # Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
 # Created date: 2025-07-12
 
+import asyncio
+import collections
 import logging
 import os
+import subprocess
+import threading
+import time
 
 import pytest
 
-from easy_mirrors import api
+from easy_mirrors import api, config, exceptions, git_repository, limits
 
 
 @pytest.fixture
@@ -18,6 +23,16 @@ def config_mock(mocker):
     config.repositories = [
         "1.git",
     ]
+    config.jobs = 1
+    config.host_jobs = None
+    config.host_rate = None
+    config.retries = 0
+    config.retry_delay = 0
+    config.shared_objects = False
+    config.get_fork_family.return_value = None
+    config.partial_clone_filters = {}
+    config.get_ref_filter.return_value = None
+    config.get_operation_limiter.return_value = limits.OperationLimiter({})
 
     return config
 
@@ -31,7 +46,18 @@ def repository_mock(mocker):
 
 
 @pytest.fixture
-def git_repository_mock(mocker):
+def inventory_mock(mocker):
+    inventory = mocker.patch("easy_mirrors.api.inventory.Inventory")
+    inventory.return_value.exists_locally.side_effect = (
+        lambda repository: repository.exists_locally()
+    )
+    inventory.return_value.paths = []
+
+    return inventory
+
+
+@pytest.fixture
+def git_repository_mock(mocker, inventory_mock):
     return mocker.patch("easy_mirrors.api.git_repository.GitRepository")
 
 
@@ -40,6 +66,7 @@ def test_existing_remote_and_local_repository(
 ):
     repository_mock.exists_locally.return_value = True
     repository_mock.exists_on_remote.return_value = True
+    repository_mock.is_up_to_date.return_value = False
 
     git_repository_mock.from_url.return_value = repository_mock
 
@@ -54,6 +81,24 @@ def test_existing_remote_and_local_repository(
         repository_mock.update_local_copy.assert_called_once()
 
 
+def test_existing_remote_and_local_repository_up_to_date(
+    caplog, config_mock, repository_mock, git_repository_mock
+):
+    repository_mock.exists_locally.return_value = True
+    repository_mock.exists_on_remote.return_value = True
+    repository_mock.is_up_to_date.return_value = True
+
+    git_repository_mock.from_url.return_value = repository_mock
+
+    with caplog.at_level(logging.INFO):
+        api.make_mirrors(config_mock)
+
+    assert "The local mirror is up to date, skipping fetch." in caplog.text
+
+    repository_mock.create_local_copy.assert_not_called()
+    repository_mock.update_local_copy.assert_not_called()
+
+
 def test_existing_remote_not_local(
     fs, config_mock, repository_mock, git_repository_mock
 ):
@@ -100,6 +145,581 @@ def test_remote_repository_does_not_exist(
 
     assert "The remote repository does not exist:" in caplog.text
 
-    repository_mock.exists_locally.assert_not_called()
+    repository_mock.is_up_to_date.assert_not_called()
+    repository_mock.create_local_copy.assert_not_called()
+    repository_mock.update_local_copy.assert_not_called()
+
+
+def test_failed_repository_does_not_cancel_others(
+    caplog, config_mock, repository_mock, git_repository_mock
+):
+    config_mock.repositories = ["1.git", "2.git", "3.git"]
+    config_mock.jobs = 2
+
+    repository_mock.exists_locally.return_value = True
+    repository_mock.exists_on_remote.return_value = True
+    repository_mock.is_up_to_date.return_value = False
+    repository_mock.update_local_copy.side_effect = [
+        exceptions.ExternalProcessError("error"),
+        None,
+        None,
+    ]
+
+    git_repository_mock.from_url.return_value = repository_mock
+
+    with caplog.at_level(logging.ERROR):
+        statuses = api.make_mirrors(config_mock)
+
+    assert "Unable to mirror repository:" in caplog.text
+
+    assert sorted(statuses.values()) == ["failed", "fetched", "fetched"]
+    assert repository_mock.update_local_copy.call_count == 3
+
+
+def test_failed_repository_is_retried(
+    caplog, config_mock, repository_mock, git_repository_mock
+):
+    config_mock.repositories = ["1.git", "2.git"]
+    config_mock.retries = 2
+
+    repository_mock.exists_locally.return_value = True
+    repository_mock.exists_on_remote.return_value = True
+    repository_mock.is_up_to_date.return_value = False
+    repository_mock.update_local_copy.side_effect = [
+        exceptions.ExternalProcessError("error"),
+        None,
+        None,
+    ]
+
+    git_repository_mock.from_url.return_value = repository_mock
+
+    with caplog.at_level(logging.WARNING):
+        statuses = api.make_mirrors(config_mock)
+
+    assert "Retrying repository '1.git'" in caplog.text
+
+    assert statuses == {"1.git": "fetched", "2.git": "fetched"}
+    assert repository_mock.update_local_copy.call_count == 3
+
+
+def test_make_mirrors_async(config_mock, repository_mock, git_repository_mock, mocker):
+    repository_mock.exists_locally.return_value = True
+    repository_mock.exists_on_remote_async = mocker.AsyncMock(return_value=True)
+    repository_mock.is_up_to_date.return_value = False
+    repository_mock.update_local_copy_async = mocker.AsyncMock()
+
+    git_repository_mock.from_url.return_value = repository_mock
+
+    asyncio.run(api.make_mirrors_async(config_mock))
+
+    repository_mock.update_local_copy_async.assert_awaited_once()
+    repository_mock.create_local_copy.assert_not_called()
+
+
+def test_make_mirrors_with_timeout(
+    config_mock, repository_mock, git_repository_mock, mocker
+):
+    state_store = mocker.Mock()
+
+    repository_mock.exists_locally.return_value = True
+    repository_mock.exists_on_remote.side_effect = exceptions.ProcessTimeoutError(
+        "timeout"
+    )
+    git_repository_mock.from_url.return_value = repository_mock
+
+    assert api.make_mirrors(config_mock, state_store=state_store) == {
+        "1.git": "timeout"
+    }
+    assert state_store.record.call_args.args[1] == "timeout"
+
+
+def test_make_mirrors_async_with_timeout(
+    config_mock, repository_mock, git_repository_mock, mocker
+):
+    repository_mock.exists_on_remote_async = mocker.AsyncMock(
+        side_effect=exceptions.ProcessTimeoutError("timeout")
+    )
+    git_repository_mock.from_url.return_value = repository_mock
+
+    assert asyncio.run(api.make_mirrors_async(config_mock)) == {"1.git": "timeout"}
+
+
+def test_make_mirrors_async_with_error(
+    config_mock, repository_mock, git_repository_mock, mocker
+):
+    config_mock.repositories = ["1.git", "2.git"]
+    config_mock.retries = 1
+
+    repository_mock.exists_locally.return_value = True
+    repository_mock.exists_on_remote_async = mocker.AsyncMock(return_value=True)
+    repository_mock.is_up_to_date.return_value = False
+    repository_mock.update_local_copy_async = mocker.AsyncMock(
+        side_effect=exceptions.ExternalProcessError("error")
+    )
+
+    git_repository_mock.from_url.return_value = repository_mock
+
+    statuses = asyncio.run(api.make_mirrors_async(config_mock))
+
+    assert statuses == {"1.git": "failed", "2.git": "failed"}
+    assert repository_mock.update_local_copy_async.await_count == 4
+
+
+def test_make_mirrors_with_file_system_error(config_mock, git_repository_mock, mocker):
+    config_mock.repositories = ["1.git", "2.git"]
+    config_mock.retries = 1
+
+    def mirror_repository(configuration, url, mirrors, transfer):
+        if url == "1.git":
+            raise exceptions.FileSystemError("Unable to create the mirror")
+
+        return "fetched", None
+
+    mirror_mock = mocker.patch(
+        "easy_mirrors.api._mirror_repository", side_effect=mirror_repository
+    )
+    mocker.patch(
+        "easy_mirrors.api._mirror_repository_async", side_effect=mirror_repository
+    )
+    expected = {"1.git": "failed", "2.git": "fetched"}
+
+    # A repository that can not be written fails alone and is retried.
+    assert api.make_mirrors(config_mock) == expected
+    assert mirror_mock.call_count == 3
+    assert asyncio.run(api.make_mirrors_async(config_mock)) == expected
+
+
+def test_make_mirrors_records_state(
+    config_mock, repository_mock, git_repository_mock, mocker
+):
+    state_store = mocker.Mock()
+
+    repository_mock.exists_locally.return_value = True
+    repository_mock.exists_on_remote.return_value = True
+    repository_mock.is_up_to_date.return_value = False
+    repository_mock.remote_fingerprint = "fingerprint"
+
+    git_repository_mock.from_url.return_value = repository_mock
+
+    api.make_mirrors(config_mock, state_store=state_store)
+
+    state_store.record.assert_called_once_with(
+        "1.git",
+        "fetched",
+        mocker.ANY,
+        mocker.ANY,
+        fingerprint="fingerprint",
+        error=None,
+        transfer=git_repository_mock.from_url.call_args.kwargs["transfer"],
+    )
+
+
+def test_make_mirrors_per_host_limit(
+    config_mock, repository_mock, git_repository_mock, mocker
+):
+    config_mock.repositories = [
+        "https://a.com/1.git",
+        "https://a.com/2.git",
+        "https://b.com/3.git",
+    ]
+    config_mock.jobs = 3
+    config_mock.host_jobs = 1
+
+    running = collections.Counter()
+    maximum = collections.Counter()
+
+    def mirror_repository(configuration, url, mirrors, transfer):
+        host = url.split("/")[2]
+        running[host] += 1
+        maximum[host] = max(maximum[host], running[host])
+        time.sleep(0.05)
+        running[host] -= 1
+
+        return "fetched", None
+
+    mocker.patch("easy_mirrors.api._mirror_repository", side_effect=mirror_repository)
+
+    statuses = api.make_mirrors(config_mock)
+
+    assert statuses == dict.fromkeys(config_mock.repositories, "fetched")
+    assert maximum == {"a.com": 1, "b.com": 1}
+
+
+def test_make_mirrors_operation_limit(config_mock, git_repository_mock, mocker):
+    config_mock.repositories = ["1.git", "2.git", "3.git"]
+    config_mock.jobs = 2
+    config_mock.get_operation_limiter.return_value = limits.OperationLimiter(
+        {"clone": 1}
+    )
+    mocker.patch(
+        "easy_mirrors.api._get_operation",
+        side_effect=lambda configuration, url, mirrors: (
+            "fetch" if url == "3.git" else "clone"
+        ),
+    )
+
+    started = []
+
+    def mirror_repository(configuration, url, mirrors, transfer):
+        started.append(url)
+        time.sleep(0.05)
+
+        return ("fetched" if url == "3.git" else "cloned"), None
+
+    mocker.patch("easy_mirrors.api._mirror_repository", side_effect=mirror_repository)
+
+    statuses = api.make_mirrors(config_mock)
+
+    assert statuses == {"1.git": "cloned", "2.git": "cloned", "3.git": "fetched"}
+    # The second clone waits for the cap without taking the worker of the fetch.
+    assert started == ["1.git", "3.git", "2.git"]
+
+
+def test_make_mirrors_shared_dispatcher(config_mock, git_repository_mock, mocker):
+    dispatcher = api.Dispatcher(config_mock)  # a single job
+    running, maximum = 0, 0
+    lock = threading.Lock()
+
+    def mirror_repository(configuration, url, mirrors, transfer):
+        nonlocal running, maximum
+
+        with lock:
+            running += 1
+            maximum = max(maximum, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+
+        return "fetched", None
+
+    mocker.patch("easy_mirrors.api._mirror_repository", side_effect=mirror_repository)
+
+    # Syncs started by two threads share the limits of one dispatcher.
+    threads = [
+        threading.Thread(
+            target=api.make_mirrors,
+            args=(config_mock,),
+            kwargs={"repositories": [url], "dispatcher": dispatcher},
+        )
+        for url in ("1.git", "2.git")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    dispatcher.close()
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert maximum == 1
+
+
+def test_make_mirrors_async_operation_limit(config_mock, git_repository_mock, mocker):
+    config_mock.repositories = [
+        "https://a.com/1.git",
+        "https://a.com/2.git",
+        "https://b.com/3.git",
+    ]
+    config_mock.jobs = 3
+    config_mock.host_jobs = 1
+    config_mock.get_operation_limiter.return_value = limits.OperationLimiter(
+        {"clone": 2}
+    )
+    mocker.patch("easy_mirrors.api._get_operation", return_value="clone")
+
+    events = []
+
+    async def mirror_repository(configuration, url, mirrors, transfer):
+        events.append(("started", url))
+        await asyncio.sleep(0.05)
+        events.append(("finished", url))
+
+        return "cloned", None
+
+    mocker.patch(
+        "easy_mirrors.api._mirror_repository_async", side_effect=mirror_repository
+    )
+
+    statuses = asyncio.run(api.make_mirrors_async(config_mock))
+
+    assert statuses == dict.fromkeys(config_mock.repositories, "cloned")
+    # The clone waiting for the saturated host holds no slot of the idle one.
+    assert events.index(("started", "https://b.com/3.git")) < events.index(
+        ("finished", "https://a.com/1.git")
+    )
+
+
+def test_make_mirrors_shares_objects_of_forks(tmp_path):
+    def git(*arguments, cwd):
+        subprocess.check_call(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@localhost"]
+            + list(arguments),
+            cwd=cwd,
+        )
+
+    upstream, fork = tmp_path / "upstream", tmp_path / "fork"
+    upstream.mkdir()
+
+    git("init", "--quiet", cwd=upstream)
+    git("commit", "--allow-empty", "--quiet", "--message=initial", cwd=upstream)
+    git("clone", "--quiet", str(upstream), str(fork), cwd=tmp_path)
+    git("commit", "--allow-empty", "--quiet", "--message=feature", cwd=fork)
+
+    configuration = config.Config(
+        path=str(tmp_path / "mirrors"),
+        repositories=[upstream.as_uri(), fork.as_uri()],
+        retries=0,
+        shared_objects=True,
+    )
+    os.makedirs(configuration.path)
+
+    statuses = api.make_mirrors(configuration)
+
+    assert set(statuses.values()) == {"cloned"}
+
+    pools = [
+        git_repository.ObjectPool.from_member(
+            os.path.join(configuration.path, f"{name!s}.git")
+        )
+        for name in ("fork", "upstream")
+    ]
+    assert pools[0] is not None
+    assert pools[0].path == pools[1].path
+
+
+@pytest.mark.parametrize(
+    "exists_on_remote, exists_locally, is_up_to_date, action",
+    [
+        (False, False, False, "missing"),
+        (True, False, False, "clone"),
+        (True, True, False, "fetch"),
+        (True, True, True, "unchanged"),
+    ],
+)
+def test_plan_mirrors(
+    fs,
+    config_mock,
+    repository_mock,
+    git_repository_mock,
+    exists_on_remote,
+    exists_locally,
+    is_up_to_date,
+    action,
+):
+    repository_mock.exists_on_remote.return_value = exists_on_remote
+    repository_mock.exists_locally.return_value = exists_locally
+    repository_mock.is_up_to_date.return_value = is_up_to_date
+
+    git_repository_mock.from_url.return_value = repository_mock
+
+    assert api.plan_mirrors(config_mock) == {"1.git": action}
+
+    repository_mock.apply_ref_filter.assert_not_called()
     repository_mock.create_local_copy.assert_not_called()
     repository_mock.update_local_copy.assert_not_called()
+
+
+def test_plan_mirrors_non_mirror_directory(
+    fs, config_mock, repository_mock, git_repository_mock
+):
+    os.mkdir(repository_mock.local_path)
+    repository_mock.exists_on_remote.return_value = True
+    repository_mock.exists_locally.return_value = False
+
+    git_repository_mock.from_url.return_value = repository_mock
+
+    assert api.plan_mirrors(config_mock) == {"1.git": "skip"}
+
+
+def test_plan_mirrors_timeout(config_mock, repository_mock, git_repository_mock):
+    repository_mock.exists_on_remote.side_effect = exceptions.ProcessTimeoutError(
+        "error"
+    )
+    git_repository_mock.from_url.return_value = repository_mock
+
+    assert api.plan_mirrors(config_mock) == {"1.git": "timeout"}
+
+
+def test_plan_mirrors_changes_nothing(tmp_path):
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+
+    def commit():
+        subprocess.check_call(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@localhost"]
+            + ["commit", "--allow-empty", "--quiet", "--message=change"],
+            cwd=upstream,
+        )
+
+    subprocess.check_call(["git", "init", "--quiet"], cwd=upstream)
+    commit()
+
+    configuration = config.Config(
+        path=str(tmp_path / "mirrors"), repositories=[upstream.as_uri()], retries=0
+    )
+    os.makedirs(configuration.path)
+
+    assert api.plan_mirrors(configuration) == {upstream.as_uri(): "clone"}
+    assert os.listdir(configuration.path) == []
+
+    api.make_mirrors(configuration)
+    assert api.plan_mirrors(configuration) == {upstream.as_uri(): "unchanged"}
+
+    commit()
+    assert api.plan_mirrors(configuration) == {upstream.as_uri(): "fetch"}
+    assert api.make_mirrors(configuration) == {upstream.as_uri(): "fetched"}
+
+    # A flat mirror is planned as if it had been moved to the new layout.
+    configuration.layout = "host"
+    assert api.plan_mirrors(configuration) == {upstream.as_uri(): "unchanged"}
+    assert os.listdir(configuration.path) == ["upstream.git"]
+
+
+def test_restore_mirrors_rewrites_hosts(mocker, config_mock, git_repository_mock):
+    config_mock.repositories = ["git@github.com:python/cpython.git"]
+
+    mirror = git_repository_mock.from_url.return_value
+    mirror.get_partial_clone_filter.return_value = None
+
+    target = git_repository_mock.return_value
+    target.exists_on_remote.return_value = True
+    target.is_up_to_date.return_value = False
+
+    statuses = api.restore_mirrors(config_mock, hosts={"github.com": "git.local"})
+
+    assert statuses == {"git@github.com:python/cpython.git": "pushed"}
+    git_repository_mock.assert_called_once_with(
+        local_path=mirror.local_path,
+        url="git@git.local:python/cpython.git",
+        ref_filter=None,
+        timeouts=config_mock.get_timeouts.return_value,
+    )
+    target.push_local_copy.assert_called_once_with()
+
+
+def test_restore_mirrors_without_local_mirror(config_mock, git_repository_mock):
+    git_repository_mock.from_url.return_value.exists_locally.return_value = False
+
+    assert api.restore_mirrors(config_mock) == {"1.git": "missing"}
+    git_repository_mock.return_value.push_local_copy.assert_not_called()
+
+
+def test_restore_mirrors_after_data_loss(tmp_path):
+    def git(*arguments, cwd):
+        return subprocess.check_output(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@localhost"]
+            + list(arguments),
+            cwd=cwd,
+            text=True,
+        )
+
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+
+    git("init", "--quiet", cwd=upstream)
+    git("commit", "--allow-empty", "--quiet", "--message=initial", cwd=upstream)
+    git("tag", "v1.0.0", cwd=upstream)
+
+    configuration = config.Config(
+        path=str(tmp_path / "mirrors"), repositories=[upstream.as_uri()], retries=0
+    )
+    os.makedirs(configuration.path)
+
+    assert api.make_mirrors(configuration) == {upstream.as_uri(): "cloned"}
+
+    # The upstream is recreated empty and filled from the mirror.
+    subprocess.check_call(["rm", "-rf", str(upstream)])
+    git("init", "--quiet", "--bare", str(upstream), cwd=tmp_path)
+
+    assert api.restore_mirrors(configuration) == {upstream.as_uri(): "pushed"}
+
+    mirror = git_repository.GitRepository.from_url(
+        parent_path=configuration.path, url=upstream.as_uri()
+    )
+    assert (
+        mirror.get_local_refs()
+        == git_repository.GitRepository(
+            local_path=str(upstream), url=upstream.as_uri()
+        ).get_local_refs()
+    )
+
+    # A repeated restore resumes without pushing again.
+    assert api.restore_mirrors(configuration) == {upstream.as_uri(): "unchanged"}
+
+
+def test_restore_mirrors_with_ref_filter(tmp_path):
+    def git(*arguments, cwd):
+        return subprocess.check_output(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@localhost"]
+            + list(arguments),
+            cwd=cwd,
+            text=True,
+        )
+
+    work = tmp_path / "work"
+    work.mkdir()
+
+    git("init", "--quiet", cwd=work)
+    git("commit", "--allow-empty", "--quiet", "--message=initial", cwd=work)
+    git("update-ref", "refs/pull/1/head", "HEAD", cwd=work)
+
+    upstream = tmp_path / "upstream.git"
+    git("clone", "--quiet", "--mirror", str(work), str(upstream), cwd=tmp_path)
+
+    configuration = config.Config(
+        path=str(tmp_path / "mirrors"),
+        repositories=[upstream.as_uri()],
+        ref_filters={upstream.as_uri(): {"exclude": ["refs/pull/*"]}},
+        retries=0,
+    )
+    os.makedirs(configuration.path)
+
+    assert api.make_mirrors(configuration) == {upstream.as_uri(): "cloned"}
+
+    # Only the mirrored refs are compared with the target.
+    assert api.restore_mirrors(configuration) == {upstream.as_uri(): "unchanged"}
+
+    # A lost branch is pushed again, and the excluded refs are kept.
+    git("update-ref", "-d", "refs/heads/master", cwd=upstream)
+    assert api.restore_mirrors(configuration) == {upstream.as_uri(): "pushed"}
+
+    refs = git("for-each-ref", "--format=%(refname)", cwd=upstream).split()
+    assert sorted(refs) == ["refs/heads/master", "refs/pull/1/head"]
+
+
+def test_migrate_mirrors(tmp_path):
+    upstream = tmp_path / "upstream"
+    upstream.mkdir()
+
+    for arguments in (
+        ["init", "--quiet"],
+        ["commit", "--allow-empty", "--quiet", "--message=initial"],
+    ):
+        subprocess.check_call(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@localhost"]
+            + arguments,
+            cwd=upstream,
+        )
+
+    configuration = config.Config(
+        path=str(tmp_path / "mirrors"), repositories=[upstream.as_uri()], retries=0
+    )
+    os.makedirs(configuration.path)
+    assert api.make_mirrors(configuration) == {upstream.as_uri(): "cloned"}
+
+    # The mirror was created from another spelling of the same url.
+    configuration.repositories = [str(upstream) + ".git"]
+    configuration.layout = "host"
+
+    moved = api.migrate_mirrors(configuration)
+
+    new_path = git_repository.get_local_path(
+        configuration.path, configuration.repositories[0], "host"
+    )
+    assert moved == {configuration.repositories[0]: new_path}
+    assert not os.path.exists(os.path.join(configuration.path, "upstream.git"))
+    assert git_repository.GitRepository(
+        local_path=new_path, url=configuration.repositories[0]
+    ).exists_locally()
+
+    assert api.migrate_mirrors(configuration) == {}
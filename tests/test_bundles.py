@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import datetime
+import os
+import subprocess
+
+import pytest
+
+from easy_mirrors import bundles, config, exceptions, git_repository
+
+
+def _git(path, *arguments):
+    return subprocess.check_output(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@localhost"]
+        + list(arguments),
+        cwd=path,
+        text=True,
+    ).strip()
+
+
+@pytest.fixture
+def upstream_path(tmp_path):
+    path = tmp_path / "upstream"
+    path.mkdir()
+
+    _git(path, "init", "--quiet")
+    _git(path, "commit", "--allow-empty", "--quiet", "--message=initial")
+
+    return path
+
+
+@pytest.fixture
+def configuration(tmp_path, upstream_path):
+    return config.Config(
+        path=str(tmp_path / "mirrors"),
+        repositories=[upstream_path.as_uri()],
+        bundle_path=str(tmp_path / "bundles"),
+    )
+
+
+@pytest.fixture
+def repository(configuration):
+    repository = git_repository.GitRepository.from_url(
+        parent_path=configuration.path, url=configuration.repositories[0]
+    )
+    repository.create_local_copy()
+
+    return repository
+
+
+@pytest.fixture
+def directory(configuration):
+    return bundles.get_bundle_directory(configuration, configuration.repositories[0])
+
+
+def test_get_bundle_directory(configuration, directory):
+    assert directory == os.path.join(configuration.bundle_path, "upstream.git")
+
+
+def test_export_bundle_chain(tmp_path, upstream_path, repository, directory):
+    full = bundles.export_bundle(repository, directory, full_interval=3600, now=0)
+
+    assert full.kind == "full"
+    assert full.prerequisites == []
+    # Nothing changed since the previous export.
+    assert bundles.export_bundle(repository, directory, 3600, now=10) is None
+
+    _git(upstream_path, "commit", "--allow-empty", "--quiet", "--message=next")
+    repository.update_local_copy()
+
+    incremental = bundles.export_bundle(repository, directory, 3600, now=20)
+
+    assert incremental.kind == "incremental"
+    assert incremental.prerequisites == sorted(set(full.refs.values()))
+
+    manifest = bundles.Manifest.load(directory)
+    assert manifest.head == "refs/heads/" + _git(upstream_path, "branch", "--show")
+    assert [bundle.name for bundle in manifest.bundles] == [
+        "000001-full.bundle",
+        "000002-incremental.bundle",
+    ]
+
+    # Applying the chain in order restores the mirror.
+    restored = tmp_path / "restored.git"
+    _git(tmp_path, "init", "--quiet", "--bare", str(restored))
+    for bundle in manifest.bundles:
+        _git(
+            restored,
+            "fetch",
+            "--quiet",
+            os.path.join(directory, bundle.name),
+            "+refs/*:refs/*",
+        )
+
+    assert git_repository.get_object_names(str(restored)) == set(
+        manifest.bundles[-1].refs.values()
+    )
+
+
+def test_export_bundle_records_refs_without_new_objects(
+    upstream_path, repository, directory
+):
+    bundles.export_bundle(repository, directory, full_interval=3600, now=0)
+
+    _git(upstream_path, "branch", "feature")
+    repository.update_local_copy()
+
+    bundle = bundles.export_bundle(repository, directory, 3600, now=10)
+
+    assert bundle.kind == "incremental"
+    assert bundle.name is None  # the branch points to an exported commit
+    assert "refs/heads/feature" in bundle.refs
+
+
+def test_export_bundle_starts_new_chain(upstream_path, repository, directory):
+    bundles.export_bundle(repository, directory, full_interval=3600, now=0)
+
+    _git(upstream_path, "commit", "--allow-empty", "--quiet", "--message=next")
+    repository.update_local_copy()
+
+    bundle = bundles.export_bundle(repository, directory, 3600, now=7200)
+
+    assert bundle.kind == "full"
+    assert sorted(os.listdir(directory)) == ["000002-full.bundle", "manifest.json"]
+    assert len(bundles.Manifest.load(directory).bundles) == 1
+
+
+def test_export_bundle_interrupted(mocker, upstream_path, repository, directory):
+    bundles.export_bundle(repository, directory, full_interval=3600, now=0)
+
+    _git(upstream_path, "commit", "--allow-empty", "--quiet", "--message=next")
+    repository.update_local_copy()
+
+    def create_bundle(path, refs, prerequisites):
+        with open(path, "wb") as stream_out:
+            stream_out.write(b"# v2 git bundle\n")  # truncated by a crash
+
+        raise exceptions.ExternalProcessError("interrupted")
+
+    mocker.patch.object(repository, "create_bundle", side_effect=create_bundle)
+
+    with pytest.raises(exceptions.ExternalProcessError):
+        bundles.export_bundle(repository, directory, 3600, now=10)
+
+    # The truncated file never gets the name of a bundle.
+    assert "000002-incremental.bundle" not in os.listdir(directory)
+    assert len(bundles.Manifest.load(directory).bundles) == 1
+
+    mocker.stopall()
+    bundles.export_bundle(repository, directory, 3600, now=7200)
+
+    assert sorted(os.listdir(directory)) == ["000002-full.bundle", "manifest.json"]
+
+
+def test_export_bundle_after_history_rewrite(upstream_path, repository, directory):
+    bundles.export_bundle(repository, directory, full_interval=3600, now=0)
+
+    _git(
+        upstream_path, "commit", "--amend", "--allow-empty", "--quiet", "--message=new"
+    )
+    repository.update_local_copy()
+    subprocess.check_call(
+        ["git", "gc", "--quiet", "--prune=now"], cwd=repository.local_path
+    )
+
+    # The previous refs are gone, so the bundle can not depend on them.
+    assert bundles.export_bundle(repository, directory, 3600, now=10).kind == "full"
+
+
+def test_manifest_load_malformed(tmp_path):
+    (tmp_path / bundles.MANIFEST_NAME).write_text("{", encoding="utf-8")
+
+    with pytest.raises(exceptions.FileSystemError):
+        bundles.Manifest.load(str(tmp_path))
+
+
+def test_export_bundles(configuration, repository):
+    now = datetime.datetime.now()
+
+    assert bundles.export_bundles(configuration, now=now) == {repository.url: "full"}
+    assert bundles.export_bundles(configuration, now=now) == {}
+
+
+def test_export_bundles_disabled(configuration, repository):
+    configuration.bundle_path = None
+
+    assert bundles.export_bundles(configuration) == {}
@@ -45,7 +45,42 @@ def configuration_path(fs, path, repositories):
 
 @pytest.fixture
 def expected_configuration(path, repositories):
-    return {"path": os.path.expanduser(path), "repositories": repositories}
+    return {
+        "path": os.path.expanduser(path),
+        "repositories": repositories,
+        "layout": "flat",
+        "jobs": 1,
+        "min_period": None,
+        "max_period": None,
+        "host_jobs": None,
+        "host_rate": None,
+        "retries": 2,
+        "retry_delay": 10,
+        "metrics_port": None,
+        "metrics_path": None,
+        "shared_objects": False,
+        "fork_families": {},
+        "maintenance_budget": 300,
+        "maintenance_window": None,
+        "partial_clone_filters": {},
+        "backfill": [],
+        "ref_filters": {},
+        "bundle_path": None,
+        "bundle_full_interval": 7,
+        "control_socket": None,
+        "webhook_port": None,
+        "webhook_delay": 5,
+        "ls_remote_timeout": 300,
+        "fetch_timeout": 7200,
+        "clone_timeout": 43200,
+        "low_speed_limit": None,
+        "low_speed_time": 60,
+        "clone_jobs": None,
+        "fetch_jobs": None,
+        "nice": 0,
+        "ionice": "default",
+        "git_config": {},
+    }
 
 
 def test_config_initialization(expected_configuration, path, repositories):
@@ -131,3 +166,229 @@ def test_validation_during_load_settings(configuration_path):
         config.Config.load(configuration_path)
 
     assert str(error.value) == "File does not match expected schema."
+
+
+def test_config_load_jobs(configuration_path, path, repositories):
+    with io.open(configuration_path, mode="at", encoding="utf-8") as stream_out:
+        stream_out.write("    jobs = 8\n")
+
+    configuration = config.Config.load(configuration_path)
+
+    assert configuration.jobs == 8
+
+
+@pytest.mark.parametrize("jobs", ["0", "-1", "many"])
+def test_config_load_invalid_jobs(configuration_path, jobs):
+    with io.open(configuration_path, mode="at", encoding="utf-8") as stream_out:
+        stream_out.write("    jobs = {0!s}\n".format(jobs))
+
+    with pytest.raises(exceptions.ConfigError):
+        config.Config.load(configuration_path)
+
+
+def test_config_load_periods(configuration_path):
+    with io.open(configuration_path, mode="at", encoding="utf-8") as stream_out:
+        stream_out.write("    min_period = 10\n    max_period = 600\n")
+
+    configuration = config.Config.load(configuration_path)
+
+    assert configuration.min_period == 10
+    assert configuration.max_period == 600
+
+
+def test_config_invalid_periods(path, repositories):
+    with pytest.raises(exceptions.ConfigError) as error:
+        config.Config(
+            path=path, repositories=repositories, min_period=60, max_period=10
+        )
+
+    message = "Option 'min_period' can not be greater than 'max_period'."
+    assert message == str(error.value)
+
+
+def test_config_load_fork_families(configuration_path, repositories):
+    with io.open(configuration_path, mode="at", encoding="utf-8") as stream_out:
+        stream_out.write("    shared_objects = yes\n")
+        stream_out.write("[fork_families]\n    project = 1.git 2.git\n")
+
+    configuration = config.Config.load(configuration_path)
+
+    assert configuration.shared_objects is True
+    assert configuration.fork_families == {"project": ["1.git", "2.git"]}
+    assert configuration.get_fork_family("1.git") == "project"
+    assert configuration.get_fork_family("3.git") is None
+
+
+@pytest.mark.parametrize(
+    "fork_families",
+    [
+        {"project": ["4.git"]},  # not configured
+        {"project": ["1.git"], "other": ["1.git"]},
+        {"../project": ["1.git"]},
+    ],
+)
+def test_config_invalid_fork_families(path, repositories, fork_families):
+    with pytest.raises(exceptions.ConfigError):
+        config.Config(path=path, repositories=repositories, fork_families=fork_families)
+
+
+def test_config_load_partial_clone_filters(configuration_path):
+    with io.open(configuration_path, mode="at", encoding="utf-8") as stream_out:
+        stream_out.write(
+            "[partial_clone:binaries]\n"
+            "    filter = blob:limit=1m\n"
+            "    repositories = 1.git 2.git\n"
+            "    backfill = yes\n"
+            "[partial_clone]\n"
+            "    filter = blob:none\n"
+            "    repositories = 3.git\n"
+        )
+
+    configuration = config.Config.load(configuration_path)
+
+    assert configuration.partial_clone_filters == {
+        "1.git": "blob:limit=1m",
+        "2.git": "blob:limit=1m",
+        "3.git": "blob:none",
+    }
+    assert configuration.backfill == ["1.git", "2.git"]
+
+
+@pytest.mark.parametrize(
+    "partial_clone_filters, backfill",
+    [
+        ({"1.git": "blob:some"}, None),
+        ({"4.git": "blob:none"}, None),  # not configured
+        ({"1.git": "blob:none"}, ["2.git"]),  # backfill without a filter
+    ],
+)
+def test_config_invalid_partial_clone_filters(
+    path, repositories, partial_clone_filters, backfill
+):
+    with pytest.raises(exceptions.ConfigError):
+        config.Config(
+            path=path,
+            repositories=repositories,
+            partial_clone_filters=partial_clone_filters,
+            backfill=backfill,
+        )
+
+
+def test_config_load_ref_filters(configuration_path):
+    with io.open(configuration_path, mode="at", encoding="utf-8") as stream_out:
+        stream_out.write(
+            "[refs:hosted]\n"
+            "    repositories = 1.git 2.git\n"
+            "    include = refs/heads/* refs/tags/*\n"
+            "    exclude = refs/heads/dependabot/*\n"
+            "    negotiation = skipping\n"
+        )
+
+    configuration = config.Config.load(configuration_path)
+
+    assert configuration.ref_filters["1.git"] == {
+        "include": ["refs/heads/*", "refs/tags/*"],
+        "exclude": ["refs/heads/dependabot/*"],
+        "negotiation": "skipping",
+    }
+    assert configuration.get_ref_filter("2.git").get_refspecs() == [
+        "+refs/heads/*:refs/heads/*",
+        "+refs/tags/*:refs/tags/*",
+        "^refs/heads/dependabot/*",
+    ]
+    assert configuration.get_ref_filter("3.git") is None
+
+
+def test_config_ref_filter_of_unknown_repository(path, repositories):
+    with pytest.raises(exceptions.ConfigError):
+        config.Config(
+            path=path,
+            repositories=repositories,
+            ref_filters={"4.git": {"exclude": ["refs/pull/*"]}},
+        )
+
+
+def test_config_layout_deduplicates_repositories(path):
+    configuration = config.Config(
+        path=path,
+        repositories=[
+            "https://github.com/python/cpython.git",
+            "git@github.com:python/cpython.git",
+            "https://github.com/python/mypy",
+        ],
+        layout="host",
+    )
+
+    assert configuration.repositories == [
+        "git@github.com:python/cpython.git",
+        "https://github.com/python/mypy",
+    ]
+
+
+def test_config_invalid_layout(path, repositories):
+    with pytest.raises(exceptions.ConfigError):
+        config.Config(path=path, repositories=repositories, layout="tree")
+
+
+def test_config_get_timeouts(path, repositories):
+    configuration = config.Config(
+        path=path, repositories=repositories, fetch_timeout=0, low_speed_limit=1000
+    )
+    timeouts = configuration.get_timeouts()
+
+    assert timeouts.ls_remote == 300
+    assert timeouts.fetch is None
+    assert timeouts.clone == 43200
+    assert timeouts.get_config_options() == (
+        "-c http.lowSpeedLimit=1000 -c http.lowSpeedTime=60"
+    )
+
+
+def test_config_load_resources(configuration_path):
+    with io.open(configuration_path, mode="at", encoding="utf-8") as stream_out:
+        stream_out.write(
+            "    clone_jobs = 1\n"
+            "    nice = 10\n"
+            "    ionice = idle\n"
+            "[git:clone]\n"
+            "    pack.threads = 2\n"
+            "    pack.windowMemory = 256m\n"
+        )
+
+    configuration = config.Config.load(configuration_path)
+
+    assert configuration.get_operation_limiter().max_jobs == {"clone": 1}
+    assert configuration.git_config == {
+        "clone": {"pack.threads": "2", "pack.windowmemory": "256m"}
+    }
+    assert configuration.get_resources().to_dict() == {
+        "nice": 10,
+        "ionice": "idle",
+        "git_config": configuration.git_config,
+    }
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"nice": 20}, {"ionice": "realtime"}, {"git_config": {"": {"a.b": "c"}}}],
+)
+def test_config_invalid_resources(path, repositories, options):
+    with pytest.raises(exceptions.ConfigError):
+        config.Config(path=path, repositories=repositories, **options)
+
+
+@pytest.mark.parametrize(
+    "options, periods",
+    [
+        ({}, (1440, 1440)),
+        ({"min_period": 5}, (5, 1440)),
+        ({"min_period": 2000}, (2000, 2000)),
+        ({"max_period": 60}, (60, 60)),
+        ({"max_period": 2000}, (1440, 2000)),
+        ({"min_period": 5, "max_period": 60}, (5, 60)),
+    ],
+)
+def test_config_get_periods(path, repositories, options, periods):
+    configuration = config.Config(path=path, repositories=repositories, **options)
+
+    assert configuration.get_periods(1440) == periods
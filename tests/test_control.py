@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import os
+import socket
+import stat
+
+import pytest
+
+from easy_mirrors import control, exceptions
+
+
+@pytest.fixture
+def daemon_mock(mocker):
+    mirror_daemon = mocker.Mock()
+    mirror_daemon.request_sync.return_value = (["1.git"], [])
+    mirror_daemon.get_status.return_value = {"paused": False, "in_flight": ["1.git"]}
+
+    return mirror_daemon
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    return str(tmp_path / "control.sock")
+
+
+@pytest.fixture
+def control_server(socket_path, daemon_mock):
+    server = control.start_server(socket_path, daemon_mock)
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_control_server_commands(control_server, socket_path, daemon_mock):
+    assert stat.S_IMODE(os.stat(socket_path).st_mode) == 0o600
+
+    assert control.send_command(socket_path, "sync", repositories=["1.git"]) == {
+        "ok": True,
+        "requested": ["1.git"],
+        "unknown": [],
+    }
+    daemon_mock.request_sync.assert_called_once_with(["1.git"])
+
+    assert control.send_command(socket_path, "status") == {
+        "ok": True,
+        "paused": False,
+        "in_flight": ["1.git"],
+    }
+
+    assert control.send_command(socket_path, "pause") == {"ok": True, "paused": True}
+    daemon_mock.pause.assert_called_once_with()
+
+    assert control.send_command(socket_path, "resume") == {"ok": True, "paused": False}
+    daemon_mock.resume.assert_called_once_with()
+
+
+def test_control_server_rejects_invalid_requests(control_server, socket_path):
+    assert control.send_command(socket_path, "sync")["ok"] is False
+    assert control.send_command(socket_path, "reboot") == {
+        "ok": False,
+        "error": "Unknown command: 'reboot'",
+    }
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socket_path)
+        connection.sendall(b"[]\n")
+
+        assert b'"ok": false' in connection.makefile("rb").readline()
+
+
+def test_control_server_removes_its_socket(socket_path, daemon_mock):
+    server = control.start_server(socket_path, daemon_mock)
+    server.shutdown()
+    server.server_close()
+
+    assert not os.path.exists(socket_path)
+
+    with pytest.raises(exceptions.FileSystemError):
+        control.send_command(socket_path, "status")
+
+
+def test_control_server_replaces_stale_socket(socket_path, daemon_mock):
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(socket_path)
+    stale.close()  # the file is left behind
+
+    server = control.start_server(socket_path, daemon_mock)
+    try:
+        assert control.send_command(socket_path, "status")["ok"] is True
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_control_server_already_running(control_server, socket_path, daemon_mock):
+    with pytest.raises(exceptions.FileSystemError):
+        control.start_server(socket_path, daemon_mock)
+
+    assert control.send_command(socket_path, "status")["ok"] is True
+
+
+def test_control_server_path_too_long(tmp_path, daemon_mock):
+    with pytest.raises(exceptions.FileSystemError):
+        control.start_server(str(tmp_path / ("a" * 120 + ".sock")), daemon_mock)
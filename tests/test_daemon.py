@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import pytest
+
+from easy_mirrors import daemon
+
+# Limits of the concurrency of syncs, which build the dispatcher of the daemon.
+LIMITS = {
+    "jobs": 2,
+    "host_jobs": None,
+    "host_rate": None,
+    "clone_jobs": None,
+    "fetch_jobs": None,
+}
+
+
+@pytest.fixture
+def config_mock(mocker):
+    config = mocker.Mock(**LIMITS)
+    config.path = "/root/"
+    config.metrics_path = None
+    config.maintenance_budget = 0
+    config.bundle_path = None
+    config.layout = "flat"
+    config.repositories = ["1.git", "2.git"]
+
+    return config
+
+
+@pytest.fixture
+def state_store_mock(mocker):
+    state_store = mocker.Mock()
+    state_store.get_all.return_value = {}
+
+    return state_store
+
+
+@pytest.fixture
+def make_mirrors_mock(mocker):
+    return mocker.patch("easy_mirrors.daemon.api.make_mirrors")
+
+
+@pytest.fixture
+def set_resources_mock(mocker):
+    return mocker.patch("easy_mirrors.daemon.git_repository.set_resources")
+
+
+def test_daemon_run_once(config_mock, state_store_mock, make_mirrors_mock):
+    make_mirrors_mock.return_value = {"1.git": "fetched", "2.git": "unchanged"}
+
+    mirror_daemon = daemon.Daemon(
+        config_mock, state_store_mock, min_interval=60, max_interval=3600
+    )
+
+    delay = mirror_daemon.run_once()
+
+    make_mirrors_mock.assert_called_once_with(
+        config_mock,
+        state_store=state_store_mock,
+        repositories=["1.git", "2.git"],
+        mirrors=mirror_daemon.inventory,
+        dispatcher=mirror_daemon.dispatcher,
+    )
+    assert 0 < delay <= 60
+
+    # Nothing is due until the earliest repository interval elapses.
+    mirror_daemon.run_once()
+
+    make_mirrors_mock.assert_called_once()
+
+
+def test_daemon_exports_bundles_of_synced_repositories(
+    mocker, config_mock, state_store_mock, make_mirrors_mock
+):
+    export_bundles_mock = mocker.patch("easy_mirrors.bundles.export_bundles")
+    make_mirrors_mock.return_value = {"1.git": "fetched", "2.git": "failed"}
+
+    daemon.Daemon(
+        config_mock, state_store_mock, min_interval=60, max_interval=3600
+    ).run_once()
+
+    export_bundles_mock.assert_called_once_with(config_mock, repositories=["1.git"])
+
+
+def test_daemon_maintains_synced_repositories(
+    mocker, config_mock, state_store_mock, make_mirrors_mock
+):
+    run_maintenance_mock = mocker.patch("easy_mirrors.maintenance.run_maintenance")
+    make_mirrors_mock.return_value = {"1.git": "unchanged", "2.git": "failed"}
+
+    daemon.Daemon(
+        config_mock, state_store_mock, min_interval=60, max_interval=3600
+    ).run_once()
+
+    run_maintenance_mock.assert_called_once_with(config_mock, repositories=["1.git"])
+
+
+def test_daemon_reload(mocker, config_mock, state_store_mock, set_resources_mock):
+    mirror_daemon = daemon.Daemon(
+        config_mock, state_store_mock, min_interval=60, max_interval=3600
+    )
+
+    new_config = mocker.Mock(**LIMITS)
+    new_config.path = config_mock.path
+    new_config.repositories = ["2.git", "3.git"]
+    new_config.layout = "flat"
+    mirrors, dispatcher = mirror_daemon.inventory, mirror_daemon.dispatcher
+
+    assert mirror_daemon.reload(new_config) == (["3.git"], ["1.git"])
+    assert mirror_daemon.configuration is new_config
+    assert mirror_daemon.inventory is mirrors
+    assert "1.git" not in mirror_daemon.scheduler
+    assert mirror_daemon.scheduler.pop_due() == ["2.git", "3.git"]
+    set_resources_mock.assert_called_once_with(new_config.get_resources.return_value)
+    # The limits are unchanged, so running syncs keep sharing the dispatcher.
+    assert mirror_daemon.dispatcher is dispatcher
+
+    newer_config = mocker.Mock(**{**LIMITS, "jobs": 4})
+    newer_config.path = new_config.path
+    newer_config.repositories = new_config.repositories
+    newer_config.layout = new_config.layout
+    mirror_daemon.reload(newer_config)
+
+    assert mirror_daemon.dispatcher is not dispatcher
+    assert mirror_daemon.dispatcher.jobs == 4
+
+
+def test_daemon_reload_bounds(
+    caplog, mocker, config_mock, state_store_mock, set_resources_mock
+):
+    config_mock.webhook_port = None
+    mirror_daemon = daemon.Daemon(
+        config_mock, state_store_mock, min_interval=60, max_interval=3600, period=60
+    )
+
+    new_config = mocker.Mock(**LIMITS)
+    new_config.path = config_mock.path
+    new_config.repositories = config_mock.repositories
+    new_config.layout = config_mock.layout
+    new_config.get_periods.return_value = (5, 30)
+    new_config.webhook_port = 8080
+
+    mirror_daemon.reload(new_config)
+
+    new_config.get_periods.assert_called_once_with(60)
+    assert mirror_daemon.scheduler.min_interval == 300
+    assert mirror_daemon.scheduler.max_interval == 1800
+    assert "webhook_port" in caplog.text
+
+
+def test_daemon_reload_migrates_layout(
+    mocker, config_mock, state_store_mock, set_resources_mock
+):
+    migrate_mirrors_mock = mocker.patch("easy_mirrors.api.migrate_mirrors")
+    mirror_daemon = daemon.Daemon(
+        config_mock, state_store_mock, min_interval=60, max_interval=3600
+    )
+
+    new_config = mocker.Mock(**LIMITS)
+    new_config.path = config_mock.path
+    new_config.repositories = config_mock.repositories
+    new_config.layout = "host"
+    mirrors = mirror_daemon.inventory
+
+    assert mirror_daemon.reload(new_config) == ([], [])
+    assert mirror_daemon.inventory is not mirrors
+    migrate_mirrors_mock.assert_called_once_with(new_config)
+
+
+def test_daemon_request_sync(config_mock, state_store_mock, make_mirrors_mock):
+    config_mock.repositories = ["https://github.com/vpunko/a.git", "2.git"]
+    make_mirrors_mock.return_value = {"https://github.com/vpunko/a.git": "fetched"}
+
+    mirror_daemon = daemon.Daemon(
+        config_mock, state_store_mock, min_interval=60, max_interval=3600
+    )
+    mirror_daemon.scheduler.pop_due()  # nothing is due anymore
+
+    assert mirror_daemon.request_sync(["git@github.com:vpunko/a", "3.git"]) == (
+        ["https://github.com/vpunko/a.git"],
+        ["3.git"],
+    )
+    assert mirror_daemon.get_status()["requested"] == [
+        "https://github.com/vpunko/a.git"
+    ]
+
+    assert mirror_daemon.run_requested() == {
+        "https://github.com/vpunko/a.git": "fetched"
+    }
+
+    make_mirrors_mock.assert_called_once_with(
+        config_mock,
+        state_store=state_store_mock,
+        repositories=["https://github.com/vpunko/a.git"],
+        mirrors=mirror_daemon.inventory,
+        dispatcher=mirror_daemon.dispatcher,
+    )
+    assert mirror_daemon.get_status()["requested"] == []
+
+
+def test_daemon_request_sync_during_cycle(
+    config_mock, state_store_mock, make_mirrors_mock
+):
+    mirror_daemon = daemon.Daemon(
+        config_mock, state_store_mock, min_interval=60, max_interval=3600
+    )
+
+    def make_mirrors(configuration, repositories, **kwargs):
+        # Both repositories are requested while the cycle syncs them.
+        if mirror_daemon.get_status()["in_flight"] == ["1.git", "2.git"]:
+            mirror_daemon.request_sync(["2.git"])
+            assert mirror_daemon.run_requested() == {}
+
+        return dict.fromkeys(repositories, "unchanged")
+
+    make_mirrors_mock.side_effect = make_mirrors
+    mirror_daemon.run_once()
+
+    # The request held back by the cycle runs once the cycle finishes.
+    assert mirror_daemon.run_requested() == {"2.git": "unchanged"}
+
+
+def test_daemon_pause(config_mock, state_store_mock, make_mirrors_mock):
+    make_mirrors_mock.return_value = {"2.git": "fetched"}
+
+    mirror_daemon = daemon.Daemon(
+        config_mock, state_store_mock, min_interval=60, max_interval=3600
+    )
+    mirror_daemon.pause()
+    mirror_daemon.request_sync(["2.git"])
+
+    # Only requested repositories are synced while paused.
+    assert mirror_daemon.run_once() == 3600
+    make_mirrors_mock.assert_not_called()
+
+    mirror_daemon.run_requested()
+    make_mirrors_mock.assert_called_once_with(
+        config_mock,
+        state_store=state_store_mock,
+        repositories=["2.git"],
+        mirrors=mirror_daemon.inventory,
+        dispatcher=mirror_daemon.dispatcher,
+    )
+
+    status = mirror_daemon.get_status()
+    assert status["paused"] is True
+    assert status["in_flight"] == []
+    assert [item["url"] for item in status["queued"]] == ["1.git", "2.git"]
+    assert status["total"] == 2
+
+    mirror_daemon.resume()
+    mirror_daemon.run_once()
+
+    assert make_mirrors_mock.call_args.kwargs["repositories"] == ["1.git"]
+
+
+def test_daemon_request_sync_during_maintenance(
+    mocker, config_mock, state_store_mock, make_mirrors_mock
+):
+    mirror_daemon = daemon.Daemon(
+        config_mock, state_store_mock, min_interval=60, max_interval=3600
+    )
+    make_mirrors_mock.side_effect = lambda configuration, repositories, **kwargs: (
+        dict.fromkeys(repositories, "fetched")
+    )
+
+    def run_maintenance(configuration, repositories):
+        # A mirror being maintained by the cycle is not fetched at once.
+        mirror_daemon.request_sync(["1.git"])
+        assert mirror_daemon.run_requested() == {}
+
+    mocker.patch(
+        "easy_mirrors.maintenance.run_maintenance", side_effect=run_maintenance
+    )
+    mirror_daemon.run_once()
+
+    make_mirrors_mock.assert_called_once()
+    assert mirror_daemon.get_status()["requested"] == ["1.git"]
@@ -15,6 +15,7 @@ def configuration():
     class Config:
         path = fields.PathField()
         sequence = fields.SequenceField()
+        number = fields.IntegerField(minimum=1, maximum=10)
 
     return Config()
 
@@ -32,6 +33,36 @@ def test_validation_error_path_field(configuration, path):
         configuration.path = path
 
 
+def test_optional_path_field():
+    class Config:
+        path = fields.PathField(optional=True)
+
+    configuration = Config()
+    configuration.path = None
+
+    assert configuration.path is None
+
+
+@pytest.mark.parametrize("window", ("01:00-05:00", "22:30 - 04:00"))
+def test_time_window_field(window):
+    class Config:
+        window = fields.TimeWindowField()
+
+    configuration = Config()
+    configuration.window = window
+
+    assert configuration.window == window.replace(" ", "")
+
+
+@pytest.mark.parametrize("window", ("", "1:00-5:00", "01:00", "24:00-01:00", None))
+def test_validation_error_time_window_field(window):
+    class Config:
+        window = fields.TimeWindowField()
+
+    with pytest.raises(exceptions.ConfigError):
+        Config().window = window
+
+
 def test_list_field(configuration):
     sequence = ["1", "1", "2", "2", "3", "3"]
     configuration.sequence = sequence
@@ -43,3 +74,35 @@ def test_list_field(configuration):
 def test_validation_error_sequence_field(sequence, configuration):
     with pytest.raises(exceptions.ConfigError):
         configuration.sequence = sequence
+
+
+def test_integer_field(configuration):
+    configuration.number = 5
+
+    assert configuration.number == 5
+
+
+@pytest.mark.parametrize("number", (0, 11, "1", 1.0, True, None))
+def test_validation_error_integer_field(configuration, number):
+    with pytest.raises(exceptions.ConfigError):
+        configuration.number = number
+
+
+@pytest.mark.parametrize("value, expected", [("flat", "flat"), (" Hash ", "hash")])
+def test_choice_field(value, expected):
+    class Config:
+        layout = fields.ChoiceField(("flat", "hash"))
+
+    configuration = Config()
+    configuration.layout = value
+
+    assert configuration.layout == expected
+
+
+@pytest.mark.parametrize("value", ("", "tree", None))
+def test_validation_error_choice_field(value):
+    class Config:
+        layout = fields.ChoiceField(("flat", "hash"))
+
+    with pytest.raises(exceptions.ConfigError):
+        Config().layout = value
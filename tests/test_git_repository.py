@@ -3,15 +3,20 @@
 # Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
 # Created date: 2025-07-12
 
+import asyncio
 import io
 import json
 import logging
 import os
+import shlex
 import shutil
+import subprocess
+import threading
+import time
 
 import pytest
 
-from easy_mirrors import exceptions, git_repository
+from easy_mirrors import exceptions, git_repository, limits, refspecs, transfers
 
 GIT_CONFIG_TEMPLATE = """
 [remote "origin"]
@@ -51,6 +56,25 @@ def git_directory(fs, local_path, url):
         stream_out.write(GIT_CONFIG_TEMPLATE.format(url))
 
 
+@pytest.fixture
+def upstream_url(tmp_path):
+    path = tmp_path / "upstream"
+    path.mkdir()
+
+    for cmd in (
+        "git init --quiet",
+        "git commit --allow-empty --quiet --message=initial",
+        "git tag --annotate --message=release v1.0.0",
+    ):
+        subprocess.check_call(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@localhost"]
+            + shlex.split(cmd)[1:],
+            cwd=path,
+        )
+
+    return path.as_uri()
+
+
 @pytest.fixture
 def run_git_command_mock(mocker):
     return mocker.patch("easy_mirrors.git_repository._run_git_command")
@@ -95,7 +119,11 @@ def test_repository_create_local_copy(
     repository.create_local_copy()
 
     run_git_command_mock.assert_called_once_with(
-        "git clone --mirror --no-hardlinks -- {0!r} {1!r}".format(url, str(local_path))
+        "git clone --mirror --no-hardlinks --progress -- {0!r} {1!r}".format(
+            url, str(local_path)
+        ),
+        timeout=None,
+        transfer=repository.transfer,
     )
 
 
@@ -103,7 +131,10 @@ def test_repository_update_local_copy(run_git_command_mock, repository, local_pa
     repository.update_local_copy()
 
     run_git_command_mock.assert_called_once_with(
-        "git fetch --all --prune --verbose", cwd=local_path
+        "git fetch --all --prune --progress --verbose",
+        cwd=local_path,
+        timeout=None,
+        transfer=repository.transfer,
     )
 
 
@@ -136,23 +167,32 @@ def test_repository_not_exists_locally(repository, local_path):
 
 
 def test_repository_exists_on_remote(run_git_command_mock, repository, url):
+    run_git_command_mock.return_value = ""
+
     repository.exists_on_remote()
 
     run_git_command_mock.assert_called_once_with(
-        "git ls-remote --exit-code -- {0!r}".format(url), silent=True
+        "git ls-remote --exit-code -- {0!r}".format(url),
+        capture=True,
+        silent=True,
+        timeout=None,
     )
 
 
-def test_repository_not_exists_on_remote(local_path):
+def test_repository_not_exists_on_remote(tmp_path):
     repository = git_repository.GitRepository(
-        local_path=local_path, url="https://google.com"
+        local_path=str(tmp_path), url="https://google.com"
     )
 
     assert not repository.exists_on_remote()
+    assert repository.remote_fingerprint is None
 
 
-def test_repository_update_local_copy_with_error(caplog, repository, local_path):
-    shutil.rmtree(local_path)
+def test_repository_update_local_copy_with_error(caplog, tmp_path, url):
+    # The real file system is required to capture the output of git processes.
+    repository = git_repository.GitRepository(
+        local_path=str(tmp_path / "root"), url=url
+    )
 
     with caplog.at_level(logging.ERROR):
         with pytest.raises(exceptions.ExternalProcessError) as error:
@@ -161,5 +201,430 @@ def test_repository_update_local_copy_with_error(caplog, repository, local_path)
     message = "An error occurred on while attempting to execute the command."
     assert message in caplog.text
 
-    message = "Failed to execute the command: 'git fetch --all --prune --verbose'"
+    message = (
+        "Failed to execute the command: 'git fetch --all --prune --progress --verbose'"
+    )
     assert message == str(error.value)
+
+
+def test_run_git_command_forwards_output(caplog):
+    with caplog.at_level(logging.INFO):
+        git_repository._run_git_command("git --version")
+
+    assert "git version" in caplog.text
+
+
+def test_run_git_command_async_forwards_output(caplog):
+    with caplog.at_level(logging.INFO):
+        asyncio.run(git_repository._run_git_command_async("git --version"))
+
+    assert "git version" in caplog.text
+
+
+def test_run_git_command_async_progress_meters(caplog):
+    # Progress meters joined by carriage returns exceed the limit of readline.
+    cmd = (
+        'git -c \'alias.meter=!yes "Receiving objects:  50% (1/2)" '
+        '| head -n 10000 | tr "\\n" "\\r"\' meter'
+    )
+    transfer = transfers.Transfer()
+
+    with caplog.at_level(logging.INFO):
+        asyncio.run(git_repository._run_git_command_async(cmd, transfer=transfer))
+
+    assert transfer.objects == 1
+    assert not [
+        item for item in caplog.records if item.getMessage().startswith("Receiving")
+    ]
+
+
+def test_run_git_command_reports_completion(caplog):
+    with caplog.at_level(logging.INFO, logger="easy_mirrors"):
+        with pytest.raises(exceptions.ExternalProcessError):
+            git_repository._run_git_command("git unknown-command", silent=True)
+
+    (record,) = [item for item in caplog.records if hasattr(item, "exit_code")]
+
+    assert record.operation == "unknown-command"
+    assert record.exit_code == 1
+    assert record.duration_ms >= 0
+
+
+def test_run_git_command_with_resources(mocker):
+    mocker.patch.object(
+        git_repository,
+        "_resources",
+        limits.Resources(git_config={"config": {"easy.mirrors": "yes"}}),
+    )
+    cmd = "git config --get easy.mirrors"
+    output = asyncio.run(git_repository._run_git_command_async(cmd, capture=True))
+
+    assert git_repository._run_git_command(cmd, capture=True).strip() == "yes"
+    assert output.strip() == "yes"
+
+
+def test_run_git_command_async_with_error(caplog):
+    with caplog.at_level(logging.ERROR):
+        with pytest.raises(exceptions.ExternalProcessError):
+            asyncio.run(git_repository._run_git_command_async("git unknown-command"))
+
+    message = "An error occurred on while attempting to execute the command."
+    assert message in caplog.text
+
+
+def test_run_git_command_async_cancellation():
+    async def run():
+        await asyncio.wait_for(
+            git_repository._run_git_command_async(
+                "git -c 'alias.slow=!sleep 30' slow", silent=True
+            ),
+            timeout=0.5,
+        )
+
+    started_at = time.monotonic()
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(run())
+
+    assert time.monotonic() - started_at < 10
+
+
+def test_run_git_command_timeout(caplog):
+    started_at = time.monotonic()
+
+    # The background child keeps the output pipe open unless it is killed too.
+    with caplog.at_level(logging.ERROR):
+        with pytest.raises(exceptions.ProcessTimeoutError):
+            git_repository._run_git_command(
+                "git -c 'alias.slow=!sleep 30 & sleep 30' slow", timeout=0.5
+            )
+
+    assert time.monotonic() - started_at < 10
+    assert "The command was killed after 0.5 second(s)." in caplog.text
+
+
+def test_run_git_command_async_timeout():
+    started_at = time.monotonic()
+
+    with pytest.raises(exceptions.ProcessTimeoutError):
+        asyncio.run(
+            git_repository._run_git_command_async(
+                "git -c 'alias.slow=!sleep 30 & sleep 30' slow", timeout=0.5
+            )
+        )
+
+    assert time.monotonic() - started_at < 10
+
+
+def test_repository_exists_on_remote_timeout(run_git_command_mock, repository):
+    run_git_command_mock.side_effect = exceptions.ProcessTimeoutError
+
+    # A remote that does not answer in time is not reported as missing.
+    with pytest.raises(exceptions.ProcessTimeoutError):
+        repository.exists_on_remote()
+
+
+def test_repository_with_timeouts(run_git_command_mock, local_path, url):
+    repository = git_repository.GitRepository(
+        local_path=local_path,
+        url=url,
+        timeouts=limits.Timeouts(fetch=60, low_speed_limit=1000, low_speed_time=30),
+    )
+    repository.update_local_copy()
+
+    run_git_command_mock.assert_called_once_with(
+        "git -c http.lowSpeedLimit=1000 -c http.lowSpeedTime=30 "
+        "fetch --all --prune --progress --verbose",
+        cwd=local_path,
+        timeout=60,
+        transfer=repository.transfer,
+    )
+
+
+def test_parse_refs():
+    output = (
+        "1111111111111111111111111111111111111111\tHEAD\n"
+        "1111111111111111111111111111111111111111\trefs/heads/master\n"
+        "2222222222222222222222222222222222222222\trefs/tags/v1.0.0\n"
+        "1111111111111111111111111111111111111111\trefs/tags/v1.0.0^{}\n"
+    )
+
+    assert git_repository._parse_refs(output) == {
+        "refs/heads/master": "1111111111111111111111111111111111111111",
+        "refs/tags/v1.0.0": "2222222222222222222222222222222222222222",
+    }
+
+
+def test_read_local_refs(git_directory, local_path):
+    with io.open(
+        os.path.join(local_path, "packed-refs"), mode="wt", encoding="utf-8"
+    ) as stream_out:
+        stream_out.write(
+            "# pack-refs with: peeled fully-peeled sorted\n"
+            "1111111111111111111111111111111111111111 refs/heads/master\n"
+            "2222222222222222222222222222222222222222 refs/tags/v1.0.0\n"
+            "^1111111111111111111111111111111111111111\n"
+        )
+
+    os.makedirs(os.path.join(local_path, "refs", "heads"))
+    with io.open(
+        os.path.join(local_path, "refs", "heads", "master"), mode="wt", encoding="utf-8"
+    ) as stream_out:
+        stream_out.write("3333333333333333333333333333333333333333\n")
+
+    assert git_repository._read_local_refs(local_path) == {
+        "refs/heads/master": "3333333333333333333333333333333333333333",
+        "refs/tags/v1.0.0": "2222222222222222222222222222222222222222",
+    }
+
+
+def test_repository_is_up_to_date(tmp_path, upstream_url):
+    repository = git_repository.GitRepository(
+        local_path=str(tmp_path / "mirror.git"), url=upstream_url
+    )
+
+    assert repository.is_up_to_date() is False  # nothing is known about the remote
+
+    assert repository.exists_on_remote() is True
+    repository.create_local_copy()
+
+    assert repository.is_up_to_date() is True
+    assert repository.remote_fingerprint == repository.get_local_fingerprint()
+
+    subprocess.check_call(shlex.split("git branch feature"), cwd=tmp_path / "upstream")
+    assert repository.exists_on_remote() is True
+
+    assert repository.is_up_to_date() is False
+
+
+def test_repository_get_unknown_objects(tmp_path, upstream_url):
+    repository = git_repository.GitRepository(
+        local_path=str(tmp_path / "mirror.git"), url=upstream_url
+    )
+    repository.create_local_copy()
+
+    known = subprocess.check_output(
+        shlex.split("git rev-parse HEAD"), cwd=repository.local_path, text=True
+    ).strip()
+    # Enough names to fill the pipes in both directions.
+    unknown = {f"{index:040x}" for index in range(1, 5000)}
+
+    result: dict[str, set[str]] = {}
+    thread = threading.Thread(
+        target=lambda: result.update(
+            objects=repository.get_unknown_objects(unknown | {known})
+        ),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(60)
+
+    assert not thread.is_alive()
+    assert result["objects"] == unknown
+
+
+def test_object_pool(tmp_path, upstream_url):
+    repository = git_repository.GitRepository(
+        local_path=str(tmp_path / "mirror.git"), url=upstream_url
+    )
+    repository.create_local_copy()
+
+    pool = git_repository.ObjectPool.from_family(str(tmp_path), "project")
+    assert pool.exists() is False
+
+    pool.create()
+    pool.add_member(repository.local_path)
+
+    assert git_repository.ObjectPool.from_member(repository.local_path).path == (
+        pool.path
+    )
+    assert pool.get_object_names() == git_repository.get_object_names(
+        repository.local_path
+    )
+    assert git_repository.ObjectPool.find_all(str(tmp_path))[0].path == pool.path
+
+    # Every object is still reachable from the mirror through the pool.
+    subprocess.check_call(
+        shlex.split("git fsck --connectivity-only --no-progress"),
+        cwd=repository.local_path,
+    )
+
+
+def test_repository_create_local_copy_with_reference(run_git_command_mock, repository):
+    repository.create_local_copy(reference="pool.git")
+
+    run_git_command_mock.assert_called_once_with(
+        "git clone --mirror --no-hardlinks --progress --reference-if-able 'pool.git' "
+        "-- {0!r} {1!r}".format(repository.url, repository.local_path),
+        timeout=None,
+        transfer=repository.transfer,
+    )
+
+
+def test_repository_create_local_copy_with_filter(run_git_command_mock, repository):
+    repository.create_local_copy(filter_spec="blob:none")
+
+    run_git_command_mock.assert_called_once_with(
+        "git clone --mirror --no-hardlinks --progress --filter=blob:none "
+        "-- {0!r} {1!r}".format(repository.url, repository.local_path),
+        timeout=None,
+        transfer=repository.transfer,
+    )
+
+
+def test_repository_transfer(caplog, tmp_path, upstream_url):
+    repository = git_repository.GitRepository(
+        local_path=str(tmp_path / "mirror.git"), url=upstream_url
+    )
+    assert repository.exists_on_remote()
+
+    with caplog.at_level(logging.INFO, logger="easy_mirrors"):
+        repository.create_local_copy()
+
+    assert repository.transfer.objects == 3  # commit, tree and tag
+    assert repository.transfer.ref_updates == 2
+    assert "Receiving objects" not in caplog.text
+
+    subprocess.check_call(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@localhost"]
+        + shlex.split("commit --allow-empty --quiet --message=next"),
+        cwd=tmp_path / "upstream",
+    )
+    asyncio.run(repository.update_local_copy_async())
+
+    assert repository.transfer.objects == 4
+    assert repository.transfer.ref_updates == 3
+    assert repository.transfer.elapsed > 0
+
+
+def test_repository_backfill(tmp_path, upstream_url):
+    upstream_path = tmp_path / "upstream"
+    (upstream_path / "data.bin").write_bytes(os.urandom(1024))
+    for cmd in (
+        "git config uploadpack.allowFilter true",
+        "git add data.bin",
+        "git -c user.name=test -c user.email=test@localhost commit --quiet -m data",
+    ):
+        subprocess.check_call(shlex.split(cmd), cwd=upstream_path)
+
+    repository = git_repository.GitRepository(
+        local_path=str(tmp_path / "mirror.git"), url=upstream_url
+    )
+    repository.create_local_copy(filter_spec="blob:none")
+
+    assert repository.get_partial_clone_filter() == "blob:none"
+    assert len(repository.get_missing_objects()) == 1
+
+    assert repository.backfill() == 1
+    assert repository.get_missing_objects() == []
+
+    assert repository.backfill() == 0  # the filter is removed
+    assert repository.get_partial_clone_filter() is None
+    assert repository.backfill() == 0  # nothing is left to remove
+
+
+def test_repository_with_ref_filter(tmp_path, upstream_url):
+    upstream_path = tmp_path / "upstream"
+    subprocess.check_call(
+        shlex.split("git update-ref refs/pull/1/head HEAD"), cwd=upstream_path
+    )
+
+    repository = git_repository.GitRepository(
+        local_path=str(tmp_path / "mirror.git"),
+        url=upstream_url,
+        ref_filter=refspecs.RefFilter(
+            include=["refs/heads/*", "refs/tags/*"], negotiation="skipping"
+        ),
+    )
+    assert repository.exists_on_remote() is True
+    repository.create_local_copy()
+
+    local_refs = git_repository._read_local_refs(repository.local_path)
+    assert not any(ref.startswith("refs/pull/") for ref in local_refs)
+    assert repository.exists_locally() is True
+    assert repository.is_up_to_date() is True
+    assert repository.apply_ref_filter() is False  # already configured
+
+    head = subprocess.check_output(
+        shlex.split("git symbolic-ref HEAD"), cwd=repository.local_path, text=True
+    )
+    assert head.strip() in local_refs
+
+
+def test_repository_apply_ref_filter(tmp_path, upstream_url):
+    upstream_path = tmp_path / "upstream"
+    subprocess.check_call(
+        shlex.split("git update-ref refs/pull/1/head HEAD"), cwd=upstream_path
+    )
+
+    repository = git_repository.GitRepository(
+        local_path=str(tmp_path / "mirror.git"), url=upstream_url
+    )
+    repository.create_local_copy()
+    assert "refs/pull/1/head" in git_repository._read_local_refs(repository.local_path)
+
+    repository = git_repository.GitRepository(
+        local_path=repository.local_path,
+        url=upstream_url,
+        ref_filter=refspecs.RefFilter(exclude=["refs/pull/*"]),
+    )
+    assert repository.apply_ref_filter() is True
+    repository.update_local_copy()
+
+    assert git_repository._read_fetch_refspecs(repository.local_path) == [
+        "+refs/*:refs/*",
+        "^refs/pull/*",
+    ]
+    assert "refs/pull/1/head" not in git_repository._read_local_refs(
+        repository.local_path
+    )
+
+
+def test_repository_run_maintenance(run_git_command_mock, repository, local_path):
+    repository.run_maintenance("commit-graph")
+
+    run_git_command_mock.assert_called_once_with(
+        "git commit-graph write --reachable --split --no-progress",
+        cwd=local_path,
+        silent=True,
+    )
+
+
+def test_object_pool_from_member_without_alternates(tmp_path):
+    assert git_repository.ObjectPool.from_member(str(tmp_path)) is None
+
+
+@pytest.mark.parametrize(
+    "layout, expected",
+    [
+        ("flat", "utils.git"),
+        ("host", os.path.join("github.com", "org-a", "utils.git")),
+        ("hash", os.path.join("bf", "31", "utils-bf3191f45a1b.git")),
+    ],
+)
+def test_get_local_path(layout, expected):
+    for url in ("https://github.com/org-a/utils", "git@GitHub.com:org-a/utils.git"):
+        assert git_repository.get_local_path("root", url, layout) == os.path.join(
+            "root", expected
+        )
+
+
+def test_get_local_path_of_owners_with_same_names():
+    assert git_repository.get_local_path(
+        "root", "https://github.com/org-a/utils", "host"
+    ) != git_repository.get_local_path("root", "https://github.com/org-b/utils", "host")
+
+
+def test_find_mirrors(tmp_path):
+    for path in (
+        "flat.git",
+        os.path.join("github.com", "org", "nested.git", "objects"),
+        os.path.join(git_repository.POOLS_DIRECTORY, "family.git"),
+        "other",
+    ):
+        (tmp_path / path).mkdir(parents=True)
+
+    assert git_repository.find_mirrors(str(tmp_path)) == [
+        str(tmp_path / "flat.git"),
+        str(tmp_path / "github.com" / "org" / "nested.git"),
+    ]
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import os
+
+import pytest
+
+from easy_mirrors import git_repository, inventory
+
+_CONFIG = """\
+[core]
+\tbare = true
+[remote "origin"]
+\turl = {url!s}
+\tfetch = +refs/*:refs/*
+\tmirror = true
+"""
+
+
+def _make_mirror(path, url):
+    os.makedirs(path)
+    with open(os.path.join(path, "config"), "wt", encoding="utf-8") as stream_out:
+        stream_out.write(_CONFIG.format(url=url))
+
+
+@pytest.fixture
+def mirrors_path(tmp_path):
+    _make_mirror(tmp_path / "a.git", "https://github.com/vpunko/a.git")
+    _make_mirror(tmp_path / "github.com" / "vpunko" / "b.git", "git@github.com:b.git")
+
+    return tmp_path
+
+
+def test_inventory_paths(mirrors_path):
+    mirrors = inventory.Inventory(str(mirrors_path))
+
+    assert mirrors.paths == [
+        str(mirrors_path / "a.git"),
+        str(mirrors_path / "github.com" / "vpunko" / "b.git"),
+    ]
+    assert len(mirrors) == 2
+
+
+def test_inventory_scan_drops_removed_mirrors(mirrors_path):
+    mirrors = inventory.Inventory(str(mirrors_path))
+    assert len(mirrors.paths) == 2
+
+    os.remove(mirrors_path / "a.git" / "config")
+    os.rmdir(mirrors_path / "a.git")
+    mirrors.scan()
+
+    assert mirrors.paths == [str(mirrors_path / "github.com" / "vpunko" / "b.git")]
+
+
+def test_inventory_exists_locally(mirrors_path):
+    mirrors = inventory.Inventory(str(mirrors_path))
+
+    assert mirrors.exists_locally(
+        git_repository.GitRepository(
+            str(mirrors_path / "a.git"), "https://github.com/vpunko/a.git"
+        )
+    )
+    assert not mirrors.exists_locally(
+        git_repository.GitRepository(
+            str(mirrors_path / "a.git"), "https://github.com/vpunko/other.git"
+        )
+    )
+    assert not mirrors.exists_locally(
+        git_repository.GitRepository(
+            str(mirrors_path / "missing.git"), "https://github.com/vpunko/a.git"
+        )
+    )
+
+
+def test_inventory_lookup_is_cached(mocker, mirrors_path):
+    read_remotes_mock = mocker.patch(
+        "easy_mirrors.inventory.git_repository.read_remotes",
+        side_effect=git_repository.read_remotes,
+    )
+    mirrors = inventory.Inventory(str(mirrors_path))
+    local_path = str(mirrors_path / "a.git")
+
+    first = mirrors.lookup(local_path)
+    assert mirrors.lookup(local_path) is first
+    read_remotes_mock.assert_called_once_with(local_path)
+
+    # A changed configuration is parsed again.
+    config_path = os.path.join(local_path, "config")
+    with open(config_path, "wt", encoding="utf-8") as stream_out:
+        stream_out.write(_CONFIG.format(url="https://github.com/vpunko/c.git"))
+    os.utime(config_path, ns=(0, first.config_mtime + 1))
+
+    entry = mirrors.lookup(local_path)
+    assert entry is not first
+    assert entry.remotes == {"https://github.com/vpunko/c.git": True}
+    assert read_remotes_mock.call_count == 2
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import asyncio
+import math
+
+import pytest
+
+from easy_mirrors import exceptions, limits
+
+
+def test_token_bucket():
+    bucket = limits.TokenBucket(rate=60, capacity=2)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert 0 < bucket.try_acquire() <= 1  # one token per second
+
+
+def test_host_limiter_concurrency():
+    host_limiter = limits.HostLimiter(max_jobs=1)
+
+    assert host_limiter.try_acquire("a.com") == 0
+    assert host_limiter.try_acquire("a.com") == math.inf
+    assert host_limiter.try_acquire("b.com") == 0  # other hosts are not affected
+
+    host_limiter.release("a.com")
+
+    assert host_limiter.try_acquire("a.com") == 0
+
+
+def test_host_limiter_rate():
+    host_limiter = limits.HostLimiter(rate=60)
+
+    assert host_limiter.try_acquire("a.com") == 0
+    assert 0 < host_limiter.try_acquire("a.com") <= 1
+    assert host_limiter.try_acquire("b.com") == 0
+
+
+def test_host_limiter_unlimited():
+    host_limiter = limits.HostLimiter()
+
+    for _ in range(100):
+        assert host_limiter.try_acquire("a.com") == 0
+
+
+def test_host_limiter_async():
+    host_limiter = limits.HostLimiter(max_jobs=2)
+    running, maximum = 0, 0
+
+    async def sync():
+        nonlocal running, maximum
+
+        async with host_limiter.acquire_async("a.com"):
+            running += 1
+            maximum = max(maximum, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def run():
+        await asyncio.gather(*(sync() for _ in range(6)))
+
+    asyncio.run(run())
+
+    assert maximum == 2
+
+
+@pytest.mark.parametrize(
+    "attempt, lower, upper",
+    [(1, 5, 10), (2, 10, 20), (3, 20, 40), (20, 300, 600)],
+)
+def test_get_backoff_delay(attempt, lower, upper):
+    for _ in range(100):
+        assert lower <= limits.get_backoff_delay(attempt, base=10) <= upper
+
+
+def test_timeouts_config_options():
+    assert limits.Timeouts(fetch=60).get_config_options() == ""
+    assert limits.Timeouts(low_speed_limit=1000).get_config_options() == (
+        "-c http.lowSpeedLimit=1000 -c http.lowSpeedTime=60"
+    )
+
+
+def test_operation_limiter():
+    operations = limits.OperationLimiter({"clone": 1, "fetch": None})
+
+    assert operations.try_acquire("clone") is True
+    # The only clone slot is taken, while fetches are not limited.
+    assert operations.try_acquire("clone") is False
+    assert operations.try_acquire("fetch") is True
+    assert operations.try_acquire("fetch") is True
+
+    operations.release("clone")
+    operations.release("fetch")
+
+    assert operations.try_acquire("clone") is True
+    assert operations.max_jobs == {"clone": 1}
+
+
+def test_resources_get_command(mocker):
+    mocker.patch("easy_mirrors.limits.shutil.which", side_effect=lambda name: name)
+    resources = limits.Resources(
+        nice=10,
+        ionice="idle",
+        git_config={"clone": {"pack.threads": "2", "core.packedGitLimit": "256m"}},
+    )
+
+    assert resources.get_command("clone", ["git", "clone", "--mirror"]) == [
+        *("ionice", "-c", "3", "nice", "-n", "10", "git"),
+        *("-c", "core.packedGitLimit=256m", "-c", "pack.threads=2"),
+        *("clone", "--mirror"),
+    ]
+    assert resources.get_command("fetch", ["git", "fetch"]) == [
+        *("ionice", "-c", "3", "nice", "-n", "10", "git", "fetch"),
+    ]
+
+
+def test_resources_without_utilities(caplog, mocker):
+    mocker.patch("easy_mirrors.limits.shutil.which", return_value=None)
+    resources = limits.Resources(nice=5, ionice="best-effort")
+
+    assert resources.get_command("fetch", ["git", "fetch"]) == ["git", "fetch"]
+    assert "The 'ionice' utility is not available" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"ionice": "realtime"},
+        {"git_config": {"Clone": {"pack.threads": "2"}}},
+        {"git_config": {"clone": {"threads": "2"}}},
+        {"git_config": {"clone": {"pack.threads": "2\n[core]"}}},
+    ],
+)
+def test_resources_invalid(options):
+    with pytest.raises(exceptions.ConfigError):
+        limits.Resources(**options)
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import io
+import json
+import logging
+
+import pytest
+
+from easy_mirrors import logger_wrapper
+
+
+@pytest.fixture
+def record():
+    return logging.LogRecord(
+        "easy_mirrors", logging.INFO, __file__, 1, "Fetched %d ref(s).", (3,), None
+    )
+
+
+def test_repository_filter(record):
+    with logger_wrapper.repository_context("1.git", attempt=2):
+        logger_wrapper.RepositoryFilter().filter(record)
+
+    assert record.repository == "1.git"
+    assert record.attempt == 2
+
+
+def test_repository_context_inherits_attempt(record):
+    with logger_wrapper.repository_context("1.git", attempt=3):
+        with logger_wrapper.repository_context("1.git"):
+            logger_wrapper.RepositoryFilter().filter(record)
+
+    assert record.attempt == 3
+
+
+def test_json_formatter(record):
+    logger_wrapper.RepositoryFilter().filter(record)
+    record.operation, record.duration_ms, record.exit_code = "fetch", 12.5, 0
+
+    document = json.loads(logger_wrapper.JsonFormatter().format(record))
+
+    assert document["message"] == "Fetched 3 ref(s)."
+    assert document["level"] == "INFO"
+    assert document["repository"] == "-"
+    assert document["attempt"] == 1
+    assert document["operation"] == "fetch"
+    assert document["duration_ms"] == 12.5
+    assert document["exit_code"] == 0
+
+
+def test_json_formatter_without_extra_fields(record):
+    document = json.loads(logger_wrapper.JsonFormatter().format(record))
+
+    assert document["operation"] is None
+    assert document["exit_code"] is None
+
+
+def test_queue_preserves_attribution(mocker):
+    mocker.patch("atexit.register")
+
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.addFilter(logger_wrapper.RepositoryFilter())
+    handler.setFormatter(logging.Formatter("%(repository)s :: %(message)s"))
+
+    logger = logging.getLogger("easy_mirrors.tests.queue")
+    logger.propagate = False
+    logger.handlers = [handler]
+
+    listener = logger_wrapper._enable_queue(logger)
+    try:
+        with logger_wrapper.repository_context("1.git"):
+            logger.warning("Message number %d.", 1)
+    finally:
+        listener.stop()  # waits until every queued record is handled
+
+    assert stream.getvalue() == "1.git :: Message number 1.\n"
+
+
+def test_setup_replaces_queue(mocker):
+    mocker.patch("atexit.register")
+    unregister_mock = mocker.patch("atexit.unregister")
+
+    logger_wrapper.setup(use_queue=True)
+    listener = logger_wrapper._listener
+    try:
+        logger_wrapper.setup(use_queue=True)
+
+        # The first listener is stopped instead of being left running.
+        assert logger_wrapper._listener is not listener
+        assert listener._thread is None
+        unregister_mock.assert_called_once_with(listener.stop)
+    finally:
+        logger_wrapper.setup()
+
+    assert logger_wrapper._listener is None
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import datetime
+import os
+import subprocess
+
+import pytest
+
+from easy_mirrors import config, maintenance
+
+
+@pytest.fixture
+def upstream_url(tmp_path):
+    path = tmp_path / "upstream"
+    path.mkdir()
+
+    for arguments in (
+        ["init", "--quiet"],
+        ["commit", "--allow-empty", "--quiet", "--message=initial"],
+    ):
+        subprocess.check_call(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@localhost"]
+            + arguments,
+            cwd=path,
+        )
+
+    return path.as_uri()
+
+
+@pytest.mark.parametrize(
+    "window, moment, expected",
+    [
+        ("01:00-05:00", datetime.time(3, 0), True),
+        ("01:00-05:00", datetime.time(5, 0), False),
+        ("22:00-04:00", datetime.time(23, 30), True),
+        ("22:00-04:00", datetime.time(2, 0), True),
+        ("22:00-04:00", datetime.time(12, 0), False),
+    ],
+)
+def test_is_within_window(window, moment, expected):
+    assert maintenance.is_within_window(window, moment) is expected
+
+
+@pytest.mark.parametrize(
+    "statistics, full_repack, expected",
+    [
+        (maintenance.PackStatistics(), True, []),
+        (
+            maintenance.PackStatistics(packs=1, newest_pack=10.0, commit_graph=20.0),
+            True,
+            [],
+        ),
+        (
+            maintenance.PackStatistics(packs=1, newest_pack=30.0, commit_graph=20.0),
+            True,
+            ["pack-refs", "commit-graph"],
+        ),
+        (
+            maintenance.PackStatistics(packs=3, newest_pack=10.0, commit_graph=20.0),
+            True,
+            ["full-repack", "pack-refs", "commit-graph"],
+        ),
+        (
+            maintenance.PackStatistics(
+                packs=10, newest_pack=10.0, bitmap=5.0, commit_graph=20.0
+            ),
+            False,
+            ["incremental-repack", "pack-refs", "commit-graph"],
+        ),
+        (
+            maintenance.PackStatistics(
+                packs=3, newest_pack=10.0, bitmap=5.0, commit_graph=20.0
+            ),
+            True,
+            [],  # the bitmap is recent enough
+        ),
+    ],
+)
+def test_get_tasks(statistics, full_repack, expected):
+    assert maintenance.get_tasks(statistics, full_repack, now=100.0) == expected
+
+
+def test_pack_statistics_from_path(tmp_path):
+    pack_path = tmp_path / "objects" / "pack"
+    pack_path.mkdir(parents=True)
+
+    for name in ("pack-1.pack", "pack-1.idx", "pack-2.pack", "pack-2.bitmap"):
+        (pack_path / name).touch()
+
+    statistics = maintenance.PackStatistics.from_path(str(tmp_path))
+
+    assert statistics.packs == 2
+    assert statistics.bitmap is not None
+    assert statistics.commit_graph is None
+
+
+def test_run_maintenance(tmp_path, upstream_url):
+    configuration = config.Config(
+        path=str(tmp_path / "mirrors"), repositories=[upstream_url]
+    )
+    subprocess.check_call(
+        [
+            "git",
+            "clone",
+            "--quiet",
+            "--mirror",
+            upstream_url,
+            os.path.join(configuration.path, "upstream.git"),
+        ]
+    )
+
+    completed = maintenance.run_maintenance(configuration)
+
+    assert completed == {upstream_url: ["pack-refs", "commit-graph"]}
+    assert os.path.exists(
+        os.path.join(
+            configuration.path,
+            "upstream.git",
+            "objects",
+            "info",
+            "commit-graphs",
+            "commit-graph-chain",
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "window, expected",
+    [(None, False), ("01:00-05:00", True), ("06:00-07:00", False)],
+)
+def test_run_maintenance_full_repack_window(mocker, tmp_path, window, expected):
+    configuration = config.Config(
+        path=str(tmp_path), repositories=["1.git"], maintenance_window=window
+    )
+    mocker.patch("easy_mirrors.maintenance.PackStatistics.from_path")
+    get_tasks_mock = mocker.patch("easy_mirrors.maintenance.get_tasks", return_value=[])
+
+    maintenance.run_maintenance(configuration, now=datetime.datetime(2026, 1, 1, 3))
+
+    assert get_tasks_mock.call_args.args[1] is expected
+
+
+def test_run_maintenance_without_budget(mocker, tmp_path):
+    configuration = config.Config(
+        path=str(tmp_path), repositories=["1.git"], maintenance_budget=0
+    )
+    get_tasks_mock = mocker.patch("easy_mirrors.maintenance.get_tasks")
+
+    assert maintenance.run_maintenance(configuration) == {}
+    get_tasks_mock.assert_not_called()
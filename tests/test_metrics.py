@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import urllib.request
+
+import pytest
+
+from easy_mirrors import exceptions, metrics, transfers
+
+
+@pytest.fixture
+def registry():
+    return metrics.Registry()
+
+
+def test_counter(registry):
+    counter = metrics.Counter(
+        "test_total", "Test counter.", labelnames=("kind",), registry=registry
+    )
+    counter.inc(kind="fetch")
+    counter.inc(2, kind="fetch")
+
+    assert registry.render() == (
+        "# HELP test_total Test counter.\n"
+        "# TYPE test_total counter\n"
+        'test_total{kind="fetch"} 3.0\n'
+    )
+
+
+def test_gauge_without_labels(registry):
+    gauge = metrics.Gauge("test_gauge", "Test gauge.", registry=registry)
+    gauge.set(5)
+    gauge.dec()
+
+    assert registry.render().splitlines()[-1] == "test_gauge 4.0"
+
+
+def test_histogram(registry):
+    histogram = metrics.Histogram(
+        "test_seconds",
+        "Test histogram.",
+        labelnames=("operation",),
+        buckets=(1.0, 10.0),
+        registry=registry,
+    )
+    histogram.observe(0.5, operation="clone")
+    histogram.observe(5.0, operation="clone")
+
+    assert registry.render().splitlines()[2:] == [
+        'test_seconds_bucket{operation="clone",le="1.0"} 1.0',
+        'test_seconds_bucket{operation="clone",le="10.0"} 2.0',
+        'test_seconds_bucket{operation="clone",le="+Inf"} 2.0',
+        'test_seconds_count{operation="clone"} 2.0',
+        'test_seconds_sum{operation="clone"} 5.5',
+    ]
+
+
+def test_label_values_are_escaped(registry):
+    gauge = metrics.Gauge(
+        "test_gauge", "Test gauge.", labelnames=("repository",), registry=registry
+    )
+    gauge.set(1, repository='a"b\\c')
+
+    assert registry.render().splitlines()[-1] == (
+        'test_gauge{repository="a\\"b\\\\c"} 1.0'
+    )
+
+
+def test_missing_labels(registry):
+    counter = metrics.Counter(
+        "test_total", "Test counter.", labelnames=("kind",), registry=registry
+    )
+
+    with pytest.raises(ValueError):
+        counter.inc()
+
+
+def test_track_operation_failure():
+    before = metrics.OPERATION_FAILURES._values.get(("test-operation",), 0.0)
+
+    with pytest.raises(RuntimeError):
+        with metrics.track_operation("test-operation"):
+            raise RuntimeError
+
+    assert metrics.OPERATION_FAILURES._values[("test-operation",)] == before + 1
+    assert ("test-operation",) not in metrics.FAILURES._values
+    assert metrics.OPERATIONS_IN_FLIGHT._values[("test-operation",)] == 0
+
+
+def test_record_sync():
+    metrics.record_sync("test.git", "fetched", 2.0)
+
+    assert metrics.SYNC_DURATION._values[("test.git",)] == 2.0
+    assert ("test.git",) in metrics.LAST_SUCCESS._values
+
+
+def test_record_transfer():
+    before = metrics.RECEIVED_BYTES._values.get(("test.git",), 0.0)
+    transfer = transfers.Transfer(objects=3, received_bytes=1024, ref_updates=1)
+
+    metrics.record_transfer("test.git", transfer)
+    metrics.record_cycle_transfer(transfer)
+
+    assert metrics.RECEIVED_BYTES._values[("test.git",)] == before + 1024
+    assert metrics.CYCLE_RECEIVED_OBJECTS._values[()] == 3
+    assert metrics.CYCLE_REF_UPDATES._values[()] == 1
+
+
+def test_write_textfile(registry, tmp_path):
+    metrics.Gauge("test_gauge", "Test gauge.", registry=registry).set(1)
+
+    path = tmp_path / "easy_mirrors.prom"
+    metrics.write_textfile(str(path), registry)
+
+    assert path.read_text(encoding="utf-8") == registry.render()
+    assert [entry.name for entry in tmp_path.iterdir()] == ["easy_mirrors.prom"]
+
+
+def test_write_textfile_error(tmp_path):
+    with pytest.raises(exceptions.FileSystemError):
+        metrics.write_textfile(str(tmp_path / "missing" / "easy_mirrors.prom"))
+
+
+def test_http_server():
+    server = metrics.start_http_server(0)
+    try:
+        with urllib.request.urlopen(  # nosec
+            f"http://127.0.0.1:{server.server_port:d}/metrics", timeout=5
+        ) as response:
+            body = response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert "# TYPE easy_mirrors_syncs_total counter" in body
+
+
+def test_histogram_snapshot(registry):
+    histogram = metrics.Histogram(
+        "test_seconds", "Test histogram.", labelnames=("operation",), registry=registry
+    )
+    histogram.observe(1.0, operation="fetch")
+    histogram.observe(2.0, operation="fetch")
+
+    assert histogram.snapshot() == {("fetch",): (2, 3.0)}
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import pytest
+
+from easy_mirrors import exceptions, refspecs
+
+
+def test_ref_filter_defaults():
+    ref_filter = refspecs.RefFilter()
+
+    assert ref_filter.get_refspecs() == list(refspecs.DEFAULT_REFSPECS)
+    assert ref_filter.get_ls_remote_options() == ""
+    assert ref_filter.get_config_options() == "-c protocol.version=2"
+
+
+@pytest.mark.parametrize(
+    "ref, expected",
+    [
+        ("refs/heads/main", True),
+        ("refs/heads/feature/one", True),
+        ("refs/tags/v1.0.0", True),
+        ("refs/pull/1/head", False),
+        ("refs/heads/dependabot/pip", False),
+    ],
+)
+def test_ref_filter_matches(ref, expected):
+    ref_filter = refspecs.RefFilter(
+        include=["refs/heads/*", "refs/tags/*"],
+        exclude=["refs/pull/*", "refs/heads/dependabot/*"],
+    )
+
+    assert ref_filter.matches(ref) is expected
+
+
+def test_ref_filter_refspecs():
+    ref_filter = refspecs.RefFilter(
+        include=["refs/tags/*", "refs/heads/*"],
+        exclude=["refs/pull/*"],
+        negotiation="skipping",
+    )
+
+    assert ref_filter.get_refspecs() == [
+        "+refs/heads/*:refs/heads/*",
+        "+refs/tags/*:refs/tags/*",
+        "^refs/pull/*",
+    ]
+    assert ref_filter.get_ls_remote_options() == "--heads --tags"
+    assert ref_filter.get_config_options() == (
+        "-c protocol.version=2 -c fetch.negotiationAlgorithm=skipping"
+    )
+
+
+def test_ref_filter_ls_remote_options_with_other_refs():
+    ref_filter = refspecs.RefFilter(include=["refs/heads/*", "refs/notes/*"])
+
+    assert ref_filter.get_ls_remote_options() == ""
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"include": ["heads/*"]},
+        {"include": ["refs/*/*"]},
+        {"exclude": ["refs/pull/* refs/heads/*"]},
+        {"negotiation": "fastest"},
+    ],
+)
+def test_ref_filter_validation(options):
+    with pytest.raises(exceptions.ConfigError):
+        refspecs.RefFilter(**options)
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import pytest
+
+from easy_mirrors import scheduler, state
+
+
+@pytest.fixture
+def repository_scheduler():
+    return scheduler.Scheduler(min_interval=60, max_interval=3600)
+
+
+def test_scheduler_new_repositories_are_due(repository_scheduler):
+    repository_scheduler.add("1.git", now=0)
+    repository_scheduler.add("2.git", now=0)
+
+    assert repository_scheduler.next_due() == 0
+    assert repository_scheduler.pop_due(now=0) == ["1.git", "2.git"]
+    assert repository_scheduler.next_due() is None
+    assert len(repository_scheduler) == 2
+
+
+def test_scheduler_uses_repository_state(repository_scheduler):
+    repository_state = state.RepositoryState(url="1.git", last_sync=1000, last_change=0)
+    repository_scheduler.add("1.git", repository_state, now=1000)
+
+    # The interval is derived from the time since the last observed change.
+    assert repository_scheduler.next_due() == 1500
+    assert repository_scheduler.pop_due(now=1499) == []
+    assert repository_scheduler.pop_due(now=1500) == ["1.git"]
+
+
+def test_scheduler_retries_failed_repositories(repository_scheduler):
+    repository_state = state.RepositoryState(
+        url="1.git", last_sync=1000, last_change=0, consecutive_failures=1
+    )
+    repository_scheduler.add("1.git", repository_state, now=1000)
+
+    assert repository_scheduler.next_due() == 1000
+
+
+@pytest.mark.parametrize(
+    "status, intervals",
+    [
+        ("fetched", [60, 60]),
+        ("unchanged", [90, 135]),
+        ("failed", [60, 60]),
+    ],
+)
+def test_scheduler_reschedule(repository_scheduler, status, intervals):
+    repository_scheduler.add("1.git", now=0)
+
+    for interval in intervals:
+        assert repository_scheduler.pop_due(now=0) in (["1.git"], [])
+        assert repository_scheduler.reschedule("1.git", status, now=0) == interval
+        assert repository_scheduler.next_due() == interval
+
+
+def test_scheduler_interval_bounds(repository_scheduler):
+    repository_scheduler.add("1.git", now=0)
+
+    for _ in range(20):
+        repository_scheduler.reschedule("1.git", "unchanged", now=0)
+
+    assert repository_scheduler.next_due() == 3600
+
+
+def test_scheduler_remove(repository_scheduler):
+    repository_scheduler.add("1.git", now=0)
+    repository_scheduler.remove("1.git")
+
+    assert "1.git" not in repository_scheduler
+    assert repository_scheduler.next_due() is None
+    assert repository_scheduler.reschedule("1.git", "fetched") == 0.0
+
+
+def test_scheduler_get_queue(repository_scheduler):
+    repository_scheduler.add("1.git", now=10)
+    repository_scheduler.add("2.git", now=0)
+    repository_scheduler.add("3.git", now=5)
+    repository_scheduler.remove("3.git")
+
+    assert repository_scheduler.get_queue() == [(0, "2.git"), (10, "1.git")]
+
+
+def test_scheduler_set_bounds():
+    queue = scheduler.Scheduler(min_interval=60, max_interval=3600)
+    queue.add("1.git", now=0)
+    queue.pop_due(now=0)
+    queue.reschedule("1.git", "unchanged", now=0)  # due in 90 seconds
+    queue.add("2.git", now=0)
+    queue.pop_due(now=0)
+    queue.reschedule("2.git", "fetched", now=0)  # due in 60 seconds
+
+    queue.set_bounds(10, 30, now=0)
+
+    assert (queue.min_interval, queue.max_interval) == (10, 30)
+    assert queue.get_queue() == [(30, "1.git"), (30, "2.git")]
+    assert queue.reschedule("1.git", "unchanged", now=30) == 30
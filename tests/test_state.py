@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import sqlite3
+
+import pytest
+
+from easy_mirrors import exceptions, state, transfers
+
+
+@pytest.fixture
+def url():
+    return "https://github.com/python/cpython"
+
+
+@pytest.fixture
+def state_store(tmp_path):
+    with state.StateStore(str(tmp_path / "state.sqlite3"), batch_size=2) as store:
+        yield store
+
+
+def test_state_store_wal_mode(state_store):
+    connection = sqlite3.connect(state_store.path)
+
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+
+def test_state_store_unknown_repository(state_store, url):
+    assert state_store.get(url) is None
+
+
+def test_state_store_record_success(state_store, url):
+    state_store.record(url, "cloned", started_at=100.0, duration=5.0, fingerprint="a")
+    state_store.record(
+        url, "unchanged", started_at=200.0, duration=1.0, fingerprint="a"
+    )
+    state_store.flush()
+
+    repository_state = state_store.get(url)
+
+    assert repository_state.last_sync == 200.0
+    assert repository_state.last_success == 201.0
+    assert repository_state.last_duration == 1.0
+    assert repository_state.last_change == 105.0  # fingerprint did not change
+    assert repository_state.fingerprint == "a"
+    assert repository_state.consecutive_failures == 0
+
+
+def test_state_store_record_failures(state_store, url):
+    state_store.record(url, "fetched", started_at=100.0, duration=5.0, fingerprint="a")
+    state_store.record(url, "failed", started_at=200.0, duration=1.0, error="error")
+    state_store.record(url, "missing", started_at=300.0, duration=1.0)
+    state_store.flush()
+
+    repository_state = state_store.get(url)
+
+    assert repository_state.last_success == 105.0
+    assert repository_state.consecutive_failures == 2
+
+    state_store.record(url, "fetched", started_at=400.0, duration=5.0, fingerprint="b")
+    state_store.flush()
+
+    repository_state = state_store.get(url)
+
+    assert repository_state.last_change == 405.0
+    assert repository_state.consecutive_failures == 0
+
+
+def test_state_store_history(state_store, url):
+    for started_at in range(5):
+        state_store.record(url, "unchanged", started_at=started_at, duration=1.0)
+    state_store.flush()
+
+    history = state_store.get_history(url, limit=3)
+
+    assert [item["started_at"] for item in history] == [4.0, 3.0, 2.0]
+    assert list(state_store.get_all()) == [url]
+
+
+def test_state_store_transfers(state_store, url):
+    state_store.record(
+        url,
+        "cloned",
+        started_at=100.0,
+        duration=5.0,
+        transfer=transfers.Transfer(objects=10, received_bytes=2048, ref_updates=3),
+    )
+    state_store.record(
+        url,
+        "fetched",
+        started_at=200.0,
+        duration=1.0,
+        transfer=transfers.Transfer(objects=2, received_bytes=512, ref_updates=1),
+    )
+    state_store.record("small.git", "unchanged", started_at=200.0, duration=1.0)
+    state_store.flush()
+
+    assert state_store.get_history(url, limit=1)[0]["received_bytes"] == 512
+    assert state_store.get_transfers() == [
+        {
+            "url": url,
+            "objects": 12,
+            "received_bytes": 2560,
+            "ref_updates": 4,
+            "syncs": 2,
+        },
+        {
+            "url": "small.git",
+            "objects": 0,
+            "received_bytes": 0,
+            "ref_updates": 0,
+            "syncs": 1,
+        },
+    ]
+    assert state_store.get_transfers(since=150.0, limit=1)[0]["objects"] == 2
+
+
+def test_state_store_upgrades_history(tmp_path, url):
+    path = str(tmp_path / "state.sqlite3")
+
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE syncs (id INTEGER PRIMARY KEY AUTOINCREMENT, url TEXT "
+            "NOT NULL, started_at REAL NOT NULL, duration REAL NOT NULL, status "
+            "TEXT NOT NULL, fingerprint TEXT, error TEXT)"
+        )
+        connection.execute(
+            "INSERT INTO syncs (url, started_at, duration, status) "
+            "VALUES (?, 1.0, 1.0, 'cloned')",
+            (url,),
+        )
+    connection.close()
+
+    with state.StateStore(path) as state_store:
+        state_store.record(url, "fetched", started_at=2.0, duration=1.0)
+        state_store.flush()
+
+        assert [item["received_bytes"] for item in state_store.get_history(url)] == [
+            None,
+            None,
+        ]
+
+
+def test_state_store_persistence(tmp_path, url):
+    path = str(tmp_path / "state.sqlite3")
+
+    with state.StateStore(path) as state_store:
+        state_store.record(url, "cloned", started_at=100.0, duration=5.0)
+
+    with state.StateStore(path) as state_store:
+        assert state_store.get(url).last_success == 105.0
+
+
+def test_state_store_with_error(tmp_path):
+    path = tmp_path / "state.sqlite3"
+    path.mkdir()
+
+    with pytest.raises(exceptions.FileSystemError):
+        state.StateStore(str(path))
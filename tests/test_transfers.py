@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import pytest
+
+from easy_mirrors import transfers
+
+_CLONE_OUTPUT = """\
+Cloning into bare repository 'a.git'...
+remote: Enumerating objects: 302, done.
+remote: Counting objects:  50% (151/302)
+remote: Counting objects: 100% (302/302), done.
+Receiving objects:  45% (136/302), 1.00 MiB | 1.00 MiB/s
+remote: Total 302 (delta 0), reused 0 (delta 0), pack-reused 0
+Receiving objects: 100% (302/302), 5.73 MiB | 17.02 MiB/s, done.
+"""
+
+_FETCH_OUTPUT = """\
+remote: Enumerating objects: 4, done.
+remote: Total 3 (delta 1), reused 0 (delta 0), pack-reused 0
+From https://github.com/vpunko/a
+   26934dc..07b1c1d  main       -> main
+ * [new tag]         v1         -> v1
+ + 1111111...2222222 feature    -> feature  (forced update)
+ - [deleted]         (none)     -> old
+ = [up to date]      stable     -> stable
+ ! [rejected]        other      -> other  (would clobber existing tag)
+"""
+
+
+@pytest.mark.parametrize(
+    "text, size",
+    [("123 bytes", 123), ("1.50 KiB", 1536), ("5.73 MiB", 6008340)],
+)
+def test_parse_size(text, size):
+    assert transfers.parse_size(text) == size
+
+
+def test_parse_size_with_error():
+    with pytest.raises(ValueError):
+        transfers.parse_size("5 MB")
+
+
+def test_format_size():
+    assert transfers.format_size(512) == "512 bytes"
+    assert transfers.format_size(1536) == "1.50 KiB"
+    assert transfers.format_size(3 * 1024**5) == "3072.00 TiB"
+
+
+def test_transfer_clone():
+    transfer = transfers.Transfer()
+    progress = [transfer.feed(line) for line in _CLONE_OUTPUT.splitlines()]
+    transfer.finish(elapsed=2.0)
+
+    assert progress == [False, False, True, True, True, True, True]
+    assert transfer.to_dict() == {
+        "objects": 302,
+        "received_bytes": 6008340,
+        "ref_updates": 0,
+        "elapsed": 2.0,
+    }
+    assert transfer.throughput == 3004170.0
+
+
+def test_transfer_fetch():
+    transfer = transfers.Transfer()
+    for line in _FETCH_OUTPUT.splitlines():
+        transfer.feed(line)
+    transfer.finish(elapsed=1.0)
+
+    # The pack is too small for a progress meter, so its size is unknown.
+    assert (transfer.objects, transfer.received_bytes) == (3, 0)
+    assert transfer.ref_updates == 4
+
+
+def test_transfer_add():
+    cycle = transfers.Transfer()
+    cycle.add(transfers.Transfer(objects=1, received_bytes=10, elapsed=1.0))
+    cycle.add(transfers.Transfer(objects=2, ref_updates=1, elapsed=2.0))
+
+    assert str(cycle) == "3 object(s), 10 bytes, 1 ref update(s) in 3.0 second(s)"
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import os
+
+import pytest
+
+from easy_mirrors import config, watcher
+
+CONFIG_TEMPLATE = """\
+[easy_mirrors]
+path = {0!s}
+repositories =
+{1!s}
+"""
+
+
+def _write(path, repositories):
+    content = CONFIG_TEMPLATE.format(
+        path.parent / "mirrors", "\n".join(f"  {url!s}" for url in repositories)
+    )
+
+    # Replace the file the way editors do, so its inode changes.
+    temporary_path = path.with_suffix(".tmp")
+    temporary_path.write_text(content, encoding="utf-8")
+    os.replace(temporary_path, path)
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "easy_mirrors.ini"
+    _write(path, ["1.git"])
+
+    return path
+
+
+@pytest.fixture
+def config_watcher(config_path):
+    return watcher.ConfigWatcher(
+        str(config_path),
+        load=lambda: config.Config.load(str(config_path)),
+        interval=0.05,
+    )
+
+
+def test_config_watcher_check(mocker, config_path, config_watcher):
+    config_watcher.on_change = mocker.Mock()
+
+    assert config_watcher.check() is False
+    assert config_watcher.get_configuration() is None
+
+    _write(config_path, ["1.git", "2.git"])
+
+    assert config_watcher.check() is True
+    assert config_watcher.changed.is_set()
+    config_watcher.on_change.assert_called_once_with()
+    assert config_watcher.get_configuration().repositories == ["1.git", "2.git"]
+    assert not config_watcher.changed.is_set()
+
+    assert config_watcher.check() is False
+
+
+def test_config_watcher_keeps_previous_configuration(
+    caplog, config_path, config_watcher
+):
+    config_path.write_text("[easy_mirrors]\npath = /tmp\n", encoding="utf-8")
+
+    assert config_watcher.check() is False
+    assert config_watcher.get_configuration() is None
+    assert "Keeping the previous configuration." in caplog.text
+
+
+@pytest.mark.parametrize("inotify", [True, False])
+def test_config_watcher_thread(mocker, config_path, config_watcher, inotify):
+    if not inotify:
+        mocker.patch("easy_mirrors.watcher._Inotify", side_effect=OSError)
+
+    config_watcher.start()
+    try:
+        _write(config_path, ["3.git"])
+
+        assert config_watcher.wait(10) is True
+        assert config_watcher.get_configuration().repositories == ["3.git"]
+    finally:
+        config_watcher.stop()
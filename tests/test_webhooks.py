@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+
+# Created by: Vladislav Punko <iam.vlad.punko@gmail.com>
+# Created date: 2026-10-17
+
+import hashlib
+import hmac
+import json
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+from easy_mirrors import webhooks
+
+_GITHUB_PAYLOAD = {
+    "ref": "refs/heads/main",
+    "repository": {
+        "full_name": "vpunko/a",
+        "html_url": "https://github.com/vpunko/a",
+        "clone_url": "https://github.com/vpunko/a.git",
+        "ssh_url": "git@github.com:vpunko/a.git",
+    },
+}
+
+_GITLAB_PAYLOAD = {
+    "object_kind": "push",
+    "project": {
+        "path_with_namespace": "vpunko/b",
+        "git_ssh_url": "git@gitlab.com:vpunko/b.git",
+        "git_http_url": "https://gitlab.com/vpunko/b.git",
+    },
+}
+
+
+@pytest.fixture
+def daemon_mock(mocker):
+    mirror_daemon = mocker.Mock()
+    mirror_daemon.configuration.repositories = [
+        "git@github.com:vpunko/a.git",
+        "https://gitlab.com/vpunko/b",
+    ]
+
+    return mirror_daemon
+
+
+@pytest.fixture
+def webhook_server(mocker, daemon_mock):
+    mocker.patch.dict("os.environ", {webhooks.SECRET_VARIABLE: "secret"})
+    server = webhooks.start_server(0, daemon_mock, delay=60)
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def _post(server, payload, headers):
+    body = json.dumps(payload).encode("utf-8")
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{server.server_port:d}/",
+        data=body,
+        headers={"Content-Type": "application/json", **headers(body)},
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:  # nosec
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as err:
+        return err.code, json.loads(err.read())
+
+
+def _sign(body):
+    digest = hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+
+    return {"X-GitHub-Event": "push", "X-Hub-Signature-256": f"sha256={digest!s}"}
+
+
+def test_get_repository_urls():
+    assert webhooks.get_repository_urls(_GITLAB_PAYLOAD) == {
+        "git@gitlab.com:vpunko/b.git",
+        "https://gitlab.com/vpunko/b.git",
+    }
+    assert webhooks.get_repository_urls([]) == set()
+    assert webhooks.get_repository_urls(_GITHUB_PAYLOAD) == {
+        "https://github.com/vpunko/a.git",
+        "git@github.com:vpunko/a.git",
+    }
+
+
+def test_webhook_server_match(mocker, daemon_mock):
+    canonicalize_mock = mocker.patch(
+        "easy_mirrors.webhooks.urls.canonicalize", side_effect=str.lower
+    )
+    server = webhooks.WebhookServer(("127.0.0.1", 0), daemon_mock, delay=60)
+    try:
+        assert server.match(["GIT@GITHUB.COM:VPUNKO/A.GIT"]) == (
+            "git@github.com:vpunko/a.git"
+        )
+        assert server.match(["https://github.com/vpunko/c"]) is None
+        # The configured urls are canonicalized once per configuration.
+        assert canonicalize_mock.call_count == 4
+
+        daemon_mock.configuration = mocker.Mock(repositories=["https://c.org/d"])
+        assert server.match(["HTTPS://C.ORG/D"]) == "https://c.org/d"
+    finally:
+        server.server_close()
+
+
+def test_webhook_server_github(webhook_server):
+    assert _post(webhook_server, _GITHUB_PAYLOAD, _sign) == (
+        202,
+        {"repository": "git@github.com:vpunko/a.git"},
+    )
+    assert _post(webhook_server, _GITHUB_PAYLOAD, _sign)[0] == 202
+
+    # Both events are merged into one pending sync.
+    assert webhook_server.coalescer.flush(now=float("inf")) == [
+        "git@github.com:vpunko/a.git"
+    ]
+
+
+def test_webhook_server_gitlab(webhook_server):
+    assert _post(
+        webhook_server,
+        _GITLAB_PAYLOAD,
+        lambda body: {"X-Gitlab-Event": "Push Hook", "X-Gitlab-Token": "secret"},
+    ) == (202, {"repository": "https://gitlab.com/vpunko/b"})
+
+
+@pytest.mark.parametrize(
+    "payload, headers, code",
+    [
+        (_GITHUB_PAYLOAD, lambda body: {"X-Hub-Signature-256": "sha256=0"}, 403),
+        (_GITLAB_PAYLOAD, lambda body: {"X-Gitlab-Token": "other"}, 403),
+        (_GITLAB_PAYLOAD, lambda body: {"X-Gitlab-Token": "s\u00e9cret"}, 403),
+        (_GITHUB_PAYLOAD, lambda body: {"X-Hub-Signature-256": "\u00e9"}, 403),
+        (_GITHUB_PAYLOAD, lambda body: {}, 403),
+        (
+            {"repository": {"url": "https://github.com/vpunko/c"}},
+            _sign,
+            404,
+        ),
+        (
+            _GITHUB_PAYLOAD,
+            lambda body: {**_sign(body), "X-GitHub-Event": "issues"},
+            200,
+        ),
+    ],
+)
+def test_webhook_server_rejects_deliveries(webhook_server, payload, headers, code):
+    assert _post(webhook_server, payload, headers)[0] == code
+    assert webhook_server.coalescer.flush(now=float("inf")) == []
+
+
+def test_coalescer(mocker):
+    request_sync = mocker.Mock()
+    coalescer = webhooks.Coalescer(request_sync, delay=10)
+
+    assert coalescer.add("1.git", now=0) is True
+    assert coalescer.add("1.git", now=5) is False
+    assert coalescer.add("2.git", now=5) is True
+
+    assert coalescer.flush(now=9) == []
+    assert coalescer.flush(now=10) == ["1.git"]
+    request_sync.assert_called_once_with(["1.git"])
+
+    # A new event after the sync has been requested starts another delay.
+    assert coalescer.add("1.git", now=11) is True
+    assert coalescer.flush(now=21) == ["2.git", "1.git"]
+
+
+def test_coalescer_thread(mocker):
+    request_sync = mocker.Mock()
+    coalescer = webhooks.Coalescer(request_sync, delay=0)
+    coalescer.start()
+
+    coalescer.add("1.git")
+
+    for _ in range(100):
+        if request_sync.called:
+            break
+        time.sleep(0.05)
+
+    request_sync.assert_called_once_with(["1.git"])